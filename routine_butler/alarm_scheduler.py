@@ -0,0 +1,280 @@
+"""A process-wide service that rings alarms w/o polling: it keeps a min-heap of the
+upcoming (fire datetime, alarm, routine) entries of the current user's routines, sleeps
+until the soonest one, and then notifies its subscribers.
+
+The heap is patched incrementally (via a db write listener) as routines are saved.
+
+Usage:
+    unsubscribe = alarm_scheduler.subscribe(lambda alarm, routine: ...)
+    app.on_startup(alarm_scheduler.run)
+"""
+
+import asyncio
+import datetime
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from routine_butler.models import Alarm, Routine
+    from routine_butler.models.base import (
+        BaseDBPydanticModel,
+        DBWriteOperation,
+    )
+
+RingSubscriber = Callable[["Alarm", "Routine"], None]
+
+# Sleeps are capped so that the wall clock is re-checked at least this often
+MAX_SECONDS_BW_SCHEDULE_CHECKS = 30
+# Max drift between wall-clock & monotonic time over one sleep before it's treated as
+# a clock change (e.g. NTP correcting the clock of a Pi w/o an RTC after boot)
+CLOCK_CHANGE_TOLERANCE_SECONDS = 5
+
+
+@dataclass(order=True)
+class _HeapEntry:
+    fire_datetime: datetime.datetime
+    seq: int  # Tie-breaker so that alarms & routines are never compared
+    alarm: "Alarm" = field(compare=False)
+    routine: "Routine" = field(compare=False)
+    is_cancelled: bool = field(default=False, compare=False)
+
+
+class AlarmScheduler:
+    """Singleton service that notifies subscribers when the current user's enabled
+    alarms are due.
+
+    Since async db writes patch the schedule from the DB worker thread, the heap is
+    only accessed under a lock.
+    """
+
+    def __new__(cls):
+        """Custom __new__ method to make this a singleton class."""
+        if not hasattr(cls, "instance"):
+            cls.instance = super(AlarmScheduler, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self):
+        if hasattr(self, "_heap"):
+            return
+        self._heap: List[_HeapEntry] = []
+        self._entries_by_routine_uid: Dict[int, List[_HeapEntry]] = {}
+        self._subscribers: List[RingSubscriber] = []
+        self._seq = itertools.count()
+        self._user_uid: Optional[int] = None
+        self._schedule_changed = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._needs_rebuild = False
+        self._is_listening_to_db_writes = False
+        # Guards self._heap & self._entries_by_routine_uid
+        self._lock = threading.RLock()
+
+    # Schedule maintenance
+
+    def _push(
+        self,
+        alarm: "Alarm",
+        routine: "Routine",
+        fire_datetime: Optional[datetime.datetime] = None,
+    ) -> None:
+        if fire_datetime is None:
+            fire_datetime = alarm.get_next_ring_datetime()
+        if fire_datetime is None:  # i.e. it isn't set to ring on any day
+            return
+        entry = _HeapEntry(fire_datetime, next(self._seq), alarm, routine)
+        heapq.heappush(self._heap, entry)
+        self._entries_by_routine_uid.setdefault(routine.uid, []).append(entry)
+
+    def _wake(self) -> None:
+        """Wakes the service loop so that it re-evaluates the schedule."""
+        if self._loop is None:  # i.e. the loop isn't running (yet)
+            return
+        # NOTE: threadsafe since async db writes happen on the db worker thread
+        self._loop.call_soon_threadsafe(self._schedule_changed.set)
+
+    def remove_routine(self, routine_uid: int) -> None:
+        """Cancels the routine's scheduled alarms (lazily removed from the heap)."""
+        with self._lock:
+            for entry in self._entries_by_routine_uid.pop(routine_uid, []):
+                entry.is_cancelled = True
+        self._wake()
+
+    def update_routine(self, routine: "Routine") -> None:
+        """(Re)schedules the routine's enabled alarms."""
+        with self._lock:
+            self.remove_routine(routine.uid)
+            for alarm in routine.alarms:
+                if alarm.is_enabled:
+                    self._push(alarm, routine)
+
+    def rebuild(self, user_uid: int, routines: List["Routine"]) -> None:
+        """Replaces the whole schedule w/ the alarms of the given user's routines."""
+        self._listen_to_db_writes()
+        with self._lock:
+            self._user_uid = user_uid
+            self._heap, self._entries_by_routine_uid = [], {}
+            for routine in routines:
+                self.update_routine(routine)
+        self._wake()
+
+    def reschedule(self, now: Optional[datetime.datetime] = None) -> None:
+        """Recomputes every scheduled alarm's next ring as of `now` (e.g. after the
+        wall clock changed), skipping any rings that were jumped over."""
+        with self._lock:
+            entries = [e for e in self._heap if not e.is_cancelled]
+            self._heap, self._entries_by_routine_uid = [], {}
+            for entry in entries:
+                next_fire = entry.alarm.get_next_ring_datetime(now)
+                self._push(entry.alarm, entry.routine, next_fire)
+        self._wake()
+
+    def _listen_to_db_writes(self) -> None:
+        # NOTE: imported here since routine_butler.models imports routine_butler.state
+        from routine_butler.models.base import add_db_write_listener
+
+        if not self._is_listening_to_db_writes:
+            add_db_write_listener(self._on_db_write)
+            self._is_listening_to_db_writes = True
+
+    def _on_db_write(
+        self,
+        instance: Optional["BaseDBPydanticModel"],
+        operation: "DBWriteOperation",
+    ) -> None:
+        from routine_butler.models import Routine
+        from routine_butler.models.base import DBWriteOperation
+
+        # i.e. a rollback, so rebuild (once it's complete)
+        if instance is None:
+            self._needs_rebuild = True
+            self._wake()
+        elif isinstance(instance, Routine) and instance.uid is not None:
+            if (
+                operation == DBWriteOperation.DELETE
+                or instance.user_uid != self._user_uid
+            ):
+                self.remove_routine(instance.uid)
+            else:
+                self.update_routine(instance)
+
+    def peek(self) -> Optional[Tuple["Alarm", "Routine"]]:
+        """Returns the next (alarm, routine) that will ring, if any."""
+        entry = self._peek_entry()
+        return None if entry is None else (entry.alarm, entry.routine)
+
+    def _peek_entry(self) -> Optional[_HeapEntry]:
+        with self._lock:
+            while self._heap and self._heap[0].is_cancelled:
+                heapq.heappop(self._heap)
+            return self._heap[0] if self._heap else None
+
+    # Subscriptions
+
+    def subscribe(self, subscriber: RingSubscriber) -> Callable[[], None]:
+        """Registers a callback to be called w/ (alarm, routine) when an alarm is due
+        (once, no matter how many times it's subscribed).
+
+        Returns:
+            A function that cancels the subscription.
+        """
+        if subscriber not in self._subscribers:
+            self._subscribers.append(subscriber)
+        return lambda: self.unsubscribe(subscriber)
+
+    def unsubscribe(self, subscriber: RingSubscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def _fire(self, entry: _HeapEntry) -> None:
+        logger.info(f"⏰ Alarm time reached: {entry.alarm}")
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(entry.alarm, entry.routine)
+            except Exception as e:
+                logger.warning(f"Alarm subscriber {subscriber} failed: {e}")
+
+    # Service loop
+
+    def fire_due(self, now: Optional[datetime.datetime] = None) -> int:
+        """Fires every entry that is due as of `now` & schedules each one's next ring.
+
+        Returns:
+            The number of entries that were fired.
+        """
+        now = now or datetime.datetime.now()
+        due_entries = []
+        with self._lock:
+            while (
+                self._peek_entry() is not None
+                and self._heap[0].fire_datetime <= now
+            ):
+                entry = heapq.heappop(self._heap)
+                self._entries_by_routine_uid[entry.routine.uid].remove(entry)
+                due_entries.append(entry)
+                next_fire = entry.alarm.get_next_ring_datetime(
+                    entry.fire_datetime + datetime.timedelta(minutes=1)
+                )
+                self._push(entry.alarm, entry.routine, next_fire)
+        # NOTE: fired outside of the lock since subscribers may e.g. write to the db
+        for entry in due_entries:
+            self._fire(entry)
+        return len(due_entries)
+
+    def seconds_until_next_fire(
+        self, now: Optional[datetime.datetime] = None
+    ) -> Optional[float]:
+        entry = self._peek_entry()
+        if entry is None:
+            return None
+        now = now or datetime.datetime.now()
+        return max((entry.fire_datetime - now).total_seconds(), 0.0)
+
+    def _rebuild_from_state(self) -> None:
+        from routine_butler.state import state
+
+        self._needs_rebuild = False
+        if state.repository is not None:
+            routines = state.repository.get_routines(state.engine)
+            self.rebuild(self._user_uid, routines)
+
+    async def run(self) -> None:
+        """Forever sleeps until the next alarm is due (or the schedule changes, or for
+        at most MAX_SECONDS_BW_SCHEDULE_CHECKS) & fires due alarms.
+
+        NOTE: sleeps are timed by the (monotonic) event loop clock, so the schedule is
+        recomputed whenever the wall clock is found to have changed in the meantime.
+        """
+        self._loop = asyncio.get_running_loop()
+        while True:
+            self._schedule_changed.clear()
+            if self._needs_rebuild:
+                self._rebuild_from_state()
+            self.fire_due()
+            wall_start = datetime.datetime.now()
+            monotonic_start = self._loop.time()
+            timeout = self.seconds_until_next_fire(wall_start)
+            if timeout is None or timeout > MAX_SECONDS_BW_SCHEDULE_CHECKS:
+                timeout = MAX_SECONDS_BW_SCHEDULE_CHECKS
+            try:
+                await asyncio.wait_for(
+                    self._schedule_changed.wait(), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                pass
+            wall_now = datetime.datetime.now()
+            drift = (wall_now - wall_start).total_seconds() - (
+                self._loop.time() - monotonic_start
+            )
+            if abs(drift) > CLOCK_CHANGE_TOLERANCE_SECONDS:
+                logger.warning(
+                    f"Wall clock changed by {drift:+.0f}s; rescheduling alarms"
+                )
+                self.reschedule(wall_now)
+
+
+# Instantiate singleton for the rest of the app
+alarm_scheduler = AlarmScheduler()
@@ -1,8 +1,11 @@
+from typing import List
+
 from nicegui import ui
 
 from routine_butler.components import micro
 from routine_butler.globals import ICON_STRS, THROTTLE_SECONDS
 from routine_butler.models import Alarm, RingFrequency, Routine
+from routine_butler.models.alarm import parse_minute_of_day
 from routine_butler.state import state
 
 
@@ -45,6 +48,9 @@ class AlarmsConfigurer(micro.ExpandableCard):
             ring_frequency_select = micro.ring_frequency_select(
                 value=alarm.ring_frequency, ring_frequencies=RingFrequency
             ).classes("w-40")
+            days_of_week_select = micro.days_of_week_select(
+                value=alarm.days_of_week
+            ).classes("w-40")
             switch = ui.switch(value=alarm.is_enabled).props("dense")
             delete_alarm_button = micro.delete_button().props("dense")
 
@@ -66,6 +72,12 @@ class AlarmsConfigurer(micro.ExpandableCard):
                 row_idx, ring_frequency_select.value
             ),
         )
+        days_of_week_select.on(
+            "update:model-value",
+            lambda: self.hdl_select_days_of_week(
+                row_idx, days_of_week_select.value
+            ),
+        )
         switch.on(
             "click", lambda: self.hdl_toggle_is_enabled(row_idx, switch.value)
         )
@@ -79,6 +91,10 @@ class AlarmsConfigurer(micro.ExpandableCard):
         self._update_ui()
 
     def hdl_time_change(self, row_idx: int, new_time: str):
+        try:
+            parse_minute_of_day(new_time)
+        except ValueError:  # e.g. a partially typed time
+            return
         self.routine.alarms[row_idx].time_str = new_time
         self.routine.update_self_in_db(state.engine)
         state.update_next_alarm_and_next_routine()
@@ -93,6 +109,11 @@ class AlarmsConfigurer(micro.ExpandableCard):
         self.routine.alarms[row_idx].ring_frequency = new_frequency
         self.routine.update_self_in_db(state.engine)
 
+    def hdl_select_days_of_week(self, row_idx: int, days_of_week: List[int]):
+        self.routine.alarms[row_idx].days_of_week = days_of_week
+        self.routine.update_self_in_db(state.engine)
+        state.update_next_alarm_and_next_routine()
+
     def hdl_toggle_is_enabled(self, row_idx: int, value: bool):
         self.routine.alarms[row_idx].is_enabled = value
         self.routine.update_self_in_db(state.engine)
@@ -14,6 +14,7 @@ from routine_butler.components.micro.cards import (
 )
 from routine_butler.components.micro.input import input
 from routine_butler.components.micro.multiselects import (
+    days_of_week_select,
     plugin_type_select,
     priority_level_select,
     program_select,
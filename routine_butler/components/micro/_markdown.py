@@ -1,11 +1,14 @@
 import re
-from typing import List
+from typing import TYPE_CHECKING, List
 
-import bs4
-from bs4 import BeautifulSoup
-from markdown import Markdown
 from nicegui import ui
 
+if TYPE_CHECKING:
+    import bs4
+
+# NOTE: markdown (w/ its pymdownx extensions) & bs4 are imported in the functions that
+# use them since they are slow to import & only needed once markdown is rendered
+
 HIGHLIGHT_STYLE = "background: #f5f5f5; border-radius: 0.2rem;"
 HIGHLIGHT_STYLE += "padding: 0.2rem 0.3rem 0.2rem 0.3rem;"
 
@@ -16,6 +19,8 @@ MATHJAX_SCRIPTS = """
 
 
 def markdown_to_html_with_math(markdown_text: str) -> str:
+    from markdown import Markdown
+
     md_parser = Markdown(
         extensions=[
             "toc",
@@ -54,8 +59,10 @@ def markdown_to_html_with_math(markdown_text: str) -> str:
 
 
 def apply_styles(
-    element: bs4.element.Tag, styles: str, should_recurse: bool = False
+    element: "bs4.element.Tag", styles: str, should_recurse: bool = False
 ):
+    import bs4
+
     if should_recurse:
         for child in element.children:
             if isinstance(child, bs4.element.Tag):
@@ -85,6 +92,8 @@ def apply_styles(
 
 
 def add_linebreaks_in_between_codelines(html: str) -> str:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     # Iterate through elements whose id name contains "__codeline"
     for element in soup.find_all(id=lambda x: x and "__codeline" in x):
@@ -94,6 +103,8 @@ def add_linebreaks_in_between_codelines(html: str) -> str:
 
 
 def apply_custom_table_style(html: str) -> str:
+    from bs4 import BeautifulSoup
+
     table_styles = "border: 1px solid lightgray; padding: 4px;"
     soup = BeautifulSoup(html, "html.parser")
     for table in soup.find_all("table"):
@@ -49,3 +49,13 @@ def ring_frequency_select(
         label="Ring Frequency",
     )
     return select.props("standout dense")
+
+
+def days_of_week_select(value: List[int]) -> ui.select:
+    select = ui.select(
+        {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri", 5: "Sat", 6: "Sun"},
+        value=value,
+        label="Days",
+        multiple=True,
+    )
+    return select.props("standout dense")
@@ -6,6 +6,7 @@ from pydantic import BaseModel, ValidationError
 
 from routine_butler.components import micro
 from routine_butler.models import Program
+from routine_butler.models.base import db_unit_of_work
 from routine_butler.state import state
 from routine_butler.utils.misc import Plugin
 
@@ -135,10 +136,11 @@ class ProgramConfigurer:
 
     def hdl_save(self):
         self._update_program_with_ui_values()
-        if not self.program.uid:
-            self.program.add_self_to_db(state.engine)
-            state.user.add_program(state.engine, self.program)
-        else:
-            self.program.update_self_in_db(state.engine)
-        state.update_programs()
+        with db_unit_of_work(state.engine):
+            if not self.program.uid:
+                self.program.add_self_to_db(state.engine)
+                state.user.add_program(state.engine, self.program)
+            else:
+                self.program.update_self_in_db(state.engine)
+            state.update_programs()
         ui.notify("Program saved!")
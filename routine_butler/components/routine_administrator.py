@@ -1,5 +1,4 @@
 import datetime
-import random
 from typing import List, Optional, Tuple
 
 from loguru import logger
@@ -7,7 +6,9 @@ from nicegui import ui
 
 from routine_butler.components import micro
 from routine_butler.globals import G_SUITE_CREDENTIALS_MANAGER, PagePath
-from routine_butler.models import PriorityLevel, Program, ProgramRun, Routine
+from routine_butler.models import Program, ProgramRun, Routine
+from routine_butler.models.base import run_in_db_worker
+from routine_butler.routine_plan import get_routine_plan
 from routine_butler.state import state
 from routine_butler.utils.misc import perform_db_backup, redirect_to_page
 
@@ -19,9 +20,6 @@ SVG_WIDTH_PX = 23
 SDBR_FONT_PX = 12.5
 SDBR_ROW_HEIGHT_PX = 28
 
-LOAD_SECONDS_PER_PROGRAM = 2.5
-TARGET_CUSHION_SECONDS = 90
-
 
 def add_horizontal_dash() -> None:
     dash = ui.label("-").style(f"font-size: {SDBR_FONT_PX + 12}px")
@@ -40,87 +38,22 @@ def sidebar_label(text: str) -> ui.label:
     return label
 
 
-def prune_element_programs_to_target_duration(
-    element_programs_queue: List[Program],
-    element_program_priorities: List[PriorityLevel],
-    target_duration_minutes: int,
-) -> List[Program]:
-    """Prunes the element programs queue to the target duration. Returns the pruned
-    queue."""
-
-    def merge_priority_dicts():
-        merged = {}
-        merged.update(low_priority_programs)
-        merged.update(med_priority_programs)
-        merged.update(high_priority_programs)
-        return merged
-
-    def total_expected_time_seconds():
-        programs: List[Program] = merge_priority_dicts().values()
-        return sum((p.estimate_duration_in_seconds() for p in programs))
-
-    target_seconds = target_duration_minutes * 60
-    loading_offset = LOAD_SECONDS_PER_PROGRAM * len(element_programs_queue)
-    target_seconds -= loading_offset
-    target_seconds -= TARGET_CUSHION_SECONDS
-
-    low_priority_programs = {}
-    med_priority_programs = {}
-    high_priority_programs = {}
-    for i, program in enumerate(element_programs_queue):
-        if element_program_priorities[i] == PriorityLevel.LOW:
-            low_priority_programs[i] = program
-        elif element_program_priorities[i] == PriorityLevel.MEDIUM:
-            med_priority_programs[i] = program
-        else:
-            high_priority_programs[i] = program
-
-    pruned_titles = []
-    while total_expected_time_seconds() >= target_seconds:
-        if len(low_priority_programs) > 0:
-            key_to_prune = random.sample(
-                list(low_priority_programs.keys()), 1
-            )[0]
-            pruned_titles.append(low_priority_programs[key_to_prune].title)
-            low_priority_programs.pop(key_to_prune)
-        elif len(med_priority_programs) > 0:
-            key_to_prune = random.sample(
-                list(med_priority_programs.keys()), 1
-            )[0]
-            pruned_titles.append(med_priority_programs[key_to_prune].title)
-            med_priority_programs.pop(key_to_prune)
-        else:
-            key_to_prune = random.sample(
-                list(high_priority_programs.keys()), 1
-            )[0]
-            pruned_titles.append(high_priority_programs[key_to_prune].title)
-            high_priority_programs.pop(key_to_prune)
-
-    msg = f"Pruned {pruned_titles} to hit {target_duration_minutes} minutes."
-    if len(pruned_titles) > 0:
-        ui.timer(0.1, lambda: ui.notify(msg), once=True)
-
-    merged = merge_priority_dicts()
-    sorted_keys = sorted(merged.keys())
-    return [merged[k] for k in sorted_keys]
-
-
 def get_programs_queues(
     routine: Routine, target_duration_minutes: Optional[int] = None
 ) -> Tuple[List[Program], List[Program]]:
-    element_program_titles = [e.program for e in routine.elements]
-    element_program_priorities = [e.priority_level for e in routine.elements]
-    reward_program_titles = [r.program for r in routine.rewards]
-    user_programs = {p.title: p for p in state.user.get_programs(state.engine)}
-    element_programs_queue = [user_programs[t] for t in element_program_titles]
-    reward_programs_queue = [user_programs[t] for t in reward_program_titles]
-    if target_duration_minutes is not None:
-        element_programs_queue = prune_element_programs_to_target_duration(
-            element_programs_queue,
-            element_program_priorities,
-            target_duration_minutes,
+    user_programs = state.repository.get_programs_by_title(state.engine)
+    plan = get_routine_plan(routine, user_programs)
+    if target_duration_minutes is None:
+        return plan.element_programs, plan.reward_programs
+    element_programs_queue, pruned_titles = plan.prune_to_target_duration(
+        target_duration_minutes
+    )
+    if len(pruned_titles) > 0:
+        msg = (
+            f"Pruned {pruned_titles} to hit {target_duration_minutes} minutes."
         )
-    return element_programs_queue, reward_programs_queue
+        ui.timer(0.1, lambda: ui.notify(msg), once=True)
+    return element_programs_queue, plan.reward_programs
 
 
 class RoutineAdministrator(ui.row):
@@ -178,7 +111,10 @@ class RoutineAdministrator(ui.row):
         if self.is_complete:
             self.check_if_complete_timer.cancel()
             logger.info(f"Routine completed! ({self.routine.title})")
-            await perform_db_backup()
+            await run_in_db_worker(
+                state.program_run_journal.flush, state.engine
+            )
+            await perform_db_backup(state.engine)
             redirect_to_page(PagePath.HOME)
 
     def add_sidebar(self):
@@ -269,7 +205,8 @@ class RoutineAdministrator(ui.row):
             run_data=run_data,
             user_uid=state.user.uid,
         )
-        program_run.add_self_to_db(state.engine)
+        # NOTE: journaled (& written to the db in batches) so as to not block the UI
+        state.program_run_journal.append(program_run)
 
     def _administer_next_program(self):
         if self.has_nothing_left_to_administer:
@@ -7,7 +7,14 @@ from routine_butler.utils.cloud_storage_bucket import (
     CloudStorageBucket,
     GoogleDriveFolder,
 )
-from routine_butler.utils.dataframe_like import DataframeLike, GoogleSheet
+from routine_butler.utils.dataframe_like import (
+    CachingDataframeLike,
+    DataframeLike,
+    DataframeLikeCache,
+    GoogleSheet,
+    WriteBackBuffer,
+)
+from routine_butler.utils.google.drive_id_cache import DriveIdCache
 from routine_butler.utils.google.g_suite_credentials_manager import (
     G_Suite_Credentials_Manager,
 )
@@ -22,6 +29,18 @@ PROJECT_DIR_PATH: str = os.path.dirname(CURRENT_DIR_PATH)
 
 TEST_DB_PATH = os.path.join(PROJECT_DIR_PATH, "test_db.sqlite")
 DB_PATH = os.path.join(PROJECT_DIR_PATH, "db.sqlite")
+TEST_PROGRAM_RUN_JOURNAL_PATH = os.path.join(
+    PROJECT_DIR_PATH, "test_program_run_journal.jsonl"
+)
+PROGRAM_RUN_JOURNAL_PATH = os.path.join(
+    PROJECT_DIR_PATH, "program_run_journal.jsonl"
+)
+DATAFRAME_LIKE_WRITE_BACK_JOURNAL_PATH = os.path.join(
+    PROJECT_DIR_PATH, "dataframe_like_write_back_journal.jsonl"
+)
+DATAFRAME_LIKE_CACHE_DIR_PATH = os.path.join(
+    PROJECT_DIR_PATH, "dataframe_like_cache"
+)
 LOG_FILE_PATH = os.path.join(PROJECT_DIR_PATH, "app.log")
 
 PATH_TO_ASSETS = os.path.join(CURRENT_DIR_PATH, "assets")
@@ -35,6 +54,7 @@ ALARM_WAV_PATH = os.path.join(PATH_TO_ASSETS, "alarm_sound.wav")
 
 PLUGINS_DIR_PATH = os.path.join(CURRENT_DIR_PATH, "plugins")
 PLUGINS_IMPORT_STR = "routine_butler.plugins.{module}"
+PLUGIN_MANIFEST_PATH = os.path.join(PROJECT_DIR_PATH, "plugin_manifest.json")
 
 # Page paths
 
@@ -75,10 +95,15 @@ G_SUITE_CREDENTIALS_MANAGER = G_Suite_Credentials_Manager(
 
 G_DRIVE_STORAGE_FOLDER_NAME = "Routine Butler"
 
+# Persistent cache of Drive paths to folder & file ids (shared by the below)
+
+DRIVE_ID_CACHE_PATH = os.path.join(PROJECT_DIR_PATH, "drive_id_cache.json")
+DRIVE_ID_CACHE = DriveIdCache(DRIVE_ID_CACHE_PATH)
+
 # Globally-used CloudStorageBucket object
 
 STORAGE_BUCKET: CloudStorageBucket = GoogleDriveFolder(
-    G_DRIVE_STORAGE_FOLDER_NAME, G_SUITE_CREDENTIALS_MANAGER
+    G_DRIVE_STORAGE_FOLDER_NAME, G_SUITE_CREDENTIALS_MANAGER, DRIVE_ID_CACHE
 )
 
 # Folder within the root of storage bucket where flashcard sheets are stored
@@ -95,20 +120,38 @@ YOUTUBE_VIDEO_FOLDER_NAME = "youtube_video"
 DB_BACKUP_FOLDER_NAME = "db_backups"
 
 
-# Gloablly-used DataframeLike type
+# Gloablly-used DataframeLike type (w/ reads served from a local cache as long as the
+# source sheet is unchanged)
 # NOTE: partial is used here to maintain the consistency of the constructor interface
 # since GoogleSheet uniquely requires root_folder_name and credentials_manager args
 
 DATAFRAME_LIKE: Type[DataframeLike] = partial(
-    GoogleSheet,
-    root_folder_name=G_DRIVE_STORAGE_FOLDER_NAME,
-    credentials_manager=G_SUITE_CREDENTIALS_MANAGER,
+    CachingDataframeLike,
+    source_factory=partial(
+        GoogleSheet,
+        root_folder_name=G_DRIVE_STORAGE_FOLDER_NAME,
+        credentials_manager=G_SUITE_CREDENTIALS_MANAGER,
+        id_cache=DRIVE_ID_CACHE,
+    ),
+    cache=DataframeLikeCache(DATAFRAME_LIKE_CACHE_DIR_PATH),
+)
+
+# Globally-used buffer through which cell updates are written back to DataframeLikes
+# in (debounced) batches
+
+N_SECONDS_WRITE_BACK_DEBOUNCE = 10  # Write back n secs after the latest update
+DATAFRAME_LIKE_WRITE_BACK_BUFFER = WriteBackBuffer(
+    DATAFRAME_LIKE_WRITE_BACK_JOURNAL_PATH,
+    DATAFRAME_LIKE,
+    debounce_seconds=N_SECONDS_WRITE_BACK_DEBOUNCE,
 )
 
 # Database
 
 TEST_DB_URL = f"sqlite:///{TEST_DB_PATH}"
 DB_URL = f"sqlite:///{DB_PATH}"
+# Key of models.engine.SQLITE_ENGINE_PROFILES
+DB_ENGINE_PROFILE_NAME = "performance"
 TEST_USER_USERNAME = "test"
 SINGLE_USER_MODE_USERNAME = "CVxaUwC0Lkg7znaOMtwQP"
 
@@ -119,6 +162,8 @@ PERIODIC_RING_INTERVAL = 60  # Time between noises for "periodic" ringing
 
 N_SECONDS_BW_RING_CHECKS = 1  # Check every n secs for alarm that should ring
 N_SECONDS_BW_HOURLY_TASK_CHECKS = 5 * 60  # Check every n secs if new hour
+# Flush journaled ProgramRuns to the db every n secs
+N_SECONDS_BW_PROGRAM_RUN_FLUSHES = 5
 
 BINDING_REFRESH_INTERVAL_SECONDS = 0.3  # Higher is more cpu friendly
 THROTTLE_SECONDS = 0.7  # For event handlers that would otherwise be spammed
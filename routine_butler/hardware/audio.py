@@ -2,7 +2,6 @@ import array
 import os
 import wave
 
-import pyaudio
 from loguru import logger
 
 from routine_butler.utils.logging import AUDIO_LOG_LVL
@@ -31,6 +30,9 @@ def play_wav(file_path: str) -> None:
     default audio device."""
     logger.log(AUDIO_LOG_LVL, f"Playing wav: {file_path.split('/')[-1]}")
 
+    # NOTE: imported here since pyaudio is only needed (& slow to import) for playback
+    import pyaudio
+
     p = pyaudio.PyAudio()
     wf = wave.open(file_path, "rb")
     stream = p.open(
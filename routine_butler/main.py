@@ -1,17 +1,29 @@
-from nicegui import ui
-from sqlalchemy import create_engine
+from nicegui import app, ui
 
+from routine_butler.alarm_scheduler import alarm_scheduler
 from routine_butler.globals import (
     BINDING_REFRESH_INTERVAL_SECONDS,
+    DATAFRAME_LIKE_WRITE_BACK_BUFFER,
+    DB_ENGINE_PROFILE_NAME,
     DB_URL,
     MAIN_SERVER_PORT,
+    N_SECONDS_BW_PROGRAM_RUN_FLUSHES,
+    PROGRAM_RUN_JOURNAL_PATH,
     SINGLE_USER_MODE_USERNAME,
     TEST_DB_URL,
+    TEST_PROGRAM_RUN_JOURNAL_PATH,
     TEST_USER_USERNAME,
 )
 from routine_butler.models.base import SQLAlchemyBase
+from routine_butler.models.engine import (
+    SQLITE_ENGINE_PROFILES,
+    create_sqlite_engine,
+)
+from routine_butler.models.migrations import run_migrations
+from routine_butler.models.program_run_journal import ProgramRunJournal
 from routine_butler.models.user import User
 from routine_butler.state import state
+from routine_butler.utils.startup_profiler import startup_profiler
 
 # import all views so they are registered with nicegui
 from routine_butler.views import *  # noqa: F401, F403
@@ -19,8 +31,40 @@ from routine_butler.views import *  # noqa: F401, F403
 
 def initialize_db(testing: bool = False) -> None:
     db_url = TEST_DB_URL if testing else DB_URL
-    state.set_engine(create_engine(db_url))
+    profile = SQLITE_ENGINE_PROFILES[DB_ENGINE_PROFILE_NAME]
+    state.set_engine(create_sqlite_engine(db_url, profile))
     SQLAlchemyBase.metadata.create_all(state.engine)
+    run_migrations(state.engine)
+    journal_path = (
+        TEST_PROGRAM_RUN_JOURNAL_PATH if testing else PROGRAM_RUN_JOURNAL_PATH
+    )
+    state.set_program_run_journal(ProgramRunJournal(journal_path))
+    state.program_run_journal.replay(state.engine)
+
+
+def start_program_run_journal_flusher() -> None:
+    """Flushes journaled ProgramRuns to the db in the background while the app runs,
+    and once more on shutdown."""
+    app.on_startup(
+        lambda: state.program_run_journal.flush_periodically(
+            state.engine, N_SECONDS_BW_PROGRAM_RUN_FLUSHES
+        )
+    )
+    app.on_shutdown(lambda: state.program_run_journal.flush(state.engine))
+
+
+def start_dataframe_like_write_back() -> None:
+    """Replays cell updates left unflushed by a previous process on startup, and
+    flushes pending ones once more on shutdown."""
+    app.on_startup(DATAFRAME_LIKE_WRITE_BACK_BUFFER.replay)
+    # NOTE: registered w/ FastAPI (which awaits it) rather than w/ app.on_shutdown
+    # (which only schedules coroutines, so the flush wouldn't complete); cells whose
+    # flush fails anyway remain in the journal & are replayed on the next startup
+    app.add_event_handler("shutdown", DATAFRAME_LIKE_WRITE_BACK_BUFFER.flush)
+
+
+def start_alarm_scheduler() -> None:
+    app.on_startup(alarm_scheduler.run)
 
 
 def auto_login_username(username: str) -> None:
@@ -41,6 +85,7 @@ def main(
     fullscreen: bool,
     open_browser: bool,
     reload: bool,
+    profile_startup: bool = False,
 ):
     """Main entrypoint for the app."""
 
@@ -50,14 +95,22 @@ def main(
         raise ValueError("both 'single_user' & 'testing' args can't be true")
     if native and open_browser:
         raise ValueError("'open_browser' doesn't apply in 'native' mode")
+    if profile_startup and reload:
+        raise ValueError("'profile_startup' doesn't apply in 'reload' mode")
 
     initialize_db(testing=testing)
+    start_program_run_journal_flusher()
+    start_dataframe_like_write_back()
+    start_alarm_scheduler()
 
     if testing:
         auto_login_username(TEST_USER_USERNAME)
     if single_user:
         auto_login_username(SINGLE_USER_MODE_USERNAME)
 
+    if profile_startup:
+        app.on_connect(startup_profiler.record_first_page)
+
     ui.run(
         favicon="🎩",
         native=native,
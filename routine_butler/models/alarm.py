@@ -1,21 +1,121 @@
+import bisect
 import datetime
+import functools
 from enum import StrEnum
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 from routine_butler.globals import N_SECONDS_BW_RING_CHECKS
 
+MINUTES_PER_DAY = 24 * 60
+# As w/ datetime.weekday(), 0 is Monday
+ALL_DAYS_OF_WEEK = [0, 1, 2, 3, 4, 5, 6]
+
+T = TypeVar("T")
+
 
 class RingFrequency(StrEnum):
     CONSTANT = "constant"
     PERIODIC = "periodic"
 
 
+def parse_minute_of_day(time_str: str) -> int:
+    """Parses a "%H:%M" time string into the number of minutes since midnight.
+
+    Raises:
+        ValueError: If the string isn't a valid "%H:%M" time.
+    """
+    hour_str, sep, minute_str = time_str.partition(":")
+    if (
+        sep != ":"
+        or not 1 <= len(hour_str) <= 2
+        or len(minute_str) != 2
+        or not (hour_str + minute_str).isdigit()
+    ):
+        raise ValueError(f"Invalid %H:%M time string: '{time_str}'")
+    hour, minute = int(hour_str), int(minute_str)
+    if hour > 23 or minute > 59:
+        raise ValueError(f"Invalid %H:%M time string: '{time_str}'")
+    return hour * 60 + minute
+
+
+# Memoized parse shared by all alarms (rather than a per-instance cached attribute,
+# which pydantic only offers as a PrivateAttr--whose reads are slower than parsing)
+_get_minute_of_day = functools.lru_cache(maxsize=2 * MINUTES_PER_DAY)(
+    parse_minute_of_day
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_midnight(date: datetime.date) -> datetime.datetime:
+    """Returns (& caches) the datetime at the start of the given (i.e. today's) date."""
+    return datetime.datetime.combine(date, datetime.time())
+
+
+def _get_seconds_into_day(dtime: datetime.datetime) -> float:
+    return (
+        dtime.hour * 3600
+        + dtime.minute * 60
+        + dtime.second
+        + dtime.microsecond / 1_000_000
+    )
+
+
+def _get_next_datetime(
+    sorted_minutes: List[int], now: datetime.datetime, is_weekly: bool
+) -> Optional[Tuple[datetime.datetime, int]]:
+    """Bisects the sorted minutes-of-day (or minutes-of-week if `is_weekly`) for the
+    first one at or after `now`, wrapping around to the next day (or week).
+
+    Returns:
+        A tuple w/ its datetime & its index, or None if there are no minutes.
+    """
+    if not sorted_minutes:
+        return None
+    period_start = datetime.datetime.combine(now.date(), datetime.time())
+    now_minute = now.hour * 60 + now.minute
+    if is_weekly:
+        period_start -= datetime.timedelta(days=now.weekday())
+        now_minute += now.weekday() * MINUTES_PER_DAY
+    # If now's minute hasn't passed, an alarm at now's minute is still upcoming
+    if now.second == 0 and now.microsecond == 0:
+        idx = bisect.bisect_left(sorted_minutes, now_minute)
+    else:
+        idx = bisect.bisect_right(sorted_minutes, now_minute)
+    if idx == len(sorted_minutes):  # wrap around to the next day/week
+        idx = 0
+        period_start += datetime.timedelta(weeks=1 if is_weekly else 0)
+        period_start += datetime.timedelta(days=0 if is_weekly else 1)
+    return period_start + datetime.timedelta(minutes=sorted_minutes[idx]), idx
+
+
 class Alarm(BaseModel):
     time_str: str = "12:00"
     is_enabled: bool = True
     volume: float = 1.0
     ring_frequency: RingFrequency = RingFrequency.CONSTANT
+    # The days on which the alarm rings
+    days_of_week: List[int] = ALL_DAYS_OF_WEEK
+
+    def __setattr__(self, name, value):
+        # NOTE: validated before being set so that an invalid time_str is never stored
+        if name == "time_str":
+            parse_minute_of_day(value)
+        super().__setattr__(name, value)
+
+    @field_validator("time_str")
+    @classmethod
+    def validate_time_str(cls, time_str: str) -> str:
+        parse_minute_of_day(time_str)
+        return time_str
+
+    @field_validator("days_of_week")
+    @classmethod
+    def validate_days_of_week(cls, days_of_week: List[int]) -> List[int]:
+        if any(day not in ALL_DAYS_OF_WEEK for day in days_of_week):
+            raise ValueError(f"Days of week must be in {ALL_DAYS_OF_WEEK}")
+        return sorted(set(days_of_week))
 
     def __str__(self):
         """Custom __str__ method for logging."""
@@ -25,38 +125,133 @@ class Alarm(BaseModel):
         )
 
     @property
-    def _time(self) -> datetime.time:
-        return datetime.datetime.strptime(self.time_str, "%H:%M").time()
+    def minute_of_day(self) -> int:
+        return _get_minute_of_day(self.time_str)
+
+    @property
+    def hour(self) -> int:
+        return self.minute_of_day // 60
+
+    @property
+    def minute(self) -> int:
+        return self.minute_of_day % 60
+
+    @property
+    def is_daily(self) -> bool:
+        return len(set(self.days_of_week)) == len(ALL_DAYS_OF_WEEK)
+
+    @property
+    def minutes_of_week(self) -> List[int]:
+        """The (sorted) minutes since the start of the week at which the alarm rings."""
+        return sorted(
+            day * MINUTES_PER_DAY + self.minute_of_day
+            for day in set(self.days_of_week)
+        )
 
     def get_todays_ring_datetime(self) -> datetime.datetime:
-        todays_date = datetime.datetime.now().date()
-        return datetime.datetime.combine(todays_date, self._time)
+        todays_midnight = _get_midnight(datetime.date.today())
+        return todays_midnight + datetime.timedelta(minutes=self.minute_of_day)
+
+    def _get_secs_since_todays_ring_time(
+        self, now: Optional[datetime.datetime] = None
+    ) -> Optional[float]:
+        """Returns the seconds since (or, if negative, until) today's ring time, or
+        None if the alarm isn't set to ring today."""
+        now = now or datetime.datetime.now()
+        if not self.is_daily and now.weekday() not in self.days_of_week:
+            return None
+        return _get_seconds_into_day(now) - self.minute_of_day * 60
 
-    def has_just_passed_as_of_last_ring_check(self):
+    def has_just_passed_as_of_last_ring_check(
+        self, now: Optional[datetime.datetime] = None
+    ) -> bool:
         """Returns True if the alarm has just passed as of the last ring check, False
         otherwise."""
-        secs_since_todays_ring_dtime = (
-            datetime.datetime.now() - self.get_todays_ring_datetime()
-        ).total_seconds()
-        return 0 <= secs_since_todays_ring_dtime <= N_SECONDS_BW_RING_CHECKS
+        secs_since_ring = self._get_secs_since_todays_ring_time(now)
+        if secs_since_ring is None:
+            return False
+        return 0 <= secs_since_ring <= N_SECONDS_BW_RING_CHECKS
 
-    def has_passed_in_the_last_n_minutes(self, n_minutes: int) -> bool:
+    def has_passed_in_the_last_n_minutes(
+        self, n_minutes: int, now: Optional[datetime.datetime] = None
+    ) -> bool:
         """Returns True if the alarm has passed in the last n minutes, False
         otherwise."""
-        secs_since_todays_ring_dtime = (
-            datetime.datetime.now() - self.get_todays_ring_datetime()
-        ).total_seconds()
-        return 0 <= secs_since_todays_ring_dtime <= n_minutes * 60
+        secs_since_ring = self._get_secs_since_todays_ring_time(now)
+        if secs_since_ring is None:
+            return False
+        return 0 <= secs_since_ring <= n_minutes * 60
 
-    def should_ring(self) -> bool:
+    def should_ring(self, now: Optional[datetime.datetime] = None) -> bool:
         """Returns True if the alarm should be rung, False otherwise."""
-        return self.is_enabled and self.has_just_passed_as_of_last_ring_check()
-
-    def get_next_ring_datetime(self) -> datetime.datetime:
-        """Returns the datetime of the next time the alarm should be rung."""
-        now = datetime.datetime.now()
-        todays_ring_dtime = self.get_todays_ring_datetime()
-        if todays_ring_dtime < now:  # is past, then next is tomorrow
-            return todays_ring_dtime + datetime.timedelta(days=1)
-        else:  # next is today
-            return todays_ring_dtime
+        return self.is_enabled and self.has_just_passed_as_of_last_ring_check(
+            now
+        )
+
+    def get_next_ring_datetime(
+        self, now: Optional[datetime.datetime] = None
+    ) -> Optional[datetime.datetime]:
+        """Returns the datetime of the next time (at or after `now`) the alarm should
+        be rung, or None if it isn't set to ring on any day of the week."""
+        now = now or datetime.datetime.now()
+        if self.is_daily:
+            result = _get_next_datetime([self.minute_of_day], now, False)
+        else:
+            result = _get_next_datetime(self.minutes_of_week, now, True)
+        return None if result is None else result[0]
+
+
+class AlarmIndex(Generic[T]):
+    """An index of enabled alarms (each w/ an associated item, e.g. its routine) sorted
+    by minute-of-day (daily alarms) & minute-of-week (others) so that the next alarm to
+    ring is found w/ a bisect of each.
+
+    Usage:
+        index = AlarmIndex((a, routine) for routine in routines for a in routine.alarms)
+        next_ring_datetime, alarm, routine = index.get_next(datetime.datetime.now())
+    """
+
+    def __init__(self, alarms_and_items: Iterable[Tuple[Alarm, T]]):
+        self._alarms_and_items: List[Tuple[Alarm, T]] = []
+        daily_entries, weekly_entries = [], []  # (minute, idx of alarm & item)
+        for alarm, item in alarms_and_items:
+            if not alarm.is_enabled:
+                continue
+            n = len(self._alarms_and_items)
+            self._alarms_and_items.append((alarm, item))
+            if alarm.is_daily:
+                daily_entries.append((alarm.minute_of_day, n))
+            else:
+                weekly_entries.extend((m, n) for m in alarm.minutes_of_week)
+        daily_entries.sort()
+        weekly_entries.sort()
+        self._daily_minutes = [minute for minute, _ in daily_entries]
+        self._daily_ns = [n for _, n in daily_entries]
+        self._weekly_minutes = [minute for minute, _ in weekly_entries]
+        self._weekly_ns = [n for _, n in weekly_entries]
+
+    def __len__(self) -> int:
+        return len(self._alarms_and_items)
+
+    def get_next(
+        self, now: Optional[datetime.datetime] = None
+    ) -> Optional[Tuple[datetime.datetime, Alarm, T]]:
+        """Returns the next ring datetime (at or after `now`) among all of the indexed
+        alarms along w/ that alarm & its item, or None if the index is empty.
+        """
+        now = now or datetime.datetime.now()
+        candidates = []  # (ring datetime, idx of alarm & item)
+        daily_result = _get_next_datetime(self._daily_minutes, now, False)
+        if daily_result is not None:
+            candidates.append(
+                (daily_result[0], self._daily_ns[daily_result[1]])
+            )
+        weekly_result = _get_next_datetime(self._weekly_minutes, now, True)
+        if weekly_result is not None:
+            candidates.append(
+                (weekly_result[0], self._weekly_ns[weekly_result[1]])
+            )
+        if not candidates:
+            return None
+        next_ring_datetime, n = min(candidates)
+        return next_ring_datetime, *self._alarms_and_items[n]
@@ -28,12 +28,41 @@ Usage:
         hero.name = "Batman"
         hero.update_in_db(engine)
         hero.delete_from_db(engine)
+
+    4. Optionally, group several interactions into one session & transaction:
+
+        with db_unit_of_work(engine):
+            heroes = Hero.query(engine)
+            hero.update_in_db(engine)  # committed when the block exits
+
+    5. From within an event loop, use the async counterparts, which run on a dedicated
+    DB worker thread so as to not block the loop:
+
+        heroes = await Hero.aquery(engine)
+        await hero.aadd(engine)
 """
 
+import asyncio
 import datetime
-import sys
+import functools
 import warnings
-from typing import List, Optional, Protocol, Self, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Self,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import rich.pretty
 from loguru import logger
@@ -85,6 +114,40 @@ class DatabaseDeletionFailedError(Exception):
     """Raised when an attempted BaseDBPydanticModel.delete_from_db() fails."""
 
 
+class DBWriteOperation(StrEnum):
+    ADD = "add"
+    UPDATE = "update"
+    DELETE = "delete"
+    # A unit of work's flushed writes were all rolled back
+    ROLLBACK = "rollback"
+
+
+# Called w/ (instance, operation) after each write (instance is None for ROLLBACK)
+DBWriteListener = Callable[
+    [Optional["BaseDBPydanticModel"], DBWriteOperation], None
+]
+
+_DB_WRITE_LISTENERS: List[DBWriteListener] = []
+
+
+def add_db_write_listener(listener: DBWriteListener) -> None:
+    """Registers a callback to be notified of every BaseDBPydanticModel write (e.g. to
+    keep a cache in sync w/ the database)."""
+    _DB_WRITE_LISTENERS.append(listener)
+
+
+def remove_db_write_listener(listener: DBWriteListener) -> None:
+    """Unregisters a callback registered w/ add_db_write_listener."""
+    _DB_WRITE_LISTENERS.remove(listener)
+
+
+def _notify_db_write_listeners(
+    instance: Optional["BaseDBPydanticModel"], operation: DBWriteOperation
+) -> None:
+    for listener in list(_DB_WRITE_LISTENERS):
+        listener(instance, operation)
+
+
 class DeclarativeBaseProxyType:
     """
     Proxy type for monkey-patching a type-hint to the return value of declarative_base().
@@ -102,6 +165,136 @@ SQLAlchemyBase: DeclarativeBaseProxyType = declarative_base()
 
 now = datetime.datetime.utcnow
 
+# Max number of uids per `IN (...)` clause (older SQLite builds cap bound params at 999)
+BULK_IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def _chunked(list_: list, chunk_size: int) -> Iterator[list]:
+    """Yields successive chunks of (at most) `chunk_size` items from `list_`."""
+    for start_idx in range(0, len(list_), chunk_size):
+        end_idx = start_idx + chunk_size
+        yield list_[start_idx:end_idx]
+
+
+# A single worker thread serializes async DB interactions (as SQLite does with writes)
+_DB_WORKER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db_worker")
+
+
+async def run_in_db_worker(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Awaits the result of `func(*args, **kwargs)` run on the DB worker thread.
+
+    NOTE: Runs outside of any active `db_unit_of_work` (context vars aren't copied to
+    the worker thread), so each call uses its own session & transaction.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _DB_WORKER, functools.partial(func, *args, **kwargs)
+    )
+
+
+def submit_to_db_worker(func: Callable[..., Any], *args, **kwargs) -> Future:
+    """Schedules `func(*args, **kwargs)` to run on the DB worker thread w/o waiting for
+    it (e.g. from synchronous code running on the event loop)."""
+    return _DB_WORKER.submit(func, *args, **kwargs)
+
+
+class UnitOfWork:
+    """A session shared by all BaseDBPydanticModel interactions made with the same
+    engine within a `db_unit_of_work` block.
+
+    Reads reuse one connection & identity map, and writes are flushed (rather than
+    committed) so that they are committed all at once when the block exits. If they
+    are rolled back instead, the written instances' read-only fields (e.g. the uids
+    given to added instances) are restored to what they were before the block.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.session = Session(engine, expire_on_commit=False)
+        self._read_only_fields_before_writes: List[Tuple[Any, dict]] = []
+
+    def remember_read_only_fields(self, instance: Any) -> None:
+        """Records the instance's read-only fields before a write changes them."""
+        self._read_only_fields_before_writes.append(
+            (
+                instance,
+                {f: getattr(instance, f) for f in instance._READ_ONLY_FIELDS},
+            )
+        )
+
+    def restore_read_only_fields(self) -> None:
+        """Restores the read-only fields of the instances written within the unit of
+        work (latest write first)."""
+        for instance, values in reversed(self._read_only_fields_before_writes):
+            instance._set_read_only_fields(**values)
+        self._read_only_fields_before_writes = []
+
+
+_ACTIVE_UNIT_OF_WORK: ContextVar[Optional[UnitOfWork]] = ContextVar(
+    "_ACTIVE_UNIT_OF_WORK", default=None
+)
+
+
+@contextmanager
+def db_unit_of_work(engine: Engine) -> Iterator[UnitOfWork]:
+    """Context manager within which all BaseDBPydanticModel interactions w/ `engine`
+    join one session, committed when the block exits (or rolled back if it raises).
+
+    Nested blocks w/ the same engine join the outermost unit of work.
+    """
+    active_unit_of_work = _ACTIVE_UNIT_OF_WORK.get()
+    if (
+        active_unit_of_work is not None
+        and active_unit_of_work.engine is engine
+    ):
+        yield active_unit_of_work
+        return
+    unit_of_work = UnitOfWork(engine)
+    token = _ACTIVE_UNIT_OF_WORK.set(unit_of_work)
+    try:
+        yield unit_of_work
+        unit_of_work.session.commit()
+    except BaseException:
+        unit_of_work.session.rollback()
+        unit_of_work.restore_read_only_fields()
+        _notify_db_write_listeners(None, DBWriteOperation.ROLLBACK)
+        raise
+    finally:
+        _ACTIVE_UNIT_OF_WORK.reset(token)
+        unit_of_work.session.close()
+
+
+def _remember_read_only_fields(engine: Engine, instances: List[Any]) -> None:
+    """Has the active unit of work for `engine` (if any) remember the instances'
+    read-only fields, so that they can be restored if it is rolled back."""
+    active_unit_of_work = _ACTIVE_UNIT_OF_WORK.get()
+    if (
+        active_unit_of_work is not None
+        and active_unit_of_work.engine is engine
+    ):
+        for instance in instances:
+            active_unit_of_work.remember_read_only_fields(instance)
+
+
+@contextmanager
+def _session_scope(engine: Engine, commit: bool = True) -> Iterator[Session]:
+    """Yields the session of the active unit of work for `engine` (flushing upon exit)
+    if there is one, otherwise a fresh session (committed upon exit if `commit`).
+    """
+    active_unit_of_work = _ACTIVE_UNIT_OF_WORK.get()
+    if (
+        active_unit_of_work is not None
+        and active_unit_of_work.engine is engine
+    ):
+        yield active_unit_of_work.session
+        if commit:
+            active_unit_of_work.session.flush()
+        return
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+        if commit:
+            session.commit()
+
 
 class BaseDBORMModel(SQLAlchemyBase):
     """Base for SQLAlchemy ORM models that interact with a database.
@@ -138,37 +331,36 @@ class BaseDBPydanticModel(BaseModel):
     created_at: Optional[datetime.datetime] = None
     updated_at: Optional[datetime.datetime] = None
 
+    # Fields that only the database (via _set_read_only_fields) may set
+    _READ_ONLY_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "uid",
+        "created_at",
+        "updated_at",
+    )
+
     def __init__(self, **kwargs):
-        _READ_ONLY_FIELDS = {"uid", "created_at", "updated_at"}
         self._validate_orm_model()
         # if any protected fields are being initialized, raise error
-        if any(field in kwargs.keys() for field in _READ_ONLY_FIELDS):
+        if any(field in kwargs for field in self._READ_ONLY_FIELDS):
             raise AttemptedSetOnReadOnlyFieldError(
-                f"Cannot initialize the following fields: {_READ_ONLY_FIELDS}"
+                f"Cannot initialize the following fields: {self._READ_ONLY_FIELDS}"
             )
         super().__init__(**kwargs)
 
     def __setattr__(self, name, value):
         """Prevents external modification of a protected field."""
-        _READ_ONLY_FIELDS = {"uid", "created_at", "updated_at"}
-        if name in _READ_ONLY_FIELDS:
-            # determine if the scope that is attempting to modify the attribute is
-            # within a class
-            outer_scope_locals = sys._getframe(1).f_locals
-            if "cls" in outer_scope_locals.keys():
-                modifying_class = outer_scope_locals["cls"]
-            elif "self" in outer_scope_locals.keys():
-                modifying_class = outer_scope_locals["self"].__class__
-            else:
-                modifying_class = None
-            # if not within a class of if the modifying class is not self.__class__,
-            # raise error
-            if modifying_class != self.__class__:
-                raise AttemptedSetOnReadOnlyFieldError(
-                    f"Cannot modify field: '{name}'"
-                )
+        if name in self._READ_ONLY_FIELDS:
+            raise AttemptedSetOnReadOnlyFieldError(
+                f"Cannot modify field: '{name}'"
+            )
         super().__setattr__(name, value)
 
+    def _set_read_only_fields(self, **values) -> None:
+        """Privileged setter through which this module's database methods write the
+        protected fields (bypassing the guard in __setattr__)."""
+        for name, value in values.items():
+            BaseModel.__setattr__(self, name, value)
+
     class Config:
         """Pydantic model config--see: docs.pydantic.dev/usage/model_config/"""
 
@@ -242,13 +434,70 @@ class BaseDBPydanticModel(BaseModel):
         cls._validate_orm_model()
         if order_by is None:
             order_by = cls.Config.orm_model.created_at.asc()
-        with Session(engine) as session:
+        with _session_scope(engine, commit=False) as session:
             query = session.query(cls.Config.orm_model)
             if filter_expr is not None:
                 query = query.filter(filter_expr)
             results = query.order_by(order_by).limit(limit).all()
             return [cls.from_orm(obj) for obj in results] if results else []
 
+    @classmethod
+    def query_iter(
+        cls,
+        engine: Engine,
+        filter_expr: Optional[BinaryExpression] = None,
+        order_by: Optional[UnaryExpression] = None,
+        limit: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+        into: Optional[Callable[..., Any]] = None,
+        chunk_size: int = 500,
+    ) -> Iterator[Any]:
+        """Lazily iterates over query results, fetching them from the database in
+        chunks so that memory use stays bounded no matter how many rows match.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine to use for the query.
+            filter_ (Optional[BinaryExpression]): The SQLAlchemy binary expression that
+                will be used to filter the query. Defaults to None.
+            order_by (Optional[UnaryExpression]): The SQLAlchemy unary expression that
+                will be used to order the query. Defaults to None.
+            limit (Optional[int]): The maximum number of results to yield. Defaults to
+                None (no limit).
+            columns (Optional[Sequence[str]]): The names of the columns to project. If
+                given, lightweight named-tuple-like rows of just these columns are
+                yielded instead of (validated) model instances. Defaults to None.
+            into (Optional[Callable[..., Any]]): A type (e.g. a dataclass) to build from
+                each projected row's values, in the order of `columns`. Defaults to
+                None (yield the rows themselves).
+            chunk_size (int): The number of rows fetched per round-trip. Defaults to 500.
+        Yields:
+            Self, or a projected row/`into` instance if `columns` is given.
+        """
+        log_db_event(cls.__name__, "query_iter")
+        cls._validate_orm_model()
+        if into is not None and columns is None:
+            raise ValueError("`into` can only be used alongside `columns`")
+        if order_by is None:
+            order_by = cls.Config.orm_model.created_at.asc()
+        if columns is None:
+            entities = [cls.Config.orm_model]
+        else:
+            entities = [getattr(cls.Config.orm_model, c) for c in columns]
+        with _session_scope(engine, commit=False) as session:
+            query = session.query(*entities)
+            if filter_expr is not None:
+                query = query.filter(filter_expr)
+            query = query.order_by(order_by)
+            if limit is not None:
+                query = query.limit(limit)
+            for result in query.yield_per(chunk_size):
+                if columns is None:
+                    yield cls.from_orm(result)
+                elif into is not None:
+                    yield into(*result)
+                else:
+                    yield result
+
     def add_self_to_db(self, engine: Engine) -> None:
         """Adds the model instance to the database.
 
@@ -259,18 +508,31 @@ class BaseDBPydanticModel(BaseModel):
         """
         log_db_event(self.__class__.__name__, "add_self_to_db", self.uid)
         self._validate_orm_model()
-        with Session(engine) as session:
+        with _session_scope(engine) as session:
+            # NOTE: check before flushing so that, within a unit of work, a duplicate
+            # doesn't spoil the shared session's transaction
+            if (
+                self.uid is not None
+                and session.get(self.Config.orm_model, self.uid) is not None
+            ):
+                raise InstanceAlreadyExistsError(
+                    "Model instance already in database"
+                )
             orm_model_instance = self._to_orm()
             session.add(orm_model_instance)
             try:
-                session.commit()
+                session.flush()
             except IntegrityError as e:
                 raise InstanceAlreadyExistsError(
                     "Model instance already in database"
                 ) from e
-            self.uid = orm_model_instance.uid
-            self.created_at = orm_model_instance.created_at
-            self.updated_at = orm_model_instance.updated_at
+            _remember_read_only_fields(engine, [self])
+            self._set_read_only_fields(
+                uid=orm_model_instance.uid,
+                created_at=orm_model_instance.created_at,
+                updated_at=orm_model_instance.updated_at,
+            )
+        _notify_db_write_listeners(self, DBWriteOperation.ADD)
 
     def update_self_in_db(self, engine: Engine) -> None:
         """Updates the model instance in the database
@@ -284,7 +546,7 @@ class BaseDBPydanticModel(BaseModel):
         self._validate_orm_model()
         updates_to_make = self.dict()
         updates_to_make["updated_at"] = now()
-        with Session(engine) as session:
+        with _session_scope(engine) as session:
             rows_affected = (
                 session.query(self.Config.orm_model)
                 .filter(self.Config.orm_model.uid == self.uid)
@@ -300,8 +562,9 @@ class BaseDBPydanticModel(BaseModel):
                     f"Expected to update 1 row, but {rows_affected} were set to be"
                     f"updated - Pending update was NOT committed to the database"
                 )
-            session.commit()
-        self.updated_at = updates_to_make["updated_at"]
+        _remember_read_only_fields(engine, [self])
+        self._set_read_only_fields(updated_at=updates_to_make["updated_at"])
+        _notify_db_write_listeners(self, DBWriteOperation.UPDATE)
 
     def delete_self_from_db(self, engine: Engine) -> None:
         """Deletes the model instance from the database
@@ -313,7 +576,7 @@ class BaseDBPydanticModel(BaseModel):
         """
         log_db_event(self.__class__.__name__, "delete_self_from_db", self.uid)
         self._validate_orm_model()
-        with Session(engine) as session:
+        with _session_scope(engine) as session:
             rows_affected = (
                 session.query(self.Config.orm_model)
                 .filter(self.Config.orm_model.uid == self.uid)
@@ -329,10 +592,172 @@ class BaseDBPydanticModel(BaseModel):
                     f"Expected to delete 1 row, but {rows_affected} were set to be"
                     f"deleted - Pending deletion was NOT committed to the database"
                 )
-            session.commit()
-        self.uid = None
-        self.created_at = None
-        self.updated_at = None
+        # NOTE: notified before the uid is cleared so listeners can tell what was deleted
+        _notify_db_write_listeners(self, DBWriteOperation.DELETE)
+        _remember_read_only_fields(engine, [self])
+        self._set_read_only_fields(uid=None, created_at=None, updated_at=None)
+
+    @classmethod
+    def _count_existing_uids(cls, session: Session, uids: List[int]) -> int:
+        """Counts how many of the given uids exist in the model's table, querying in
+        chunks to stay under SQLite's bound-parameter limit."""
+        n_existing = 0
+        for chunk in _chunked(uids, BULK_IN_CLAUSE_CHUNK_SIZE):
+            n_existing += (
+                session.query(cls.Config.orm_model.uid)
+                .filter(cls.Config.orm_model.uid.in_(chunk))
+                .count()
+            )
+        return n_existing
+
+    @classmethod
+    def add_many(cls, engine: Engine, instances: List[Self]) -> None:
+        """Adds many model instances to the database in a single transaction.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine to use for the query.
+            instances (List[Self]): The model instances to add.
+        Returns:
+            None
+        """
+        log_db_event(cls.__name__, f"add_many[n={len(instances)}]")
+        cls._validate_orm_model()
+        if len(instances) == 0:
+            return
+        uids = [i.uid for i in instances if i.uid is not None]
+        with _session_scope(engine) as session:
+            if cls._count_existing_uids(session, uids) > 0:
+                raise InstanceAlreadyExistsError(
+                    "One or more model instances already in database - Pending "
+                    "additions were NOT committed to the database"
+                )
+            orm_model_instances = [
+                instance._to_orm() for instance in instances
+            ]
+            session.add_all(orm_model_instances)
+            try:
+                session.flush()
+            except IntegrityError as e:
+                raise InstanceAlreadyExistsError(
+                    "One or more model instances already in database - Pending "
+                    "additions were NOT committed to the database"
+                ) from e
+        _remember_read_only_fields(engine, instances)
+        # NOTE: sessions don't expire on commit, so these are read w/o a SELECT per row
+        for instance, orm_model_instance in zip(
+            instances, orm_model_instances
+        ):
+            instance._set_read_only_fields(
+                uid=orm_model_instance.uid,
+                created_at=orm_model_instance.created_at,
+                updated_at=orm_model_instance.updated_at,
+            )
+            _notify_db_write_listeners(instance, DBWriteOperation.ADD)
+
+    @classmethod
+    def update_many(cls, engine: Engine, instances: List[Self]) -> None:
+        """Updates many model instances in the database in a single transaction.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine to use for the query.
+            instances (List[Self]): The model instances to update.
+        Returns:
+            None
+        """
+        log_db_event(cls.__name__, f"update_many[n={len(instances)}]")
+        cls._validate_orm_model()
+        if len(instances) == 0:
+            return
+        updated_at = now()
+        updates_to_make = []
+        for instance in instances:
+            instance_updates = instance.dict()
+            instance_updates["updated_at"] = updated_at
+            updates_to_make.append(instance_updates)
+        uids = [instance.uid for instance in instances]
+        with _session_scope(engine) as session:
+            n_existing = cls._count_existing_uids(session, uids)
+            if n_existing != len(set(uids)) or len(set(uids)) != len(uids):
+                raise DatabaseUpdateFailedError(
+                    f"Expected to update {len(uids)} distinct rows, but only "
+                    f"{n_existing} were found - Pending updates were NOT committed "
+                    "to the database"
+                )
+            session.bulk_update_mappings(cls.Config.orm_model, updates_to_make)
+            # Bulk updates bypass the identity map, so make sure it isn't left stale
+            session.expire_all()
+        _remember_read_only_fields(engine, instances)
+        for instance in instances:
+            instance._set_read_only_fields(updated_at=updated_at)
+            _notify_db_write_listeners(instance, DBWriteOperation.UPDATE)
+
+    @classmethod
+    def delete_many(cls, engine: Engine, instances: List[Self]) -> None:
+        """Deletes many model instances from the database in a single transaction.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine to use for the query.
+            instances (List[Self]): The model instances to delete.
+        Returns:
+            None
+        """
+        log_db_event(cls.__name__, f"delete_many[n={len(instances)}]")
+        cls._validate_orm_model()
+        if len(instances) == 0:
+            return
+        uids = [instance.uid for instance in instances]
+        with _session_scope(engine) as session:
+            rows_affected = 0
+            for chunk in _chunked(uids, BULK_IN_CLAUSE_CHUNK_SIZE):
+                rows_affected += (
+                    session.query(cls.Config.orm_model)
+                    .filter(cls.Config.orm_model.uid.in_(chunk))
+                    .delete()
+                )
+            if rows_affected != len(uids):
+                raise DatabaseDeletionFailedError(
+                    f"Expected to delete {len(uids)} rows, but {rows_affected} were "
+                    "set to be deleted - Pending deletions were NOT committed to the "
+                    "database"
+                )
+        _remember_read_only_fields(engine, instances)
+        for instance in instances:
+            _notify_db_write_listeners(instance, DBWriteOperation.DELETE)
+            instance._set_read_only_fields(
+                uid=None, created_at=None, updated_at=None
+            )
+
+    @classmethod
+    async def aquery_one(
+        cls, engine: Engine, filter_expr: Optional[BinaryExpression] = None
+    ) -> Optional[Self]:
+        """Async counterpart of query_one() (run on the DB worker thread)."""
+        return await run_in_db_worker(cls.query_one, engine, filter_expr)
+
+    @classmethod
+    async def aquery(
+        cls,
+        engine: Engine,
+        filter_expr: Optional[BinaryExpression] = None,
+        order_by: Optional[UnaryExpression] = None,
+        limit: int = 10_000,
+    ) -> List[Self]:
+        """Async counterpart of query() (run on the DB worker thread)."""
+        return await run_in_db_worker(
+            cls.query, engine, filter_expr, order_by, limit
+        )
+
+    async def aadd(self, engine: Engine) -> None:
+        """Async counterpart of add_self_to_db() (run on the DB worker thread)."""
+        await run_in_db_worker(self.add_self_to_db, engine)
+
+    async def aupdate(self, engine: Engine) -> None:
+        """Async counterpart of update_self_in_db() (run on the DB worker thread)."""
+        await run_in_db_worker(self.update_self_in_db, engine)
+
+    async def adelete(self, engine: Engine) -> None:
+        """Async counterpart of delete_self_from_db() (run on the DB worker thread)."""
+        await run_in_db_worker(self.delete_self_from_db, engine)
 
     def __str__(self):
         pretty_dict = rich.pretty.pretty_repr(self.dict())
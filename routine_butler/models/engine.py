@@ -0,0 +1,90 @@
+"""Named SQLite engine profiles: the PRAGMAs set on every new DB connection (through a
+SQLAlchemy "connect" event) and the connection pool settings of the engine.
+
+Usage:
+    engine = create_sqlite_engine(DB_URL, SQLITE_ENGINE_PROFILES["performance"])
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+from loguru import logger
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from routine_butler.utils.logging import DB_LOG_LVL
+
+
+class SQLiteEngineProfile(NamedTuple):
+    """PRAGMA values & pool settings for a SQLite engine. PRAGMAs left as None keep
+    SQLite's own defaults."""
+
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    mmap_size: Optional[int] = None  # In bytes
+    # In pages if positive, in KiB if negative
+    cache_size: Optional[int] = None
+    temp_store: Optional[str] = None
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_recycle_seconds: int = -1  # -1 means never recycle
+
+    @property
+    def pragmas(self) -> Dict[str, object]:
+        pragmas = {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "temp_store": self.temp_store,
+        }
+        return {name: val for name, val in pragmas.items() if val is not None}
+
+
+SQLITE_ENGINE_PROFILES: Dict[str, SQLiteEngineProfile] = {
+    # SQLite's defaults: rollback journal & a full fsync on every commit
+    "default": SQLiteEngineProfile(),
+    # WAL w/ synchronous=NORMAL only fsyncs at checkpoints, which can lose the last
+    # few commits on power loss (but never corrupts the DB)
+    "performance": SQLiteEngineProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=64 * 1024 * 1024,
+        cache_size=-16 * 1024,
+        temp_store="MEMORY",
+        pool_size=5,
+        max_overflow=5,
+        pool_recycle_seconds=60 * 60,
+    ),
+}
+
+
+def create_sqlite_engine(
+    db_url: str, profile: SQLiteEngineProfile = SQLiteEngineProfile()
+) -> Engine:
+    """Creates a SQLAlchemy engine for the given SQLite file URL that applies the
+    profile's PRAGMAs to each new connection & pools connections per the profile.
+    """
+    engine = create_engine(
+        db_url,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_recycle=profile.pool_recycle_seconds,
+    )
+    pragmas = profile.pragmas
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    logger.log(DB_LOG_LVL, f"Created SQLite engine w/ PRAGMAs: {pragmas}")
+    return engine
+
+
+def checkpoint_wal(engine: Engine) -> None:
+    """Moves all WAL-mode transactions into the main DB file (e.g. before copying it)
+    and truncates the WAL. A no-op for DBs not in WAL mode."""
+    with engine.connect() as connection:
+        connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
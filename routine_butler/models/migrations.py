@@ -0,0 +1,204 @@
+"""A versioned schema-migration runner that brings databases created by older versions
+of the app up to date with the current ORM models (which
+`SQLAlchemyBase.metadata.create_all` alone cannot do for tables that already exist).
+
+Each migration is applied at most once, in its own transaction, and is recorded in the
+schema_version table. Migration steps must also be idempotent, since databases freshly
+created by `create_all` already reflect them, and must declare the indexes they create
+explicitly (rather than create the ORM models' current ones), so that what a migration
+does never changes once it has shipped.
+
+Usage:
+    Add a Migration w/ the next version number to the end of MIGRATIONS:
+
+        Migration(3, "Add heroes.nickname column", add_hero_nickname_column)
+"""
+
+import datetime
+import time
+from typing import Callable, List, NamedTuple
+
+from loguru import logger
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from routine_butler.models.program_run import (
+    PATH_KEY_PLUGIN_DICT_KEYS,
+    ProgramRunORM,
+)
+from routine_butler.utils.logging import DB_LOG_LVL
+
+SCHEMA_VERSION_TABLE = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String),
+    Column("applied_at", DateTime),
+    Column("duration_seconds", Float),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+class AppliedMigration(NamedTuple):
+    version: int
+    description: str
+    duration_seconds: float
+
+
+def _frozen_index(
+    table_name: str, index_name: str, *column_names: str
+) -> Index:
+    """Declares an index on a stand-in for the table (i.e. w/o adding it to, or reading
+    it from, the ORM models' metadata)."""
+    table = Table(table_name, MetaData(), *(Column(n) for n in column_names))
+    return Index(index_name, *(table.c[n] for n in column_names))
+
+
+PROGRAM_RUN_LOOKUP_INDEXES = [
+    _frozen_index(
+        "program_runs",
+        "ix_program_runs_latest_matching",
+        "plugin_type",
+        "path_key",
+        "reported_success",
+        "end_time",
+    ),
+]
+PER_USER_INDEXES = [
+    _frozen_index("routines", "ix_routines_user_uid", "user_uid"),
+    _frozen_index(
+        "programs", "ix_programs_user_uid_title", "user_uid", "title"
+    ),
+    _frozen_index(
+        "program_runs",
+        "ix_program_runs_user_history",
+        "user_uid",
+        "plugin_type",
+        "end_time",
+    ),
+]
+
+
+def add_program_run_lookup_columns(connection: Connection) -> None:
+    """Adds (if missing) the denormalized path_key & reported_success columns to the
+    program_runs table, backfills them from plugin_dict & run_data, and creates the
+    index used by ProgramRun.latest_matching.
+    """
+    table = ProgramRunORM.__table__
+    existing_column_names = {
+        column["name"]
+        for column in inspect(connection).get_columns(table.name)
+    }
+    for column in (table.c.path_key, table.c.reported_success):
+        if column.name not in existing_column_names:
+            column_type = column.type.compile(connection.dialect)
+            connection.execute(
+                text(
+                    f"ALTER TABLE {table.name} "
+                    f"ADD COLUMN {column.name} {column_type}"
+                )
+            )
+    path_key_expr = func.coalesce(
+        *[
+            func.json_extract(table.c.plugin_dict, f"$.{key}")
+            for key in PATH_KEY_PLUGIN_DICT_KEYS
+        ]
+    )
+    reported_success_expr = func.json_extract(
+        table.c.run_data, "$.reported_success"
+    )
+    result = connection.execute(
+        table.update()
+        .where(table.c.path_key.is_(None) & table.c.reported_success.is_(None))
+        .values(path_key=path_key_expr, reported_success=reported_success_expr)
+    )
+    logger.log(
+        DB_LOG_LVL,
+        f"Backfilled lookup columns of {result.rowcount} {table.name} rows",
+    )
+    for index in PROGRAM_RUN_LOOKUP_INDEXES:
+        index.create(connection, checkfirst=True)
+
+
+def add_per_user_indexes(connection: Connection) -> None:
+    """Creates (if missing) the indexes that serve User._get_children queries and
+    per-user program_runs history scans."""
+    for index in PER_USER_INDEXES:
+        index.create(connection, checkfirst=True)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "Add & backfill program_runs.path_key & reported_success",
+        add_program_run_lookup_columns,
+    ),
+    Migration(
+        2,
+        "Add per-user indexes to routines, programs & program_runs",
+        add_per_user_indexes,
+    ),
+]
+
+
+def get_schema_version(engine: Engine) -> int:
+    """Returns the version of the last migration applied to the database (0 if
+    none)."""
+    SCHEMA_VERSION_TABLE.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        query = select(func.max(SCHEMA_VERSION_TABLE.c.version))
+        return connection.execute(query).scalar() or 0
+
+
+def run_migrations(engine: Engine) -> List[AppliedMigration]:
+    """Applies, in order, each migration in MIGRATIONS that hasn't yet been applied to
+    the database, logging how long each took.
+
+    Returns:
+        A list of the migrations that were applied during this call.
+    """
+    schema_version = get_schema_version(engine)
+    applied_migrations = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version <= schema_version:
+            continue
+        start_time = time.perf_counter()
+        with engine.begin() as connection:
+            migration.apply(connection)
+            duration_seconds = time.perf_counter() - start_time
+            connection.execute(
+                SCHEMA_VERSION_TABLE.insert().values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=datetime.datetime.utcnow(),
+                    duration_seconds=duration_seconds,
+                )
+            )
+        logger.info(
+            f"🛢️ Applied DB migration {migration.version} "
+            f"({migration.description}) in {duration_seconds:.3f}s"
+        )
+        applied_migrations.append(
+            AppliedMigration(
+                migration.version, migration.description, duration_seconds
+            )
+        )
+    return applied_migrations
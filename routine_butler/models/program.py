@@ -1,10 +1,16 @@
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
 
-from pydantic import constr
-from sqlalchemy import JSON, Column, ForeignKey, Integer, String
+from pydantic import PrivateAttr, constr
+from sqlalchemy import JSON, Column, ForeignKey, Index, Integer, String
 
 from routine_butler.models.base import BaseDBORMModel, BaseDBPydanticModel
 from routine_butler.state import state
+from routine_butler.utils.misc import Plugin
+
+PLUGIN_CACHE_MAX_SIZE = 256
+
+PluginCacheKey = Tuple[str, Hashable]  # (plugin type, frozen plugin dict)
 
 
 class ProgramORM(BaseDBORMModel):
@@ -19,6 +25,54 @@ class ProgramORM(BaseDBORMModel):
     plugin_dict = Column(JSON)
     user_uid = Column(Integer, ForeignKey("users.uid"))
 
+    __table_args__ = (
+        Index("ix_programs_user_uid_title", "user_uid", "title"),
+    )
+
+
+def _freeze(value: Any) -> Hashable:
+    """Recursively converts (JSON-like) dicts & lists into hashable tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class PluginCache:
+    """LRU cache of validated plugin instances keyed by (plugin type, plugin dict) so
+    that identical programs (e.g. in different routines) share validation work.
+
+    NOTE: Plugins are immutable configuration (their UIs keep their own state), so
+    one instance can safely be shared by many programs.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._plugins: OrderedDict[PluginCacheKey, Plugin] = OrderedDict()
+
+    def get(self, plugin_type: str, plugin_dict: dict) -> Plugin:
+        key = (plugin_type, _freeze(plugin_dict))
+        plugin = self._plugins.get(key)
+        if plugin is not None:
+            self.hits += 1
+            self._plugins.move_to_end(key)
+            return plugin
+        self.misses += 1
+        plugin = state.plugins[plugin_type](**plugin_dict)
+        self._plugins[key] = plugin
+        if len(self._plugins) > self.max_size:
+            self._plugins.popitem(last=False)
+        return plugin
+
+    def clear(self) -> None:
+        self._plugins.clear()
+
+
+plugin_cache = PluginCache(PLUGIN_CACHE_MAX_SIZE)
+
 
 class Program(BaseDBPydanticModel):
     """BaseDBPydanticModel model for a Program"""
@@ -29,13 +83,29 @@ class Program(BaseDBPydanticModel):
     plugin_dict: Optional[dict] = None
     user_uid: Optional[int] = None
 
+    # Memoized plugin instance, dropped whenever plugin_type or plugin_dict is set
+    _plugin: Optional[Plugin] = PrivateAttr(default=None)
+
     class Config:
         orm_model = ProgramORM
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("plugin_type", "plugin_dict"):
+            self._plugin = None
+
+    @property
+    def plugin(self) -> Plugin:
+        """The program's plugin instance (built from the shared plugin cache on first
+        access)."""
+        if self._plugin is None:
+            self._plugin = plugin_cache.get(
+                self.plugin_type, self.plugin_dict or {}
+            )
+        return self._plugin
+
     def administer(self, on_complete: callable) -> dict:
-        plugin = state.plugins[self.plugin_type](**self.plugin_dict)
-        plugin.administer(on_complete=on_complete)
+        self.plugin.administer(on_complete=on_complete)
 
     def estimate_duration_in_seconds(self) -> float:
-        plugin = state.plugins[self.plugin_type](**self.plugin_dict)
-        return plugin.estimate_duration_in_seconds()
+        return self.plugin.estimate_duration_in_seconds()
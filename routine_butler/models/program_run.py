@@ -1,9 +1,25 @@
 import datetime
+from typing import Optional, Self
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+from pydantic import computed_field
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import BinaryExpression
 
 from routine_butler.models.base import BaseDBORMModel, BaseDBPydanticModel
 
+# Keys of a plugin_dict whose (first present) value is denormalized into path_key
+PATH_KEY_PLUGIN_DICT_KEYS = ["path_or_id", "path"]
+
 
 class ProgramRunORM(BaseDBORMModel):
     """BaseDBORMModel model for a Program Run"""
@@ -18,6 +34,25 @@ class ProgramRunORM(BaseDBORMModel):
     end_time = Column(DateTime)
     run_data = Column(JSON)
     user_uid = Column(Integer, ForeignKey("users.uid"))
+    # Denormalized from plugin_dict & run_data so that history lookups can be indexed
+    path_key = Column(String)
+    reported_success = Column(Boolean)
+
+    __table_args__ = (
+        Index(
+            "ix_program_runs_latest_matching",
+            "plugin_type",
+            "path_key",
+            "reported_success",
+            "end_time",
+        ),
+        Index(
+            "ix_program_runs_user_history",
+            "user_uid",
+            "plugin_type",
+            "end_time",
+        ),
+    )
 
 
 class ProgramRun(BaseDBPydanticModel):
@@ -34,3 +69,59 @@ class ProgramRun(BaseDBPydanticModel):
 
     class Config:
         orm_model = ProgramRunORM
+
+    @computed_field
+    @property
+    def path_key(self) -> Optional[str]:
+        for key in PATH_KEY_PLUGIN_DICT_KEYS:
+            if self.plugin_dict.get(key) is not None:
+                return str(self.plugin_dict[key])
+        return None
+
+    @computed_field
+    @property
+    def reported_success(self) -> Optional[bool]:
+        if self.run_data.get("reported_success") is None:
+            return None
+        return bool(self.run_data["reported_success"])
+
+    @classmethod
+    def latest_matching(
+        cls,
+        engine: Engine,
+        plugin_type: str,
+        path_key: str,
+        reported_success: Optional[bool] = True,
+        filter_expr: Optional[BinaryExpression] = None,
+    ) -> Optional[Self]:
+        """Queries the database for the most recently ended run of the given plugin
+        type & path key (by default, only considering runs that reported success).
+
+        Args:
+            engine (Engine): The SQLAlchemy engine to use for the query.
+            plugin_type (str): The plugin type of the run.
+            path_key (str): The run's path key (see PATH_KEY_PLUGIN_DICT_KEYS).
+            reported_success (Optional[bool]): The required value of the run's
+                reported_success, or None to not filter on it. Defaults to True.
+            filter_expr (Optional[BinaryExpression]): An additional SQLAlchemy binary
+                expression to filter by. Defaults to None.
+        Returns:
+            Optional[Self]: The most recent matching run, or None if there is none.
+        """
+        orm_model = cls.Config.orm_model
+        matching_filter_expr = (orm_model.plugin_type == plugin_type) & (
+            orm_model.path_key == path_key
+        )
+        if reported_success is not None:
+            matching_filter_expr &= (
+                orm_model.reported_success == reported_success
+            )
+        if filter_expr is not None:
+            matching_filter_expr &= filter_expr
+        results = cls.query(
+            engine,
+            filter_expr=matching_filter_expr,
+            order_by=orm_model.end_time.desc(),
+            limit=1,
+        )
+        return results[0] if results else None
@@ -0,0 +1,249 @@
+"""A write-behind journal for ProgramRuns: runs are appended to a local log (so that
+recording one doesn't pay SQLite commit latency) and are flushed to the database in
+batches, e.g. by a background task.
+
+Appends are written to the log on the caller's thread but fsynced on the DB worker
+thread, so the event loop never waits on the disk: a run survives a crash of the
+process as soon as it's appended, and a power loss once its fsync has run.
+
+Runs left unflushed by a crash or restart are replayed into the database on startup,
+and runs that repeatedly fail to be added to the database are moved to a quarantine
+file (rather than blocking the runs journaled after them).
+
+Usage:
+    journal = ProgramRunJournal(PROGRAM_RUN_JOURNAL_PATH)
+    journal.replay(engine)  # on startup
+    journal.append(program_run)
+    journal.flush(engine)  # or: await journal.flush_periodically(engine, 5)
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Dict, List, Tuple
+
+from loguru import logger
+from sqlalchemy.engine import Engine
+
+from routine_butler.models.base import (
+    BaseDBPydanticModel,
+    run_in_db_worker,
+    submit_to_db_worker,
+)
+from routine_butler.models.program_run import ProgramRun
+from routine_butler.utils.logging import DB_LOG_LVL
+
+# i.e. how many flushes may fail to add a run before it's quarantined
+MAX_N_FLUSH_ATTEMPTS = 3
+
+
+class ProgramRunJournal:
+    """Durable, append-only log of ProgramRuns that are pending a database write.
+
+    Appends happen on the caller's thread, while fsyncs & flushes may run concurrently
+    on the DB worker thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pending: List[ProgramRun] = []
+        # Guards self._pending & the file
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Keeps flushes from overlapping
+        # id of pending run -> n flushes that failed to add it
+        self._n_failed_flushes: Dict[int, int] = {}
+
+    @property
+    def n_pending(self) -> int:
+        return len(self._pending)
+
+    def get_pending(self) -> List[ProgramRun]:
+        """Returns the runs that have yet to be flushed to the database (oldest
+        first)."""
+        with self._pending_lock:
+            return list(self._pending)
+
+    @staticmethod
+    def _serialize(run: ProgramRun) -> str:
+        excluded_fields = set(BaseDBPydanticModel._READ_ONLY_FIELDS)
+        return run.model_dump_json(exclude=excluded_fields) + "\n"
+
+    def _read_entries(self) -> List[ProgramRun]:
+        """Reads the runs in the journal file, skipping a torn (partially written)
+        final line."""
+        if not os.path.exists(self.path):
+            return []
+        runs = []
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    runs.append(ProgramRun(**json.loads(line)))
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"Skipping torn ProgramRun journal line: {line}"
+                    )
+        return runs
+
+    @property
+    def quarantine_path(self) -> str:
+        return f"{self.path}.quarantine"
+
+    def _rewrite(self) -> None:
+        """Atomically replaces the journal file's contents w/ the pending runs.
+
+        NOTE: Must be called w/ self._flush_lock held (so that self._pending only
+        changes by appends), but self._pending_lock is only held to catch up on the
+        runs appended while the rest were being written.
+        """
+        with self._pending_lock:
+            runs = list(self._pending)
+        n_runs = len(runs)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.writelines(self._serialize(run) for run in runs)
+            f.flush()
+            os.fsync(f.fileno())
+        with self._pending_lock:
+            appended_runs = self._pending[n_runs:]
+            if appended_runs:
+                with open(tmp_path, "a") as f:
+                    f.writelines(self._serialize(run) for run in appended_runs)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+    def _fsync(self) -> None:
+        try:
+            with open(self.path, "a") as f:
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning(f"ProgramRun journal fsync failed: {e}")
+
+    def append(self, run: ProgramRun) -> None:
+        """Records the run as pending a database write (& schedules the journal's fsync
+        on the DB worker thread)."""
+        with self._pending_lock:
+            with open(self.path, "a") as f:
+                f.write(self._serialize(run))
+            self._pending.append(run)
+        submit_to_db_worker(self._fsync)
+
+    def _add_one_by_one(
+        self, engine: Engine, runs: List[ProgramRun]
+    ) -> Tuple[List[ProgramRun], List[ProgramRun]]:
+        """Adds each run to the database in its own transaction (i.e. so that a run
+        that can't be added doesn't keep the others from being added).
+
+        Returns:
+            Tuple[List[ProgramRun], List[ProgramRun]]: The added & the failed runs.
+        """
+        added_runs, failed_runs = [], []
+        for run in runs:
+            try:
+                run.add_self_to_db(engine)
+                added_runs.append(run)
+            except Exception as e:
+                logger.warning(f"Failed to flush journaled ProgramRun: {e}")
+                failed_runs.append(run)
+        return added_runs, failed_runs
+
+    def _quarantine(self, runs: List[ProgramRun]) -> None:
+        """Appends the runs to the quarantine file (so that they can be inspected)."""
+        with open(self.quarantine_path, "a") as f:
+            f.writelines(self._serialize(run) for run in runs)
+            f.flush()
+            os.fsync(f.fileno())
+        logger.error(
+            f"Quarantined {len(runs)} ProgramRuns that failed to flush "
+            f"{MAX_N_FLUSH_ATTEMPTS} times to: {self.quarantine_path}"
+        )
+
+    def flush(self, engine: Engine) -> int:
+        """Adds all pending runs to the database in one transaction & removes them from
+        the journal. If that fails, the runs are added one by one instead, & any run
+        that has failed to be added `MAX_N_FLUSH_ATTEMPTS` times is quarantined.
+
+        Returns:
+            int: The number of runs that were flushed.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                batch = list(self._pending)
+            if not batch:
+                return 0
+            try:
+                ProgramRun.add_many(engine, batch)
+                added_runs, failed_runs = batch, []
+            except Exception as e:
+                logger.warning(f"Batched ProgramRun journal flush failed: {e}")
+                added_runs, failed_runs = self._add_one_by_one(engine, batch)
+            runs_to_quarantine = []
+            for run in failed_runs:
+                n_failed_flushes = self._n_failed_flushes.get(id(run), 0) + 1
+                self._n_failed_flushes[id(run)] = n_failed_flushes
+                if n_failed_flushes >= MAX_N_FLUSH_ATTEMPTS:
+                    runs_to_quarantine.append(run)
+            if runs_to_quarantine:
+                self._quarantine(runs_to_quarantine)
+            ids_of_runs_to_remove = {
+                id(run) for run in added_runs + runs_to_quarantine
+            }
+            for run_id in ids_of_runs_to_remove:
+                self._n_failed_flushes.pop(run_id, None)
+            with self._pending_lock:
+                # Runs appended while the batch was being written remain pending
+                self._pending = [
+                    run
+                    for run in self._pending
+                    if id(run) not in ids_of_runs_to_remove
+                ]
+            self._rewrite()
+        if added_runs:
+            logger.log(
+                DB_LOG_LVL, f"Flushed {len(added_runs)} journaled ProgramRuns"
+            )
+        return len(added_runs)
+
+    def replay(self, engine: Engine) -> int:
+        """Flushes the runs left in the journal file by a previous process, skipping any
+        that were already added to the database (i.e. if the process stopped after its
+        last flush committed but before it cleared the journal).
+
+        Returns:
+            int: The number of runs that were replayed into the database.
+        """
+        orm_model = ProgramRun.Config.orm_model
+        with self._flush_lock:
+            with self._pending_lock:
+                unflushed_runs = []
+                for run in self._read_entries():
+                    is_same_run_filter_expr = (
+                        (orm_model.user_uid == run.user_uid)
+                        & (orm_model.plugin_type == run.plugin_type)
+                        & (orm_model.end_time == run.end_time)
+                        & (orm_model.program_title == run.program_title)
+                    )
+                    if (
+                        ProgramRun.query_one(engine, is_same_run_filter_expr)
+                        is None
+                    ):
+                        unflushed_runs.append(run)
+                self._pending = unflushed_runs + self._pending
+            self._rewrite()
+        n_replayed = self.flush(engine)
+        if n_replayed:
+            logger.info(f"Replayed {n_replayed} unflushed ProgramRuns")
+        return n_replayed
+
+    async def flush_periodically(
+        self, engine: Engine, interval_seconds: float
+    ) -> None:
+        """Forever flushes (on the DB worker thread) every `interval_seconds`."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            if self.n_pending > 0:
+                try:
+                    await run_in_db_worker(self.flush, engine)
+                except Exception as e:
+                    logger.warning(f"ProgramRun journal flush failed: {e}")
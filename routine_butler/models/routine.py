@@ -36,7 +36,7 @@ class RoutineORM(BaseDBORMModel):
     elements = Column(JSON)
     rewards = Column(JSON)
     alarms = Column(JSON)
-    user_uid = Column(Integer, ForeignKey("users.uid"))
+    user_uid = Column(Integer, ForeignKey("users.uid"), index=True)
 
 
 class Routine(BaseDBPydanticModel):
@@ -1,11 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Optional, Tuple, Union
 
 from pydantic import constr
 from sqlalchemy import Column, String
 from sqlalchemy.engine import Engine
 
-from routine_butler.models.alarm import Alarm
+from routine_butler.models.alarm import Alarm, AlarmIndex
 from routine_butler.models.base import (
     BaseDBORMModel,
     BaseDBPydanticModel,
@@ -71,29 +71,23 @@ class User(BaseDBPydanticModel):
         return self._get_children(engine, Program)
 
     def get_next_alarm_and_routine(
-        self, engine: Engine
+        self, engine: Engine, routines: Optional[List[Routine]] = None
     ) -> Tuple[Optional[Alarm], Optional[Routine]]:
-        """Queries the database for the user's routines and determines the next upcoming
-        alarm/routine.
+        """Queries the database for the user's routines (unless they are given) and
+        determines the next upcoming alarm/routine.
 
         Returns:
             A tuple w/ the next alarm and routine or (None, None) if there are no alarms.
         """
-        routines = self.get_routines(engine)  # query db for user's routines
-        # iterate through alarms in routines to find the next alarm/routine
-        now = datetime.now()
-        cur_closest_alarm = None
-        cur_closest_routine = None
-        cur_min_time_until_ring = timedelta(days=1)
-        for routine in routines:
-            for alarm in routine.alarms:
-                # only consider enabled alarms
-                if not alarm.is_enabled:
-                    continue
-                time_until_ring = alarm.get_next_ring_datetime() - now
-                # if time until next trigger time
-                if time_until_ring < cur_min_time_until_ring:
-                    cur_min_time_until_ring = time_until_ring
-                    cur_closest_alarm = alarm
-                    cur_closest_routine = routine
-        return cur_closest_alarm, cur_closest_routine
+        if routines is None:  # query db for user's routines
+            routines = self.get_routines(engine)
+        alarm_index = AlarmIndex(
+            (alarm, routine)
+            for routine in routines
+            for alarm in routine.alarms
+        )
+        next_ring = alarm_index.get_next(datetime.now())
+        if next_ring is None:
+            return None, None
+        _, next_alarm, next_routine = next_ring
+        return next_alarm, next_routine
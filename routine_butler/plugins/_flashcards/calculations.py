@@ -1,9 +1,13 @@
 """calculations.py Calcuations for the flashcards plugin."""
 
+import random
 from math import atan, factorial, pi
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Sequence
 
 if TYPE_CHECKING:
+    from routine_butler.plugins._flashcards.schema import (
+        FlashcardCollectionMetadata,
+    )
     from routine_butler.plugins.flashcards import FlashcardCollection
 
 
@@ -154,3 +158,76 @@ def get_n_to_cache(
         threshold_probability=threshold_probability,
     )
     return max(n_to_cache, 1)
+
+
+def get_selection_probabilities(
+    collections: Sequence["FlashcardCollectionMetadata"],
+) -> List[float]:
+    """Calculate the probability of each collection being chosen for a card draw
+    (i.e. its random_choice_weight over the total weight)."""
+    denom = sum(c.random_choice_weight for c in collections)
+    return [c.random_choice_weight / denom for c in collections]
+
+
+def get_expected_seconds_per_card(
+    collections: Sequence["FlashcardCollectionMetadata"],
+    selection_probabilities: Sequence[float],
+) -> float:
+    """Calculate the average seconds of a card, weighted by selection probability."""
+    return sum(
+        c.avg_seconds_per_card * p
+        for c, p in zip(collections, selection_probabilities)
+    )
+
+
+def get_seconds_cap(
+    collections: Sequence["FlashcardCollectionMetadata"],
+    selection_probabilities: Sequence[float],
+    target_seconds: int,
+) -> float:
+    """Calculate the cap on cumulative study time below which cards are still drawn
+    (i.e. the target less the expected seconds of one more card)."""
+    return target_seconds - get_expected_seconds_per_card(
+        collections, selection_probabilities
+    )
+
+
+def get_expected_n_draws(
+    collections: Sequence["FlashcardCollectionMetadata"],
+    selection_probabilities: Sequence[float],
+    target_seconds: int,
+) -> List[float]:
+    """Calculate the (approximate) expected number of cards drawn from each collection,
+    i.e. its selection probability times the seconds cap over the expected seconds per
+    card."""
+    seconds_per_card = get_expected_seconds_per_card(
+        collections, selection_probabilities
+    )
+    seconds_cap = get_seconds_cap(
+        collections, selection_probabilities, target_seconds
+    )
+    n_draws = max(seconds_cap, 0) / seconds_per_card
+    return [p * n_draws for p in selection_probabilities]
+
+
+def draw_collections(
+    collections: Sequence["FlashcardCollectionMetadata"],
+    selection_probabilities: Sequence[float],
+    target_seconds: int,
+) -> List[int]:
+    """Randomly choose (by index) the collection of each card to study, until the
+    cumulative seconds of studying reach the seconds cap.
+
+    NOTE: Since this only depends on the collections' (file name) metadata, it can be
+    done before any collection is downloaded."""
+    seconds_cap = get_seconds_cap(
+        collections, selection_probabilities, target_seconds
+    )
+    idxs = range(len(collections))
+    drawn_idxs = []
+    cumulative_seconds_of_studying = 0
+    while cumulative_seconds_of_studying < seconds_cap:
+        idx = random.choices(idxs, selection_probabilities)[0]
+        drawn_idxs.append(idx)
+        cumulative_seconds_of_studying += collections[idx].avg_seconds_per_card
+    return drawn_idxs
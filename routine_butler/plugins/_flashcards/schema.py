@@ -1,17 +1,22 @@
+import dataclasses
 import random
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 
 from loguru import logger
 from nicegui import ui
 
-from routine_butler.globals import DATAFRAME_LIKE
+from routine_butler.globals import (
+    DATAFRAME_LIKE,
+    DATAFRAME_LIKE_WRITE_BACK_BUFFER,
+)
 from routine_butler.plugins._flashcards.calculations import (
     calculate_flashcard_pick_weight,
 )
 
 DEFAULT_MASTERY = 2
 DEFAULT_APPETITE = 3
+N_NON_METADATA_COLS = 2  # i.e. front & back
 
 
 @dataclass
@@ -28,6 +33,12 @@ class Flashcard:
     collection: "FlashcardCollection"
     collection_idx: int
     metadata: Optional[FlashcardMetadata] = None
+    # The metadata as of the latest write back to (or read from) the source
+    source_metadata: Optional[FlashcardMetadata] = None
+
+    def __post_init__(self):
+        if self.source_metadata is None and self.metadata is not None:
+            self.source_metadata = dataclasses.replace(self.metadata)
 
     @property
     def row(self) -> List[str]:
@@ -39,19 +50,55 @@ class Flashcard:
             int(self.metadata.has_bad_formatting),
         ]
 
-    async def update_source(self):
-        await self.collection.dataframe_like.update_row_at_idx(
-            self.collection_idx, self.row
+    def write_back_metadata(self) -> None:
+        """Buffers a write back of the metadata cells that changed since the latest
+        write back (see DATAFRAME_LIKE_WRITE_BACK_BUFFER)."""
+        fields = dataclasses.fields(FlashcardMetadata)
+        row = self.row
+        changed_cells = {}
+        for col_idx, field in enumerate(fields, start=N_NON_METADATA_COLS):
+            if getattr(self.metadata, field.name) != getattr(
+                self.source_metadata, field.name
+            ):
+                changed_cells[(self.collection_idx, col_idx)] = row[col_idx]
+        DATAFRAME_LIKE_WRITE_BACK_BUFFER.record(
+            self.collection.dataframe_like, changed_cells
+        )
+        self.source_metadata = dataclasses.replace(self.metadata)
+
+
+class FlashcardCollectionMetadata(NamedTuple):
+    path: str
+    name: str
+    random_choice_weight: int
+    avg_seconds_per_card: int
+
+    @classmethod
+    def from_path(cls, path: str) -> "FlashcardCollectionMetadata":
+        """Parses the metadata from the collection's file name.
+
+        Raises:
+            ValueError: If the file name isn't of the format:
+                "{name}-{random_choice_weight}-{avg_seconds_per_card}"
+        """
+        fname = path.split("/")[-1]
+        parts = fname.split("-")
+        if len(parts) < 3:
+            raise ValueError(f"Unexpected collection file name: {fname}")
+        return cls(
+            path=path,
+            name="-".join(parts[:-2]),
+            random_choice_weight=int(parts[-2]),
+            avg_seconds_per_card=int(parts[-1]),
         )
 
 
 class FlashcardCollection:
     def __init__(self, path_to_collection: str):
-        # title format: "{name}-{random_choice_weight}-{avg_seconds_per_card}"
-        fname: str = path_to_collection.split("/")[-1]
-        self.avg_seconds_per_card: int = int(fname.split("-")[-1])
-        self.random_choice_weight: int = int(fname.split("-")[-2])
-        self.name: str = "-".join(fname.split("-")[:-2])
+        metadata = FlashcardCollectionMetadata.from_path(path_to_collection)
+        self.avg_seconds_per_card: int = metadata.avg_seconds_per_card
+        self.random_choice_weight: int = metadata.random_choice_weight
+        self.name: str = metadata.name
         self.dataframe_like = DATAFRAME_LIKE(path_to_collection)
         self.cached_cards: List[Flashcard] = []
         self._cached_probabilities: Optional[List[float]] = None
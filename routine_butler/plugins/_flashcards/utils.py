@@ -3,7 +3,6 @@ from typing import List, Optional
 from nicegui import ui
 
 from routine_butler.globals import STORAGE_BUCKET
-from routine_butler.utils.cloud_storage_bucket import CloudStorageBucketItem
 
 
 def control_panel_slider(value) -> ui.slider:
@@ -28,14 +27,5 @@ async def get_paths_of_collections_to_load(
         # It is a path to a single sheet
         return [path]
 
-    path_arg = None if path == "" else path
-    items: List[CloudStorageBucketItem] = await STORAGE_BUCKET.list(path_arg)
-    sheets_to_read = []
-    for item in items:
-        item_path = f"{path}/{item.name}" if path else item.name
-        if item.is_dir:
-            collections = await get_paths_of_collections_to_load(item_path)
-            sheets_to_read.extend(collections)
-        else:
-            sheets_to_read.append(item_path)
-    return sheets_to_read
+    # NOTE: walk lists the whole tree w/ a query per level rather than per folder
+    return await STORAGE_BUCKET.walk(None if path == "" else path)
@@ -1,20 +1,28 @@
 import asyncio
-import random
 import time
 from enum import StrEnum
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from loguru import logger
-from nicegui import ui
+from nicegui import background_tasks, ui
 from pydantic import BaseModel
 
 from routine_butler.components import micro
-from routine_butler.globals import FLASHCARDS_FOLDER_NAME
+from routine_butler.globals import (
+    DATAFRAME_LIKE_WRITE_BACK_BUFFER,
+    FLASHCARDS_FOLDER_NAME,
+)
+from routine_butler.plugins._flashcards.calculations import (
+    draw_collections,
+    get_expected_n_draws,
+    get_selection_probabilities,
+)
 from routine_butler.plugins._flashcards.schema import (
     DEFAULT_APPETITE,
     DEFAULT_MASTERY,
     Flashcard,
     FlashcardCollection,
+    FlashcardCollectionMetadata,
 )
 from routine_butler.plugins._flashcards.utils import (
     control_panel_label,
@@ -35,6 +43,7 @@ from routine_butler.plugins._flashcards.utils import (
 WIDTH_PX = 700
 FCARD_HEIGHT_PX = 400
 MAX_N_COLLECTIONS = 36
+MAX_N_CONCURRENT_COLLECTION_LOADS = 8
 
 
 class FlashcardsGui:
@@ -49,6 +58,8 @@ class FlashcardsGui:
 
         self.collection_paths: List[str] = []
         self.collections: List[FlashcardCollection] = []
+        self.n_collections_loaded = 0
+        self.n_collections_failed = 0
         self.flashcards_queue: List[Flashcard] = []
 
         self.current_card_idx = 0
@@ -80,49 +91,118 @@ class FlashcardsGui:
             path = FLASHCARDS_FOLDER_NAME
         else:
             path = f"{FLASHCARDS_FOLDER_NAME}/{self.path}"
-        self.collection_paths = await get_paths_of_collections_to_load(path)
-        await asyncio.sleep(0.1)
-
-        # Load (retrieve & cache cards for) each collection
-        for collection_path in self.collection_paths:
-            try:
-                collection = FlashcardCollection(collection_path)
-            except Exception as e:
-                logger.warning(f"Couldn't parse: {collection_path}: {e}")
-                continue
-            await collection.cache_all_cards()
-            self.collections.append(collection)
-            await asyncio.sleep(0.1)
+        paths = await get_paths_of_collections_to_load(path)
 
-        # Sort by random_choice_weight and take the top MAX_N_COLLECTIONS
-        self.collections = sorted(
-            self.collections,
+        # Plan the session's draws from the collections' file name metadata alone
+        collections_metadata = self._parse_collections_metadata(paths)
+        if not collections_metadata:
+            self._complete_without_cards(
+                f"No flashcard collections in: {path}"
+            )
+            return
+        collections_metadata = sorted(
+            collections_metadata,
             key=lambda c: c.random_choice_weight,
             reverse=True,
         )[:MAX_N_COLLECTIONS]
+        probs = get_selection_probabilities(collections_metadata)
+        drawn_idxs = draw_collections(
+            collections_metadata, probs, self.target_seconds
+        )
+        expected_n_draws = get_expected_n_draws(
+            collections_metadata, probs, self.target_seconds
+        )
+        for metadata, n_draws in zip(collections_metadata, expected_n_draws):
+            logger.debug(f"Expecting {n_draws:.1f} draws of {metadata.name}")
+
+        # Load (retrieve & cache cards for) only the drawn collections, concurrently
+        self.collection_paths = [
+            collections_metadata[idx].path for idx in sorted(set(drawn_idxs))
+        ]
+        load_start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(MAX_N_CONCURRENT_COLLECTION_LOADS)
+        collections = await asyncio.gather(
+            *(
+                self._load_collection(path, semaphore)
+                for path in self.collection_paths
+            )
+        )
+        collections_by_path = {
+            path: c
+            for path, c in zip(self.collection_paths, collections)
+            if c is not None
+        }
+        self.collections = list(collections_by_path.values())
+        load_seconds = time.perf_counter() - load_start_time
+        logger.info(
+            f"Loaded {len(self.collections)}/{len(self.collection_paths)} drawn "
+            f"(of {len(paths)}) flashcard collections in {load_seconds:.2f}s "
+            f"(max {MAX_N_CONCURRENT_COLLECTION_LOADS} at a time)"
+        )
 
-        # Calculate the probability of each collection being chosen
-        denom = sum([c.random_choice_weight for c in self.collections])
-        probs = [c.random_choice_weight / denom for c in self.collections]
-
-        # Calculate a seconds cap to use for cumulative study time
-        avg_secs_list = [c.avg_seconds_per_card for c in self.collections]
-        overall_avg_secs = sum([s * p for s, p in zip(avg_secs_list, probs)])
-        SECONDS_CAP = self.target_seconds - overall_avg_secs
-
-        # Choose a collection, pick a card, and queue it until the seconds cap is reached
-        cumulative_seconds_of_studying = 0
-        while cumulative_seconds_of_studying < SECONDS_CAP:
-            collection = random.choices(self.collections, probs)[0]
-            card = collection.pick_a_card()
-            self.flashcards_queue.append(card)
-            await asyncio.sleep(0.1)
-            cumulative_seconds_of_studying += collection.avg_seconds_per_card
+        # Pick a card from each drawn collection, in order of the draws
+        # NOTE: draws of collections that couldn't be loaded are skipped
+        for idx in drawn_idxs:
+            collection = collections_by_path.get(
+                collections_metadata[idx].path
+            )
+            if collection is not None:
+                self.flashcards_queue.append(collection.pick_a_card())
+        if not self.flashcards_queue:
+            self._complete_without_cards(
+                "None of the drawn flashcard collections could be loaded"
+            )
+            return
         self.queue_generation_has_completed = True
 
+    def _complete_without_cards(self, msg: str) -> None:
+        """Notifies the user that there are no cards to study & completes the
+        program."""
+        logger.warning(msg)
+        self.recurring_update_while_awaiting_queue.deactivate()
+        with self.frame:
+            ui.notify(msg)
+        self.on_complete()
+
+    @staticmethod
+    def _parse_collections_metadata(
+        paths: List[str],
+    ) -> List[FlashcardCollectionMetadata]:
+        """Parses the metadata of each collection from its path, skipping (& logging)
+        collections w/ unexpected file names."""
+        collections_metadata = []
+        for path in paths:
+            try:
+                metadata = FlashcardCollectionMetadata.from_path(path)
+            except ValueError as e:
+                logger.warning(f"Couldn't parse: {path}: {e}")
+                continue
+            collections_metadata.append(metadata)
+        return collections_metadata
+
+    async def _load_collection(
+        self, collection_path: str, semaphore: asyncio.Semaphore
+    ) -> Optional[FlashcardCollection]:
+        """Loads the collection (w/ at most as many others as the semaphore allows),
+        returning None if it couldn't be loaded."""
+        async with semaphore:
+            try:
+                collection = FlashcardCollection(collection_path)
+                # NOTE: the frame provides the UI context for any notifications
+                with self.frame:
+                    await collection.cache_all_cards()
+            except Exception as e:
+                logger.warning(f"Couldn't load: {collection_path}: {e}")
+                self.n_collections_failed += 1
+                return None
+        self.n_collections_loaded += 1
+        return collection
+
     def _generate_progress_str(self) -> str:
-        progress_str = f"{len(self.collections)}/"
+        progress_str = f"{self.n_collections_loaded}/"
         progress_str += f"{len(self.collection_paths)} collections loaded | "
+        if self.n_collections_failed > 0:
+            progress_str += f"{self.n_collections_failed} failed | "
         progress_str += f"{int(time.time() - self.start_time)}s elapsed"
         return progress_str
 
@@ -179,8 +259,8 @@ class FlashcardsGui:
             ui.label(str(self.current_card.collection))
 
     def _metadata_was_changed_by_user(self) -> bool:
-        old_mastery = (self.current_card.metadata.mastery,)
-        old_appetite = (self.current_card.metadata.appetite,)
+        old_mastery = self.current_card.metadata.mastery
+        old_appetite = self.current_card.metadata.appetite
         old_has_bad_formatting = self.current_card.metadata.has_bad_formatting
         return (
             old_mastery != self.mastery_slider.value
@@ -201,7 +281,7 @@ class FlashcardsGui:
             if self._metadata_was_changed_by_user():
                 self._update_current_flashcard_metadata_with_ui_values()
                 try:
-                    await self.current_card.update_source()
+                    self.current_card.write_back_metadata()
                 except Exception as e:
                     logger.warning(f"Couldn't update flashcard in source: {e}")
         # Advance state
@@ -215,6 +295,7 @@ class FlashcardsGui:
             self.state = self.State.FRONT
         # Act on state
         elif self.state == self.State.FINAL:
+            background_tasks.create(DATAFRAME_LIKE_WRITE_BACK_BUFFER.flush())
             self.on_complete()
             return
         self._update_ui()
@@ -22,8 +22,6 @@ from routine_butler.utils.misc import (
     redirect_to_page,
 )
 
-DB_QUERY_LIMIT = 120
-
 
 def is_valid_youtube_id(to_check):
     if re.match(r"^[A-Za-z0-9_-]{11}$", to_check):
@@ -53,24 +51,33 @@ class YoutubeVideoMode(StrEnum):
 
 def get_last_watched_video(path_or_id: str) -> Optional[str]:
     """Returns the video ID of the most recent successfully watched YouTube video in the
-    series.
+    series (among runs in the db & runs still pending in the journal).
     """
-    # Get 1000 topmost ProgramRuns of plugin type YoutubeVideo
-    filter_expr = ProgramRun.Config.orm_model.plugin_type == "YoutubeVideo"
-    res: List[ProgramRun] = ProgramRun.query(
-        engine=state.engine, filter_expr=filter_expr, limit=DB_QUERY_LIMIT
+    # NOTE: read before querying the db so that no run is flushed in between unseen
+    pending_runs = []
+    if state.program_run_journal is not None:
+        pending_runs = state.program_run_journal.get_pending()
+    plugin_dict = ProgramRun.Config.orm_model.plugin_dict
+    is_series_filter_expr = (
+        plugin_dict["mode"].as_string() == YoutubeVideoMode.SERIES
+    )
+    run = ProgramRun.latest_matching(
+        engine=state.engine,
+        plugin_type="YoutubeVideo",
+        path_key=path_or_id,
+        filter_expr=is_series_filter_expr,
     )
-    # Find most recent successful watch with the given path
-    for run in reversed(res):
+    for pending_run in pending_runs:
         if (
-            run.plugin_dict["path_or_id"] == path_or_id
-            and run.plugin_dict["mode"] == YoutubeVideoMode.SERIES
-            and "reported_success" in run.run_data
-            and run.run_data["reported_success"]
+            pending_run.plugin_type == "YoutubeVideo"
+            and pending_run.path_key == path_or_id
+            and pending_run.reported_success
+            and pending_run.plugin_dict.get("mode") == YoutubeVideoMode.SERIES
+            and (run is None or pending_run.end_time > run.end_time)
         ):
-            return run.run_data["video_id"]
+            run = pending_run
     # If no successful watch found, return None
-    return None
+    return None if run is None else run.run_data["video_id"]
 
 
 def convert_list_from_links_to_ids_as_needed(videos: List[str]) -> List[str]:
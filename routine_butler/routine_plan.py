@@ -0,0 +1,125 @@
+"""An execution plan for a routine: its element & reward programs along w/ each
+element's priority & duration estimate (each of which is computed exactly once), so
+that pruning the elements to a target duration is a single pass that keeps a running
+total.
+
+Plans are cached per routine version (i.e. until the routine's elements or rewards,
+or the programs they reference, change).
+
+Usage:
+    plan = get_routine_plan(routine, programs_by_title)
+    element_programs, pruned_titles = plan.prune_to_target_duration(30)
+"""
+
+import random
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from routine_butler.models import PriorityLevel, Program, Routine
+
+LOAD_SECONDS_PER_PROGRAM = 2.5
+TARGET_CUSHION_SECONDS = 90
+
+
+class PlannedElement(NamedTuple):
+    program: Program
+    priority_level: PriorityLevel
+    estimated_duration_seconds: float
+
+
+class RoutinePlan:
+    """The programs of a routine w/ precomputed duration estimates for its elements."""
+
+    def __init__(
+        self, routine: Routine, programs_by_title: Dict[str, Program]
+    ):
+        self.elements: List[PlannedElement] = []
+        for element in routine.elements:
+            program = programs_by_title[element.program]
+            self.elements.append(
+                PlannedElement(
+                    program,
+                    element.priority_level,
+                    program.estimate_duration_in_seconds(),
+                )
+            )
+        self.reward_programs: List[Program] = [
+            programs_by_title[reward.program] for reward in routine.rewards
+        ]
+        self.total_estimated_seconds = sum(
+            e.estimated_duration_seconds for e in self.elements
+        )
+
+    @property
+    def element_programs(self) -> List[Program]:
+        return [e.program for e in self.elements]
+
+    def prune_to_target_duration(
+        self, target_duration_minutes: int
+    ) -> Tuple[List[Program], List[str]]:
+        """Randomly prunes elements, lowest priorities first, until the (cushioned)
+        estimated duration is under the target duration. The plan itself isn't
+        modified.
+
+        Returns:
+            The remaining element programs (in order) & the titles of those pruned.
+        """
+        target_seconds = target_duration_minutes * 60
+        target_seconds -= LOAD_SECONDS_PER_PROGRAM * len(self.elements)
+        target_seconds -= TARGET_CUSHION_SECONDS
+
+        idxs_by_priority: Dict[PriorityLevel, List[int]] = {
+            PriorityLevel.LOW: [],
+            PriorityLevel.MEDIUM: [],
+            PriorityLevel.HIGH: [],
+        }
+        for i, element in enumerate(self.elements):
+            idxs_by_priority[element.priority_level].append(i)
+
+        pruned_idxs = []
+        total_seconds = self.total_estimated_seconds
+        for priority_idxs in idxs_by_priority.values():
+            random.shuffle(priority_idxs)
+            while priority_idxs and total_seconds >= target_seconds:
+                i = priority_idxs.pop()
+                pruned_idxs.append(i)
+                total_seconds -= self.elements[i].estimated_duration_seconds
+
+        is_pruned = set(pruned_idxs)
+        remaining_programs = [
+            e.program
+            for i, e in enumerate(self.elements)
+            if i not in is_pruned
+        ]
+        pruned_titles = [self.elements[i].program.title for i in pruned_idxs]
+        return remaining_programs, pruned_titles
+
+
+def _get_routine_version(
+    routine: Routine, programs_by_title: Dict[str, Program]
+) -> str:
+    """Returns a fingerprint of everything a routine's plan is built from."""
+    titles = [e.program for e in routine.elements]
+    titles += [r.program for r in routine.rewards]
+    programs = [programs_by_title.get(title) for title in titles]
+    return "".join(
+        [routine.model_dump_json(include={"elements", "rewards"})]
+        + [p.model_dump_json() if p else "null" for p in programs]
+    )
+
+
+# Routine uid -> (routine version, plan)
+_ROUTINE_PLANS: Dict[Optional[int], Tuple[str, RoutinePlan]] = {}
+
+
+def get_routine_plan(
+    routine: Routine, programs_by_title: Dict[str, Program]
+) -> RoutinePlan:
+    """Returns the cached plan for the routine's current version, (re)building it if
+    the routine or its programs have changed since it was cached."""
+    version = _get_routine_version(routine, programs_by_title)
+    cached = _ROUTINE_PLANS.get(routine.uid)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    plan = RoutinePlan(routine, programs_by_title)
+    _ROUTINE_PLANS[routine.uid] = (version, plan)
+    return plan
@@ -1,28 +1,139 @@
 import datetime
-from typing import TYPE_CHECKING, Dict, List, Optional, Type
+import threading
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Type
 
 from loguru import logger
 from nicegui import ui
 from sqlalchemy.engine import Engine
 
+from routine_butler.alarm_scheduler import alarm_scheduler
 from routine_butler.components.header import Header
 from routine_butler.utils.logging import STATE_LOG_LVL
-from routine_butler.utils.misc import (
-    PendingYoutubeVideo,
-    Plugin,
-    dynamically_get_plugins_from_directory,
-)
+from routine_butler.utils.misc import PendingYoutubeVideo, Plugin
+from routine_butler.utils.plugin_registry import load_plugin_registry
 
 if TYPE_CHECKING:
     from routine_butler.models import Alarm, Program, Routine, User
+    from routine_butler.models.alarm import AlarmIndex
+    from routine_butler.models.base import (
+        BaseDBPydanticModel,
+        DBWriteOperation,
+    )
+    from routine_butler.models.program_run_journal import ProgramRunJournal
+
+
+class UserRepository:
+    """Cache of a user's routines & programs (keyed by uid) that is loaded from the db
+    on first read & then kept in sync by being patched in place on every
+    BaseDBPydanticModel write (or, when that isn't possible, invalidated).
+
+    Reads return (deep) copies & writes are cached as copies, so callers never share
+    (& can't mutate) the cached instances, e.g. w/ unsaved edits. Since async writes
+    notify it from the DB worker thread, the cache is only accessed under a lock.
+
+    Reads are counted as hits (served from the cache) or misses (queried from the db).
+    """
+
+    def __init__(self, user: "User"):
+        # NOTE: imported here since routine_butler.models imports this module
+        from routine_butler.models import Program, Routine
+        from routine_butler.models.base import add_db_write_listener
+
+        self.user = user
+        self.hits = 0
+        self.misses = 0
+        self._child_types = (Routine, Program)
+        self._cache: Dict[type, Optional[Dict[int, "BaseDBPydanticModel"]]] = {
+            child_type: None for child_type in self._child_types
+        }
+        self._alarm_index: Optional["AlarmIndex"] = None
+        self._lock = threading.RLock()
+        add_db_write_listener(self._on_db_write)
+
+    def close(self) -> None:
+        """Stops keeping the cache in sync w/ the db."""
+        from routine_butler.models.base import remove_db_write_listener
+
+        remove_db_write_listener(self._on_db_write)
+
+    def invalidate(self) -> None:
+        """Drops all cached children so that the next reads re-query the db."""
+        with self._lock:
+            for child_type in self._child_types:
+                self._cache[child_type] = None
+            self._alarm_index = None
+
+    def _get_children(self, engine: Engine, child_type: type) -> list:
+        with self._lock:
+            children_by_uid = self._cache[child_type]
+            if children_by_uid is None:
+                self.misses += 1
+                children = self.user._get_children(engine, child_type)
+                self._cache[child_type] = {c.uid: c for c in children}
+            else:
+                self.hits += 1
+                children = children_by_uid.values()
+            return [c.model_copy(deep=True) for c in children]
+
+    def get_routines(self, engine: Engine) -> List["Routine"]:
+        """Returns the user's routines (in the order they were added to the db)"""
+        return self._get_children(engine, self._child_types[0])
+
+    def get_programs(self, engine: Engine) -> List["Program"]:
+        """Returns the user's programs (in the order they were added to the db)"""
+        return self._get_children(engine, self._child_types[1])
+
+    def get_alarm_index(self, engine: Engine) -> "AlarmIndex":
+        """Returns an index of the alarms of the user's routines (rebuilt only after
+        routines are written)."""
+        from routine_butler.models.alarm import AlarmIndex
+
+        with self._lock:
+            if self._alarm_index is None:
+                self._alarm_index = AlarmIndex(
+                    (alarm, routine)
+                    for routine in self.get_routines(engine)
+                    for alarm in routine.alarms
+                )
+            return self._alarm_index
+
+    def get_programs_by_title(self, engine: Engine) -> Dict[str, "Program"]:
+        return {p.title: p for p in self.get_programs(engine)}
+
+    def _on_db_write(
+        self,
+        instance: Optional["BaseDBPydanticModel"],
+        operation: "DBWriteOperation",
+    ) -> None:
+        from routine_butler.models.base import DBWriteOperation
+
+        # i.e. a rollback, after which the cache can't be trusted
+        if instance is None:
+            self.invalidate()
+            return
+        with self._lock:
+            if type(instance) is self._child_types[0]:  # i.e. a Routine
+                self._alarm_index = None
+            children_by_uid = self._cache.get(type(instance))
+            if children_by_uid is None:  # Not a cached type or not yet loaded
+                return
+            if (
+                operation == DBWriteOperation.DELETE
+                or instance.user_uid != self.user.uid
+            ):
+                children_by_uid.pop(instance.uid, None)
+            else:
+                children_by_uid[instance.uid] = instance.model_copy(deep=True)
 
 
 class State:
     """Singleton class that holds global state for the app."""
 
     _engine: Engine = None
+    _program_run_journal: Optional["ProgramRunJournal"] = None
     _user: "User" = None
-    _plugins: Dict[str, Type[Plugin]] = {}
+    _repository: Optional[UserRepository] = None
+    _plugins: Mapping[str, Type[Plugin]] = {}
     _programs: List["Program"] = []
     _next_alarm: Optional["Alarm"] = None
     _next_routine: Optional["Routine"] = None
@@ -66,10 +177,18 @@ class State:
     def engine(self):
         return self._engine
 
+    @property
+    def program_run_journal(self):
+        return self._program_run_journal
+
     @property
     def user(self):
         return self._user
 
+    @property
+    def repository(self):
+        return self._repository
+
     @property
     def plugins(self):
         return self._plugins
@@ -128,6 +247,10 @@ class State:
         """Set the db engine within the global state."""
         self._engine = engine
 
+    def set_program_run_journal(self, journal: "ProgramRunJournal"):
+        """Set the journal through which ProgramRuns are written to the db."""
+        self._program_run_journal = journal
+
     def set_current_routine(self, routine: "Routine"):
         """Set the current routine within the global state."""
         self._current_routine = routine
@@ -135,21 +258,37 @@ class State:
 
     def set_user(self, user: "User"):
         """Set the current user within the global state."""
+        # NOTE: imported here since routine_butler.models imports this module
+        from routine_butler.models.base import db_unit_of_work
+
         self._user = user
-        self.update_next_alarm_and_next_routine()
-        self._plugins = dynamically_get_plugins_from_directory()
-        self.update_programs()
+        if self._repository is not None:
+            self._repository.close()
+        self._repository = UserRepository(user)
+        # NOTE: loaded once; each plugin's module is imported on its first use
+        if not self._plugins:
+            self._plugins = load_plugin_registry()
+        with db_unit_of_work(self.engine):
+            self.update_next_alarm_and_next_routine()
+            self.update_programs()
+        routines = self._repository.get_routines(self.engine)
+        alarm_scheduler.rebuild(user.uid, routines)
 
     def update_programs(self):
-        """Pulls from the database and updates the global state's list of programs."""
-        self._programs = self._user.get_programs(self.engine)
+        """Pulls from the user repository and updates the global state's list of
+        programs."""
+        self._programs = self._repository.get_programs(self.engine)
 
     def update_next_alarm_and_next_routine(self):
         """Pulls from the database and updates the global state's next alarm and next
         routine."""
         if self._user is not None:
-            alarm, routine = self._user.get_next_alarm_and_routine(self.engine)
-            self._next_alarm, self._next_routine = alarm, routine
+            alarm_index = self._repository.get_alarm_index(self.engine)
+            next_ring = alarm_index.get_next()
+            if next_ring is None:
+                self._next_alarm, self._next_routine = None, None
+            else:
+                _, self._next_alarm, self._next_routine = next_ring
             logger.log(STATE_LOG_LVL, f"🔄 {self}")
             self.update_header()
 
@@ -165,6 +304,9 @@ class State:
     def log_state(self):
         """Log the current state of the app."""
         logger.log(STATE_LOG_LVL, f"ℹ️  {self}")
+        if self._repository is not None:
+            hits, misses = self._repository.hits, self._repository.misses
+            logger.log(STATE_LOG_LVL, f"ℹ️  repository: {hits=} {misses=}")
 
     def build_header(self, hide_navigation_buttons: bool = False):
         self._header = Header(
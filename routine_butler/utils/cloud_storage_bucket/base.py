@@ -21,6 +21,13 @@ class CloudStorageBucket(Protocol):
         """
         ...
 
+    def walk(self, remote_path: Optional[str] = None) -> List[str]:
+        """Attempts to list the paths (relative to the bucket's root) of all files
+        nested at any depth within the `remote_path` on the bucket (must be a path to a
+        directory). If remote_path is None, walks the whole bucket.
+        """
+        ...
+
     def upload(
         self, local_path: PathLike, remote_dir_path: Optional[str] = None
     ) -> None:
@@ -1,11 +1,7 @@
 import os.path
-import time
 from os import PathLike
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
 from loguru import logger
 
 from routine_butler.utils.cloud_storage_bucket.base import (
@@ -16,12 +12,19 @@ from routine_butler.utils.google.arbitrary_types import (
     GoogleDriveServiceObject,
 )
 from routine_butler.utils.google.drive_folder_manager import DriveFolderManager
+from routine_butler.utils.google.drive_id_cache import DriveIdCache
 from routine_butler.utils.google.g_suite_credentials_manager import (
     G_Suite_Credentials_Manager,
 )
+from routine_butler.utils.google.request_executor import (
+    download_media,
+    execute_request,
+)
 
-N_RETRIES = 20
-SECONDS_BETWEEN_RETRIES = 3
+PAGE_SIZE = 1000  # The max allowed by the Drive API
+N_PARENTS_PER_QUERY = 50  # Keeps the query string well below the max length
+LIST_FIELDS = "nextPageToken, files(id, name, mimeType, parents)"
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
 
 
 class GoogleDriveFolder(CloudStorageBucket):
@@ -29,38 +32,61 @@ class GoogleDriveFolder(CloudStorageBucket):
         self,
         folder_name: str,
         credentials_manager: G_Suite_Credentials_Manager,
+        id_cache: Optional[DriveIdCache] = None,
     ):
         self.credentials_manager = credentials_manager
         self.drive_folder_manager = DriveFolderManager(
             root_folder_name=folder_name,
+            id_cache=id_cache,
         )
 
     async def _get_service_object(self) -> GoogleDriveServiceObject:
-        """Builds and returns a Google Drive service object."""
-        service = build(
-            "drive",
-            "v3",
-            credentials=await self.credentials_manager.get_credentials(),
+        """Returns a (pooled) Google Drive service object."""
+        service_pool = self.credentials_manager.service_pool
+        return await service_pool.get_service("drive", "v3")
+
+    async def _list_children(
+        self, service: GoogleDriveServiceObject, folder_ids: List[str]
+    ) -> List[dict]:
+        """Lists the (non-trashed) items in any of the given folders, following
+        nextPageToken & querying at most N_PARENTS_PER_QUERY folders at a time.
+        """
+        files = []
+        for start in range(0, len(folder_ids), N_PARENTS_PER_QUERY):
+            end = start + N_PARENTS_PER_QUERY
+            parents_q = " or ".join(
+                f"'{id_}' in parents" for id_ in folder_ids[start:end]
+            )
+            q = f"({parents_q}) and trashed = false"
+            page_token = None
+            while True:
+                resp = await execute_request(
+                    service.files().list(
+                        q=q,
+                        fields=LIST_FIELDS,
+                        pageSize=PAGE_SIZE,
+                        pageToken=page_token,
+                    )
+                )
+                files.extend(resp["files"])
+                page_token = resp.get("nextPageToken")
+                if page_token is None:
+                    break
+        return files
+
+    async def _get_folder_id(
+        self, service: GoogleDriveServiceObject, remote_path: Optional[str]
+    ) -> str:
+        if remote_path is None:
+            return await self.drive_folder_manager.get_root_folder_id(service)
+        return await self.drive_folder_manager.get_folder_id_from_path(
+            service, remote_path, False
         )
-        return service
 
     async def _list(self, remote_path: Optional[str] = None):
         service = await self._get_service_object()
-        if remote_path is None:
-            folder_id = self.drive_folder_manager.get_root_folder_id(service)
-        else:
-            folder_id = self.drive_folder_manager.get_folder_id_from_path(
-                service, remote_path, False
-            )
-        q = f"'{folder_id}' in parents and trashed = false"
-        for _ in range(N_RETRIES):
-            try:
-                resp = service.files().list(q=q).execute()
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
-        return resp["files"]
+        folder_id = await self._get_folder_id(service, remote_path)
+        return await self._list_children(service, [folder_id])
 
     async def list(
         self, remote_path: Optional[str] = None
@@ -69,49 +95,98 @@ class GoogleDriveFolder(CloudStorageBucket):
         items = []
         for file in files:
             name = file["name"]
-            is_dir = file["mimeType"] == "application/vnd.google-apps.folder"
+            is_dir = file["mimeType"] == FOLDER_MIME_TYPE
             # exclude deleted files
             if name == "test_sheet_3_40_12":
                 print("here")
             items.append(CloudStorageBucketItem(name=name, is_dir=is_dir))
         return items
 
+    async def walk(self, remote_path: Optional[str] = None) -> List[str]:
+        # NOTE: the tree is listed level by level (w/ one paged query per level,
+        # rather than one per folder) & then traversed in memory
+        service = await self._get_service_object()
+        root_id = await self._get_folder_id(service, remote_path)
+        children_by_parent_id: Dict[str, List[dict]] = {}
+        listed_folder_ids = set()
+        folder_ids_to_list = [root_id]
+        while len(folder_ids_to_list) > 0:
+            listed_folder_ids.update(folder_ids_to_list)
+            level_folder_ids = set(folder_ids_to_list)
+            level_files = await self._list_children(
+                service, folder_ids_to_list
+            )
+            for file in level_files:
+                for parent_id in file.get("parents", []):
+                    if parent_id in level_folder_ids:
+                        children_by_parent_id.setdefault(parent_id, [])
+                        children_by_parent_id[parent_id].append(file)
+            folder_ids_to_list = [
+                file["id"]
+                for id_ in folder_ids_to_list
+                for file in children_by_parent_id.get(id_, [])
+                if file["mimeType"] == FOLDER_MIME_TYPE
+                and file["id"] not in listed_folder_ids
+            ]
+
+        def get_file_paths(folder_id: str, folder_path: str) -> List[str]:
+            paths = []
+            for file in children_by_parent_id.get(folder_id, []):
+                path = (
+                    f"{folder_path}/{file['name']}"
+                    if folder_path
+                    else file["name"]
+                )
+                if file["mimeType"] == FOLDER_MIME_TYPE:
+                    paths.extend(get_file_paths(file["id"], path))
+                else:
+                    paths.append(path)
+            return paths
+
+        return get_file_paths(root_id, remote_path or "")
+
     async def upload(
         self, local_path: PathLike, remote_dir_path: Optional[str]
     ) -> None:
         service = await self._get_service_object()
 
         if remote_dir_path is None:
-            folder_id = self.drive_folder_manager.get_root_folder_id(service)
+            folder_id = await self.drive_folder_manager.get_root_folder_id(
+                service
+            )
         else:
-            folder_id = self.drive_folder_manager.get_folder_id_from_path(
-                service, remote_dir_path, True
+            folder_id = (
+                await self.drive_folder_manager.get_folder_id_from_path(
+                    service, remote_dir_path, True
+                )
             )
 
         file_metadata = {
             "name": os.path.basename(local_path),
             "parents": [folder_id],
         }
+        from googleapiclient.http import MediaFileUpload
+
         media = MediaFileUpload(local_path)
-        for _ in range(N_RETRIES):
-            try:
-                service.files().create(
-                    body=file_metadata, media_body=media, fields="id"
-                ).execute()
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        await execute_request(
+            service.files().create(
+                body=file_metadata, media_body=media, fields="id"
+            )
+        )
 
     async def download(self, local_path: PathLike, remote_path: str) -> None:
         service = await self._get_service_object()
         remote_path_trail = remote_path.split("/")
 
         if len(remote_path_trail) == 1:
-            folder_id = self.drive_folder_manager.get_root_folder_id(service)
+            folder_id = await self.drive_folder_manager.get_root_folder_id(
+                service
+            )
         else:
-            folder_id = self.drive_folder_manager.get_folder_id_from_path(
-                service, "/".join(remote_path_trail[:-1]), False
+            folder_id = (
+                await self.drive_folder_manager.get_folder_id_from_path(
+                    service, "/".join(remote_path_trail[:-1]), False
+                )
             )
 
         # Get file id
@@ -120,83 +195,54 @@ class GoogleDriveFolder(CloudStorageBucket):
             f"and mimeType!='application/vnd.google-apps.folder'"
             f"and '{folder_id}' in parents"
         )
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.files()
-                    .list(q=file_query, spaces="drive", fields="files(id)")
-                    .execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await execute_request(
+            service.files().list(
+                q=file_query, spaces="drive", fields="files(id)"
+            )
+        )
         file_id = resp["files"][0]["id"]
 
         # Download file
         request = service.files().get_media(fileId=file_id)
         with open(local_path, "wb") as f:
-            downloader = MediaIoBaseDownload(f, request)
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-                logger.info(
-                    f"Remote file download: {int(status.progress() * 100)}%."
-                )
+            await download_media(request, f)
         return file_id
 
     async def delete(self, remote_path: str) -> bool:
         service = await self._get_service_object()
 
         if "/" not in remote_path:
-            folder_id = self.drive_folder_manager.get_root_folder_id(service)
+            folder_id = await self.drive_folder_manager.get_root_folder_id(
+                service
+            )
             item_name = remote_path
         else:
             remote_path_components = remote_path.split("/")
-            folder_id = self.drive_folder_manager.get_folder_id_from_path(
-                service, "/".join(remote_path_components[:-1]), False
+            folder_id = (
+                await self.drive_folder_manager.get_folder_id_from_path(
+                    service, "/".join(remote_path_components[:-1]), False
+                )
             )
             item_name = remote_path_components[-1]
 
         # Get item id
         query = f"name='{item_name}' and '{folder_id}' in parents"
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.files()
-                    .list(q=query, spaces="drive", fields="files(id)")
-                    .execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await execute_request(
+            service.files().list(q=query, spaces="drive", fields="files(id)")
+        )
         item_id = resp["files"][0]["id"]
 
         # Check if item has children and raise error if so
         query = f"'{item_id}' in parents"
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.files()
-                    .list(q=query, spaces="drive", fields="files(id)")
-                    .execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await execute_request(
+            service.files().list(q=query, spaces="drive", fields="files(id)")
+        )
         if len(resp["files"]) > 0:
             raise ValueError("Cannot delete a folder that has children.")
 
         # Delete item
-        for _ in range(N_RETRIES):
-            try:
-                service.files().delete(fileId=item_id).execute()
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        await execute_request(service.files().delete(fileId=item_id))
+        self.drive_folder_manager.invalidate_cached_ids(remote_path)
 
     def validate_connection(self) -> bool:
         try:
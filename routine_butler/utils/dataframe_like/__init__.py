@@ -1,2 +1,9 @@
 from routine_butler.utils.dataframe_like.base import DataframeLike
+from routine_butler.utils.dataframe_like.caching import (
+    CachingDataframeLike,
+    DataframeLikeCache,
+)
 from routine_butler.utils.dataframe_like.google_sheet import GoogleSheet
+from routine_butler.utils.dataframe_like.write_back_buffer import (
+    WriteBackBuffer,
+)
@@ -1,9 +1,11 @@
-from typing import Any, List, Protocol, Tuple
+from typing import Any, Dict, List, Protocol, Tuple
 
 
 class DataframeLike(Protocol):
     """Protocol for interacting with a dataframe-like object"""
 
+    path: str
+
     def __init__(self, path: str):
         ...
 
@@ -16,6 +18,10 @@ class DataframeLike(Protocol):
         """Returns all data as a list of lists."""
         ...
 
+    def get_version(self) -> str:
+        """Returns an opaque version of the data that changes whenever it does."""
+        ...
+
     def shape(self) -> Tuple[int, int]:
         """Returns the number of rows and columns."""
         ...
@@ -23,3 +29,7 @@ class DataframeLike(Protocol):
     def update_row_at_idx(self, idx: int, data: List[Any]) -> None:
         """Updates the row at the given index with the given data."""
         ...
+
+    def batch_update_cells(self, cells: Dict[Tuple[int, int], Any]) -> None:
+        """Updates each (row index, column index) cell w/ its value, at once."""
+        ...
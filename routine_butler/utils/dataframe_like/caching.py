@@ -0,0 +1,160 @@
+"""A read-through, local cache of DataframeLike contents.
+
+A CachingDataframeLike serves `get_all_data` from the cache as long as the source's
+version (see DataframeLike.get_version, e.g. a Drive file's id & version number) is
+unchanged--i.e. at the cost of a metadata request rather than a download--and serves
+the cached (possibly stale) data if the version can't be checked, e.g. when offline.
+
+Usage:
+    cache = DataframeLikeCache(DATAFRAME_LIKE_CACHE_DIR_PATH)
+    df_like = CachingDataframeLike(path, source_factory, cache)
+    data = await df_like.get_all_data()
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+from routine_butler.utils.dataframe_like.base import DataframeLike
+
+
+def _apply_cells(
+    data: List[List[Any]], cells: Dict[Tuple[int, int], Any]
+) -> List[List[Any]]:
+    """Returns a copy of the data w/ each (row index, column index) cell set to its
+    value (as the string a read would return), padding w/ empty cells as needed.
+    """
+    data = [list(row) for row in data]
+    for (row_idx, col_idx), value in cells.items():
+        while len(data) <= row_idx:
+            data.append([])
+        row = data[row_idx]
+        while len(row) <= col_idx:
+            row.append("")
+        row[col_idx] = str(value)
+    return data
+
+
+class DataframeLikeCacheEntry(NamedTuple):
+    version: str
+    data: List[List[Any]]
+
+
+class DataframeLikeCache:
+    """Stores the data & version of each dataframe-like (by path) in a JSON file of
+    its own w/in a directory.
+
+    Counts hits (i.e. reads served from the cache) & misses.
+    """
+
+    def __init__(self, dir_path: str):
+        self.dir_path = dir_path
+        self.hits = 0
+        self.misses = 0
+
+    def _get_file_path(self, path: str) -> str:
+        file_name = hashlib.sha1(path.encode()).hexdigest() + ".json"
+        return os.path.join(self.dir_path, file_name)
+
+    def get(self, path: str) -> Optional[DataframeLikeCacheEntry]:
+        try:
+            with open(self._get_file_path(path), "r") as f:
+                return DataframeLikeCacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning(f"Ignoring corrupted cache of {path}: {e}")
+            return None
+
+    def set(self, path: str, entry: DataframeLikeCacheEntry) -> None:
+        os.makedirs(self.dir_path, exist_ok=True)
+        file_path = self._get_file_path(path)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry._asdict(), f)
+        os.replace(tmp_path, file_path)
+
+    def delete(self, path: str) -> None:
+        try:
+            os.remove(self._get_file_path(path))
+        except FileNotFoundError:
+            pass
+
+
+class CachingDataframeLike(DataframeLike):
+    """Wraps a (source) dataframe-like, reading its data through a DataframeLikeCache.
+
+    Writes (& other reads) are passed through to the source.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        source_factory: Callable[[str], DataframeLike],
+        cache: DataframeLikeCache,
+    ):
+        self.path = path
+        self.source = source_factory(path)
+        self.cache = cache
+
+    async def get_version(self) -> str:
+        return await self.source.get_version()
+
+    async def get_all_data(self) -> List[List[Any]]:
+        """Returns all rows, from the cache if the source's version is unchanged."""
+        entry = self.cache.get(self.path)
+        try:
+            version = await self.source.get_version()
+        except FileNotFoundError:
+            self.cache.delete(self.path)
+            raise
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"Serving cached data of {self.path} as is: {e}")
+            self.cache.hits += 1
+            return entry.data
+
+        if entry is not None and entry.version == version:
+            self.cache.hits += 1
+            return entry.data
+        self.cache.misses += 1
+        data = await self.source.get_all_data()
+        self.cache.set(self.path, DataframeLikeCacheEntry(version, data))
+        return data
+
+    async def get_row_at_idx(self, idx: int) -> List[Any]:
+        return await self.source.get_row_at_idx(idx)
+
+    async def shape(self) -> Tuple[int, int]:
+        return await self.source.shape()
+
+    async def update_row_at_idx(self, idx: int, data: List[Any]) -> None:
+        await self.source.update_row_at_idx(idx, data)
+
+    async def batch_update_cells(
+        self, cells: Dict[Tuple[int, int], Any]
+    ) -> None:
+        """Updates the cells in the source & then (if the cache was up to date w/ the
+        source before the write) in the cache too, re-stamped w/ the source's new
+        version so that the next read is still a hit."""
+        entry = self.cache.get(self.path)
+        is_entry_current = False
+        if entry is not None:
+            try:
+                is_entry_current = entry.version == await self.get_version()
+            except Exception as e:
+                logger.warning(f"Couldn't check version of {self.path}: {e}")
+        await self.source.batch_update_cells(cells)
+        if not is_entry_current:
+            return
+        try:
+            version = await self.get_version()
+        except Exception as e:
+            logger.warning(f"Couldn't re-stamp cache of {self.path}: {e}")
+            return
+        data = _apply_cells(entry.data, cells)
+        self.cache.set(self.path, DataframeLikeCacheEntry(version, data))
@@ -1,7 +1,5 @@
-import time
-from typing import Any, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from loguru import logger
 
@@ -10,13 +8,51 @@ from routine_butler.utils.google.arbitrary_types import (
     GoogleDriveServiceObject,
     GoogleSheetsServiceObject,
 )
-from routine_butler.utils.google.drive_folder_manager import DriveFolderManager
+from routine_butler.utils.google.drive_folder_manager import (
+    DriveFolderManager,
+    is_not_found_error,
+)
+from routine_butler.utils.google.drive_id_cache import NOT_FOUND, DriveIdCache
 from routine_butler.utils.google.g_suite_credentials_manager import (
     G_Suite_Credentials_Manager,
 )
+from routine_butler.utils.google.request_executor import execute_request
+
+
+def get_column_letters(col_idx: int) -> str:
+    """Returns the A1-notation letters of the column at the (0-based) index."""
+    letters = ""
+    col_number = col_idx + 1
+    while col_number > 0:
+        col_number, remainder = divmod(col_number - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
 
-N_RETRIES = 13
-SECONDS_BETWEEN_RETRIES = 3
+
+def get_row_segment_ranges(
+    cells: Dict[Tuple[int, int], Any]
+) -> List[Tuple[str, List[Any]]]:
+    """Groups the cells into runs of adjacent cells in the same row, returning the
+    A1-notation range (w/o the sheet name) & values of each run."""
+    # (row idx, start col idx, values)
+    runs: List[Tuple[int, int, List[Any]]] = []
+    for row_idx, col_idx in sorted(cells):
+        value = cells[(row_idx, col_idx)]
+        if runs and (row_idx, col_idx) == (
+            runs[-1][0],
+            runs[-1][1] + len(runs[-1][2]),
+        ):
+            runs[-1][2].append(value)
+        else:
+            runs.append((row_idx, col_idx, [value]))
+    return [
+        (
+            f"{get_column_letters(start_col_idx)}{row_idx + 1}:"
+            f"{get_column_letters(start_col_idx + len(values) - 1)}{row_idx + 1}",
+            values,
+        )
+        for row_idx, start_col_idx, values in runs
+    ]
 
 
 class GoogleSheet(DataframeLike):
@@ -30,10 +66,11 @@ class GoogleSheet(DataframeLike):
         path: str,
         root_folder_name: str,
         credentials_manager: G_Suite_Credentials_Manager,
+        id_cache: Optional[DriveIdCache] = None,
     ):
         self.path = path
         self.drive_folder_manager = DriveFolderManager(
-            root_folder_name=root_folder_name
+            root_folder_name=root_folder_name, id_cache=id_cache
         )
         self.credentials_manager = credentials_manager
         self._file_id: str = None
@@ -42,33 +79,66 @@ class GoogleSheet(DataframeLike):
         self.num_cols = None
 
     async def _get_drive_service_object(self) -> GoogleDriveServiceObject:
-        """Builds and returns a Google Drive service object."""
-        return build(
-            "drive",
-            "v3",
-            credentials=await self.credentials_manager.get_credentials(),
-        )
+        """Returns a (pooled) Google Drive service object."""
+        service_pool = self.credentials_manager.service_pool
+        return await service_pool.get_service("drive", "v3")
 
     async def _get_sheets_service_object(self) -> GoogleSheetsServiceObject:
-        """Builds and returns a Google Sheets service object."""
-        return build(
-            "sheets",
-            "v4",
-            credentials=await self.credentials_manager.get_credentials(),
-        )
+        """Returns a (pooled) Google Sheets service object."""
+        service_pool = self.credentials_manager.service_pool
+        return await service_pool.get_service("sheets", "v4")
+
+    def _raise_if_not_found(self, e: HttpError) -> None:
+        """Forgets the file's (presumably stale) id & raises FileNotFoundError if the
+        error is a 404, so that the path is resolved afresh on the next access.
+        """
+        if not is_not_found_error(e):
+            return
+        # NOTE: the root (& everything in it) is forgotten too, since any ancestor of
+        # the file may have been deleted or recreated, leaving its cached id stale
+        self.drive_folder_manager.invalidate_cached_ids("")
+        self._file_id = None
+        self._sheet_name = None
+        raise FileNotFoundError(
+            f"Spreadsheet file '{self.path}' not found in Google Drive."
+        ) from e
+
+    async def _execute(self, request: Any) -> Any:
+        """Awaits the response of the request (see execute_request), handling a 404
+        w/ _raise_if_not_found."""
+        try:
+            return await execute_request(request)
+        except HttpError as e:
+            self._raise_if_not_found(e)
+            raise
 
     async def _ascertain_file_id(self) -> None:
         service = await self._get_drive_service_object()
         if self._file_id is not None:
             return
 
+        cached_id = self.drive_folder_manager.get_cached_id(
+            "spreadsheet", self.path
+        )
+        if cached_id == NOT_FOUND:
+            raise FileNotFoundError(
+                f"Spreadsheet file '{self.path}' not found in Google Drive."
+            )
+        elif cached_id:
+            self._file_id = cached_id
+            return
+
         if "/" not in self.path:
-            folder_id = self.drive_folder_manager.get_root_folder_id(service)
+            folder_id = await self.drive_folder_manager.get_root_folder_id(
+                service
+            )
             file_name = self.path
         else:
             path_components = self.path.split("/")
-            folder_id = self.drive_folder_manager.get_folder_id_from_path(
-                service, "/".join(path_components[:-1]), False
+            folder_id = (
+                await self.drive_folder_manager.get_folder_id_from_path(
+                    service, "/".join(path_components[:-1]), False
+                )
             )
             file_name = path_components[-1]
 
@@ -77,22 +147,30 @@ class GoogleSheet(DataframeLike):
             f"and '{folder_id}' in parents "
             "and mimeType='application/vnd.google-apps.spreadsheet'"
         )
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.files().list(q=query, fields="files(id)").execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await execute_request(
+            service.files().list(q=query, fields="files(id)")
+        )
 
         if len(resp["files"]) == 0:
+            self.drive_folder_manager.cache_id("spreadsheet", self.path, None)
             raise FileNotFoundError(
-                f"Spreadsheet file '{self.path}' not found " "in Google Drive."
+                f"Spreadsheet file '{self.path}' not found in Google Drive."
             )
         else:
             self._file_id = resp["files"][0]["id"]
+            self.drive_folder_manager.cache_id(
+                "spreadsheet", self.path, self._file_id
+            )
+
+    async def get_version(self) -> str:
+        """Returns the spreadsheet's file id & Drive version number (which Drive
+        increments on every change), fetched w/o reading the sheet itself."""
+        service = await self._get_drive_service_object()
+        await self._ascertain_file_id()
+        resp = await self._execute(
+            service.files().get(fileId=self._file_id, fields="version")
+        )
+        return f"{self._file_id}:{resp['version']}"
 
     async def _ascertain_sheet_name(
         self, service: GoogleSheetsServiceObject
@@ -103,17 +181,9 @@ class GoogleSheet(DataframeLike):
         if self._file_id is None:
             await self._ascertain_file_id()
 
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.spreadsheets()
-                    .get(spreadsheetId=self._file_id)
-                    .execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await self._execute(
+            service.spreadsheets().get(spreadsheetId=self._file_id)
+        )
         sheets = resp["sheets"]
         if len(sheets) != 1:
             raise Exception(
@@ -127,18 +197,11 @@ class GoogleSheet(DataframeLike):
         await self._ascertain_sheet_name(service)
 
         sheet_range = f"Sheet1!{idx+1}:{idx+1}"
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.spreadsheets()
-                    .values()
-                    .get(spreadsheetId=self._file_id, range=sheet_range)
-                    .execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await self._execute(
+            service.spreadsheets()
+            .values()
+            .get(spreadsheetId=self._file_id, range=sheet_range)
+        )
         return resp["values"][0]
 
     async def get_all_data(self) -> List[List[Any]]:
@@ -147,18 +210,11 @@ class GoogleSheet(DataframeLike):
         await self._ascertain_sheet_name(service)
 
         sheet_range = "Sheet1"
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.spreadsheets()
-                    .values()
-                    .get(spreadsheetId=self._file_id, range=sheet_range)
-                    .execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await self._execute(
+            service.spreadsheets()
+            .values()
+            .get(spreadsheetId=self._file_id, range=sheet_range)
+        )
         return resp["values"]
 
     async def _ascertain_spreadsheet_metadata(
@@ -167,17 +223,9 @@ class GoogleSheet(DataframeLike):
         if self._file_id is None:
             await self._ascertain_file_id()
 
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.spreadsheets()
-                    .get(spreadsheetId=self._file_id)
-                    .execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await self._execute(
+            service.spreadsheets().get(spreadsheetId=self._file_id)
+        )
 
         self._sheet_name = resp["properties"]["title"]
         properties = resp["sheets"][0]["properties"]
@@ -200,22 +248,37 @@ class GoogleSheet(DataframeLike):
 
         sheet_range = f"Sheet1!{idx+1}:{idx+1}"
         body = {"values": [data]}
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.spreadsheets()
-                    .values()
-                    .update(
-                        spreadsheetId=self._file_id,
-                        range=sheet_range,
-                        valueInputOption="RAW",
-                        body=body,
-                    )
-                    .execute()
-                )  # FIXME: type hints
-                msg = f"Updated {resp['updatedCells']} cells in {self.path}"
-                logger.info(msg)
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await self._execute(
+            service.spreadsheets()
+            .values()
+            .update(
+                spreadsheetId=self._file_id,
+                range=sheet_range,
+                valueInputOption="RAW",
+                body=body,
+            )
+        )  # FIXME: type hints
+        logger.info(f"Updated {resp['updatedCells']} cells in {self.path}")
+
+    async def batch_update_cells(
+        self, cells: Dict[Tuple[int, int], Any]
+    ) -> None:
+        """Updates each (row index, column index) cell w/ its value in a single
+        request (w/ one range per run of adjacent cells in a row)."""
+        service = await self._get_sheets_service_object()
+        await self._ascertain_sheet_name(service)
+
+        body = {
+            "valueInputOption": "RAW",
+            "data": [
+                {"range": f"{self._sheet_name}!{range_}", "values": [values]}
+                for range_, values in get_row_segment_ranges(cells)
+            ],
+        }
+        resp = await self._execute(
+            service.spreadsheets()
+            .values()
+            .batchUpdate(spreadsheetId=self._file_id, body=body)
+        )
+        msg = f"Updated {resp['totalUpdatedCells']} cells in {self.path}"
+        logger.info(msg)
@@ -0,0 +1,199 @@
+"""A write-back buffer for DataframeLike cell updates: updates are appended to a local,
+fsynced (on a worker thread) journal (so that recording one costs no network
+round-trip) and are written to their dataframe-likes in batches--one request per
+dataframe-like--once no update has been recorded for `debounce_seconds`, or when
+flushed explicitly (e.g. when a program completes or the app shuts down).
+
+Repeated updates to the same cell are coalesced (i.e. only the latest value is
+written), and updates left unflushed by a crash or restart are replayed on startup.
+
+Usage:
+    buffer = WriteBackBuffer(JOURNAL_PATH, DATAFRAME_LIKE)
+    await buffer.replay()  # on startup
+    buffer.record(dataframe_like, {(row_idx, col_idx): value})
+    await buffer.flush()  # or: let the debounce timer flush
+"""
+
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from routine_butler.utils.dataframe_like.base import DataframeLike
+
+Cells = Dict[Tuple[int, int], Any]  # (row idx, col idx) -> value
+
+# A single worker thread keeps journal fsyncs & rewrites off of the event loop (and in
+# the order they were scheduled)
+_JOURNAL_WORKER = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="write_back_journal_worker"
+)
+
+
+class WriteBackBuffer:
+    """Durable, coalescing buffer of the cell updates pending a write to their
+    dataframe-likes (keyed by path)."""
+
+    def __init__(
+        self,
+        path: str,
+        dataframe_like_factory: Callable[[str], DataframeLike],
+        debounce_seconds: float = 10,
+    ):
+        """
+        Args:
+            path: The path of the journal file.
+            dataframe_like_factory: Constructs a dataframe-like from its path (used
+                for replayed updates whose dataframe-like wasn't recorded).
+            debounce_seconds: How long after the latest update to flush.
+        """
+        self.path = path
+        self.dataframe_like_factory = dataframe_like_factory
+        self.debounce_seconds = debounce_seconds
+        self._pending: Dict[str, Cells] = {}
+        self._dataframe_likes: Dict[str, DataframeLike] = {}
+        # Guards self._pending & the file
+        self._journal_lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()  # Keeps flushes from overlapping
+        self._debounced_flush: Optional[asyncio.Task] = None
+
+    @property
+    def n_pending(self) -> int:
+        return sum(len(cells) for cells in self._pending.values())
+
+    @staticmethod
+    def _serialize(dataframe_like_path: str, cells: Cells) -> str:
+        return "".join(
+            json.dumps({"path": dataframe_like_path, "cell": cell, "value": v})
+            + "\n"
+            for cell, v in cells.items()
+        )
+
+    def _read_entries(self) -> Dict[str, Cells]:
+        """Reads the updates in the journal file, skipping a torn (partially written)
+        final line."""
+        entries: Dict[str, Cells] = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"Skipping torn write-back journal line: {line}"
+                    )
+                    continue
+                cells = entries.setdefault(entry["path"], {})
+                cells[tuple(entry["cell"])] = entry["value"]
+        return entries
+
+    def _rewrite(self) -> None:
+        """Atomically replaces the journal file's contents w/ the pending updates."""
+        tmp_path = f"{self.path}.tmp"
+        with self._journal_lock:
+            with open(tmp_path, "w") as f:
+                f.writelines(
+                    self._serialize(path, cells)
+                    for path, cells in self._pending.items()
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+    def _fsync(self) -> None:
+        try:
+            with open(self.path, "a") as f:
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning(f"Write-back journal fsync failed: {e}")
+
+    def record(self, dataframe_like: DataframeLike, cells: Cells) -> None:
+        """Records the cell updates as pending (& schedules the journal's fsync on the
+        journal worker thread) & (re)starts the debounce timer."""
+        if not cells:
+            return
+        with self._journal_lock:
+            with open(self.path, "a") as f:
+                f.write(self._serialize(dataframe_like.path, cells))
+            self._pending.setdefault(dataframe_like.path, {}).update(cells)
+            self._dataframe_likes[dataframe_like.path] = dataframe_like
+        _JOURNAL_WORKER.submit(self._fsync)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        # i.e. not recorded from w/in the app's event loop
+        except RuntimeError:
+            return
+        if self._debounced_flush is not None:
+            self._debounced_flush.cancel()
+        self._debounced_flush = loop.create_task(self._flush_after_debounce())
+
+    async def _flush_after_debounce(self) -> None:
+        await asyncio.sleep(self.debounce_seconds)
+        # i.e. the flush can no longer be cancelled
+        self._debounced_flush = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Writes the pending updates of each dataframe-like in one batch & removes
+        them from the journal. Updates whose write fails remain pending (unless their
+        dataframe-like no longer exists).
+
+        Returns:
+            int: The number of cells that were written.
+        """
+        async with self._flush_lock:
+            with self._journal_lock:
+                batches, self._pending = self._pending, {}
+            n_written = 0
+            failed_batches: Dict[str, Cells] = {}
+            for path, cells in batches.items():
+                dataframe_like = self._dataframe_likes.get(path)
+                if dataframe_like is None:
+                    dataframe_like = self.dataframe_like_factory(path)
+                    self._dataframe_likes[path] = dataframe_like
+                try:
+                    await dataframe_like.batch_update_cells(cells)
+                    n_written += len(cells)
+                except FileNotFoundError as e:
+                    logger.warning(f"Dropping write-back of {path}: {e}")
+                except Exception as e:
+                    logger.warning(f"Write-back of {path} failed: {e}")
+                    failed_batches[path] = cells
+            with self._journal_lock:
+                # Updates recorded during the flush supersede failed ones
+                for path, cells in failed_batches.items():
+                    self._pending[path] = {
+                        **cells,
+                        **self._pending.get(path, {}),
+                    }
+            await asyncio.get_running_loop().run_in_executor(
+                _JOURNAL_WORKER, self._rewrite
+            )
+        if n_written:
+            logger.info(f"Wrote back {n_written} buffered cell updates")
+        return n_written
+
+    async def replay(self) -> int:
+        """Flushes the updates left in the journal file by a previous process.
+
+        Returns:
+            int: The number of cells that were replayed.
+        """
+        entries = await asyncio.get_running_loop().run_in_executor(
+            _JOURNAL_WORKER, self._read_entries
+        )
+        with self._journal_lock:
+            for path, cells in entries.items():
+                self._pending[path] = {**cells, **self._pending.get(path, {})}
+        n_replayed = await self.flush()
+        if n_replayed:
+            logger.info(f"Replayed {n_replayed} unflushed cell updates")
+        return n_replayed
@@ -1,6 +1,7 @@
-from typing import Optional, Protocol
+from typing import TYPE_CHECKING, Optional, Protocol
 
-from googleapiclient.http import MediaFileUpload
+if TYPE_CHECKING:
+    from googleapiclient.http import MediaFileUpload
 
 # NOTE: Google API "Resources" are dynamically generated and thus, not typed
 
@@ -27,7 +28,7 @@ class GoogleDriveFilesObject(Protocol):
         self,
         body: dict,
         fields: str,
-        media_body: Optional[MediaFileUpload] = None,
+        media_body: Optional["MediaFileUpload"] = None,
     ) -> GoogleDrivePendingOperation:
         ...
 
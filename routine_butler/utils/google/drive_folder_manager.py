@@ -1,4 +1,4 @@
-import time
+from typing import List, Optional
 
 from googleapiclient.errors import HttpError
 from loguru import logger
@@ -6,20 +6,50 @@ from loguru import logger
 from routine_butler.utils.google.arbitrary_types import (
     GoogleDriveServiceObject,
 )
+from routine_butler.utils.google.drive_id_cache import NOT_FOUND, DriveIdCache
+from routine_butler.utils.google.request_executor import execute_request
 
-N_RETRIES = 20
-SECONDS_BETWEEN_RETRIES = 3
+
+def is_not_found_error(e: HttpError) -> bool:
+    return e.resp.status == 404
 
 
 class DriveFolderManager:
     def __init__(
         self,
         root_folder_name: str,
+        id_cache: Optional[DriveIdCache] = None,
     ):
+        """
+        Args:
+            root_folder_name: Name of the Drive folder that paths are relative to.
+            id_cache: Optional (persistent) cache of the ids of resolved paths.
+        """
         self.root_folder_name = root_folder_name
+        self.id_cache = id_cache
         self._root_folder_id = None
+        # Whether the root folder's id was taken from the (persistent) id cache
+        self._is_root_folder_id_cached = False
 
-    def _create_folder(
+    def get_cached_id(self, kind: str, path: str) -> Optional[str]:
+        """Returns the cached id of the item at the path (see DriveIdCache.get)."""
+        if self.id_cache is None:
+            return None
+        return self.id_cache.get(kind, f"{self.root_folder_name}/{path}")
+
+    def cache_id(self, kind: str, path: str, id_: Optional[str]) -> None:
+        """Caches the id of the item at the path (or that it doesn't exist)."""
+        if self.id_cache is not None:
+            self.id_cache.set(kind, f"{self.root_folder_name}/{path}", id_)
+
+    def invalidate_cached_ids(self, path: str) -> None:
+        """Forgets the cached ids of the path & of everything nested within it."""
+        if len(path.strip("/")) == 0:
+            self._root_folder_id = None
+        if self.id_cache is not None:
+            self.id_cache.invalidate(f"{self.root_folder_name}/{path}")
+
+    async def _create_folder(
         self,
         service: GoogleDriveServiceObject,
         folder_name: str,
@@ -38,44 +68,43 @@ class DriveFolderManager:
             "mimeType": "application/vnd.google-apps.folder",
             "parents": [parent_folder_id],
         }
-        for _ in range(N_RETRIES):
-            try:
-                resp = (
-                    service.files()
-                    .create(body=folder_metadata, fields="id")
-                    .execute()
-                )
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await execute_request(
+            service.files().create(body=folder_metadata, fields="id")
+        )
         return resp["id"]
 
-    def get_root_folder_id(self, service: GoogleDriveServiceObject) -> str:
+    async def get_root_folder_id(
+        self, service: GoogleDriveServiceObject
+    ) -> str:
         if self._root_folder_id is not None:
             return self._root_folder_id  # Previously gotten
+        cached_id = self.get_cached_id("folder", "")
+        if cached_id:
+            self._root_folder_id = cached_id
+            self._is_root_folder_id_cached = True
+            return self._root_folder_id
 
         # Check if root folder exists in Drive
         query = (
             f"name='{self.root_folder_name}' "
             f"and mimeType='application/vnd.google-apps.folder'"
         )
-        for _ in range(N_RETRIES):
-            try:
-                resp = service.files().list(q=query, spaces="drive").execute()
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await execute_request(
+            service.files().list(q=query, spaces="drive")
+        )
         if len(resp["files"]) == 0:
             # If not, create it
-            root_id = self._create_folder(service, self.root_folder_name, None)
+            root_id = await self._create_folder(
+                service, self.root_folder_name, None
+            )
         else:
             root_id = resp["files"][0]["id"]
         self._root_folder_id = root_id  # store for later
+        self._is_root_folder_id_cached = False
+        self.cache_id("folder", "", root_id)
         return self._root_folder_id
 
-    def _get_folder_id(
+    async def _get_folder_id(
         self,
         service: GoogleDriveServiceObject,
         folder_name: str,
@@ -87,16 +116,14 @@ class DriveFolderManager:
             f"name='{folder_name}' and '{parent_folder_id}' in parents "
             f"and mimeType='application/vnd.google-apps.folder'"
         )
-        for _ in range(N_RETRIES):
-            try:
-                resp = service.files().list(q=query, spaces="drive").execute()
-                break
-            except HttpError as e:
-                logger.warning(e)
-                time.sleep(SECONDS_BETWEEN_RETRIES)
+        resp = await execute_request(
+            service.files().list(q=query, spaces="drive")
+        )
 
         if len(resp["files"]) == 0 and create_if_non_existant:
-            return self._create_folder(service, folder_name, parent_folder_id)
+            return await self._create_folder(
+                service, folder_name, parent_folder_id
+            )
         elif len(resp["files"]) == 0:
             raise ValueError(f"Folder '{folder_name}' not found")
         else:
@@ -105,20 +132,63 @@ class DriveFolderManager:
                 raise ValueError("_get_folder_id() called on a non-folder")
             return resp["files"][0]["id"]
 
-    def get_folder_id_from_path(
+    async def _resolve_folder_path(
         self,
         service: GoogleDriveServiceObject,
         path_to_folder: str,
-        should_create_path: bool = False,
+        should_create_path: bool,
+        cached_ids_used: List[str],
     ) -> str:
-        current_parent_folder_id = self.get_root_folder_id(service)
+        current_parent_folder_id = await self.get_root_folder_id(service)
+        if self._is_root_folder_id_cached:
+            cached_ids_used.append(current_parent_folder_id)
+        resolved_folder_names = []
         for folder_name in path_to_folder.split("/"):
             if len(folder_name) == 0:
                 continue
-            current_parent_folder_id = self._get_folder_id(
-                service,
-                folder_name,
-                current_parent_folder_id,
-                should_create_path,
-            )
+            resolved_folder_names.append(folder_name)
+            path = "/".join(resolved_folder_names)
+            cached_id = self.get_cached_id("folder", path)
+            if cached_id == NOT_FOUND and not should_create_path:
+                cached_ids_used.clear()  # i.e. not due to a stale cached id
+                raise ValueError(f"Folder '{folder_name}' not found")
+            elif cached_id:
+                cached_ids_used.append(cached_id)
+                current_parent_folder_id = cached_id
+                continue
+            try:
+                current_parent_folder_id = await self._get_folder_id(
+                    service,
+                    folder_name,
+                    current_parent_folder_id,
+                    should_create_path,
+                )
+            except ValueError:
+                self.cache_id("folder", path, None)
+                raise
+            self.cache_id("folder", path, current_parent_folder_id)
         return current_parent_folder_id
+
+    async def get_folder_id_from_path(
+        self,
+        service: GoogleDriveServiceObject,
+        path_to_folder: str,
+        should_create_path: bool = False,
+    ) -> str:
+        cached_ids_used = []
+        try:
+            return await self._resolve_folder_path(
+                service, path_to_folder, should_create_path, cached_ids_used
+            )
+        except (ValueError, HttpError) as e:
+            if isinstance(e, HttpError) and not is_not_found_error(e):
+                raise
+            if len(cached_ids_used) == 0:
+                raise  # i.e. the failure wasn't due to a (stale) cached id
+            # NOTE: a cached id may be stale (e.g. the folder was deleted or moved),
+            # so the path is resolved once more after forgetting all cached ids
+            logger.info(f"Re-resolving '{path_to_folder}' w/o cached ids")
+            self.invalidate_cached_ids("")
+            return await self._resolve_folder_path(
+                service, path_to_folder, should_create_path, []
+            )
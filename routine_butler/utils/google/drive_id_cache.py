@@ -0,0 +1,108 @@
+"""A persistent (JSON-backed) cache of Google Drive paths to folder & file ids, so that
+resolving an already-resolved path costs no Drive requests.
+
+Entries expire after a TTL. Paths found not to exist are cached as well (w/ a shorter
+TTL), and callers invalidate a path (& everything nested within it) when Drive reports
+its id as not found.
+
+Usage:
+    cache = DriveIdCache(DRIVE_ID_CACHE_PATH)
+    folder_id = cache.get("folder", "Routine Butler/flashcards")
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from loguru import logger
+
+POSITIVE_TTL_SECONDS = 7 * 24 * 60 * 60
+NEGATIVE_TTL_SECONDS = 5 * 60
+
+# Returned by DriveIdCache.get for paths that are cached as not existing
+NOT_FOUND = ""
+
+
+class DriveIdCacheEntry(NamedTuple):
+    id: Optional[str]  # None if the path was found not to exist
+    expires_at: float  # Unix timestamp
+
+
+def _normalize_path(path: str) -> str:
+    return "/".join(c for c in path.split("/") if c)
+
+
+class DriveIdCache:
+    """Maps the paths of a given kind of Drive item (e.g. "folder" or "spreadsheet")
+    to their ids.
+
+    Counts hits (incl. those of paths cached as not existing) & misses (i.e. absent or
+    expired entries).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: The JSON file to persist the cache to, or None to only cache in
+                memory.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, DriveIdCacheEntry] = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._entries = {
+                        key: DriveIdCacheEntry(*entry)
+                        for key, entry in json.load(f).items()
+                    }
+            except (json.JSONDecodeError, TypeError) as e:
+                logger.warning(f"Ignoring corrupted Drive id cache: {e}")
+
+    def _persist(self) -> None:
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, kind: str, path: str) -> Optional[str]:
+        """Returns the cached id, NOT_FOUND if the path is cached as not existing, or
+        None if the path isn't (validly) cached."""
+        entry = self._entries.get(f"{kind}:{_normalize_path(path)}")
+        if entry is None or entry.expires_at < time.time():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return NOT_FOUND if entry.id is None else entry.id
+
+    def set(self, kind: str, path: str, id_: Optional[str]) -> None:
+        """Caches the path's id, or (if id_ is None) that the path doesn't exist."""
+        ttl = NEGATIVE_TTL_SECONDS if id_ is None else POSITIVE_TTL_SECONDS
+        key = f"{kind}:{_normalize_path(path)}"
+        with self._lock:
+            self._entries[key] = DriveIdCacheEntry(id_, time.time() + ttl)
+            self._persist()
+
+    def invalidate(self, path: str) -> None:
+        """Drops the entries (of any kind) of the path & of the paths nested within
+        it."""
+        path = _normalize_path(path)
+        with self._lock:
+            stale_keys = [
+                key
+                for key in self._entries
+                if (key_path := key.split(":", 1)[1]) == path
+                or key_path.startswith(f"{path}/")
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+            self._persist()
+        logger.info(
+            f"Invalidated {len(stale_keys)} cached Drive ids of '{path}'"
+        )
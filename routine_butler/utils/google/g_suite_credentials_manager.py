@@ -6,14 +6,15 @@ from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import TYPE_CHECKING
 from urllib.parse import parse_qs, urlparse
 
-import google_auth_oauthlib.flow
 from google.auth.exceptions import RefreshError
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
 from loguru import logger
 from nicegui import ui
 
+from routine_butler.utils.google.service_pool import GoogleServicePool
+
 if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
     from routine_butler.globals import PagePath
 
 CODE_TEMP_FILE_PATH = "code.txt"
@@ -90,6 +91,9 @@ class G_Suite_Credentials_Manager:
     ):
         self.credentials_file_path = credentials_file_path
         self._credentials = None
+        # Incremented whenever the credentials are loaded, refreshed, or replaced
+        self.credentials_generation = 0
+        self.service_pool = GoogleServicePool(self)
         self.main_app_server_port = main_app_server_port
         self.temp_extra_server_port = temp_extra_server_port
         self.redirect_server_page_path = redirect_server_page_path
@@ -109,6 +113,9 @@ class G_Suite_Credentials_Manager:
         """
         if os.path.exists(CODE_TEMP_FILE_PATH):
             os.remove(CODE_TEMP_FILE_PATH)
+        # NOTE: imported here since google_auth_oauthlib is slow to import
+        import google_auth_oauthlib.flow
+
         # 2. Build the flow and get the authorization url
         flow = google_auth_oauthlib.flow.Flow.from_client_secrets_file(
             self.credentials_file_path,
@@ -150,6 +157,7 @@ class G_Suite_Credentials_Manager:
         # 7. Ascertain credentials
         flow.fetch_token(code=code)
         self._credentials = flow.credentials
+        self.credentials_generation += 1
         json_keys = dict(self._credentials.__dict__).keys()
         logger.info(f"Saving token file w/ keys: {json_keys}")
         # 8. Save the credentials
@@ -161,12 +169,17 @@ class G_Suite_Credentials_Manager:
 
         The implication of returning False is that user will need to re-authenticate
         """
+        # NOTE: imported here since the google auth clients are slow to import
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+
         # If no credentials & token.json exists, try to load them
         if self._credentials is None and os.path.exists(TOKEN_FILE_PATH):
             try:
                 self._credentials = Credentials.from_authorized_user_file(
                     TOKEN_FILE_PATH, self.SCOPES
                 )
+                self.credentials_generation += 1
             except Exception as e:
                 # If the token file is somehow corrupted
                 logger.error(
@@ -185,14 +198,16 @@ class G_Suite_Credentials_Manager:
         elif self._credentials.expired and self._credentials.refresh_token:
             try:
                 self._credentials.refresh(Request())
+                self.credentials_generation += 1
                 with open(TOKEN_FILE_PATH, "w") as f:
                     f.write(self._credentials.to_json())
+                return True
             except RefreshError:
                 return False  # Return false since refresh failed
-            else:
-                return False
+        else:
+            return False
 
-    async def get_credentials(self) -> Credentials:
+    async def get_credentials(self) -> "Credentials":
         """Returns the credentials, running the auth flow if necessary."""
         logger.info("Getting G-Suite credentials...")
         if not self.validate_credentials():
@@ -0,0 +1,168 @@
+"""A shared executor for Google API requests that keeps the (NiceGUI) event loop free:
+each request's blocking `.execute()` runs on a small, bounded pool of worker threads
+(each w/ its own HTTP connection, since httplib2 isn't thread-safe), and failed
+attempts are retried after an exponential, jittered backoff that is awaited rather
+than slept, until the call's deadline.
+
+Usage:
+    resp = await execute_request(service.files().list(q=query))
+    await download_media(service.files().get_media(fileId=file_id), f)
+"""
+
+import asyncio
+import functools
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Optional, Set
+
+from googleapiclient.errors import HttpError
+from loguru import logger
+
+N_WORKERS = 4
+DEFAULT_DEADLINE_SECONDS = 60
+BASE_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 16
+# i.e. rate limits & transient server errors
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+# Drive reports rate limits as 403s, which are otherwise e.g. permission errors
+RETRYABLE_403_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+_GOOGLE_WORKERS = ThreadPoolExecutor(
+    max_workers=N_WORKERS, thread_name_prefix="google_worker"
+)
+_thread_local = threading.local()
+
+
+def get_error_reasons(e: HttpError) -> Set[str]:
+    """Returns the reasons (e.g. "rateLimitExceeded") listed in the error's (JSON)
+    content, whether in its "errors" or its "details"."""
+    try:
+        error = json.loads(e.content)["error"]
+    except (ValueError, KeyError, TypeError):
+        return set()
+    if not isinstance(error, dict):
+        return set()
+    reasons = set()
+    for key in ("errors", "details"):
+        for detail in error.get(key) or []:
+            if isinstance(detail, dict) and "reason" in detail:
+                reasons.add(detail["reason"])
+    return reasons
+
+
+def is_retryable_error(e: Exception) -> bool:
+    if isinstance(e, HttpError):
+        if e.resp.status == 403:
+            return bool(get_error_reasons(e) & RETRYABLE_403_REASONS)
+        return e.resp.status in RETRYABLE_STATUSES
+    return isinstance(e, OSError)  # e.g. connection resets & socket timeouts
+
+
+def get_backoff_seconds(n_failed_attempts: int) -> float:
+    """Returns a random ("full jitter") backoff of up to BASE_BACKOFF_SECONDS doubled
+    per failed attempt (& capped at MAX_BACKOFF_SECONDS)."""
+    cap = BASE_BACKOFF_SECONDS * 2 ** (n_failed_attempts - 1)
+    return random.uniform(0, min(cap, MAX_BACKOFF_SECONDS))
+
+
+def _get_thread_http(credentials: Any) -> Any:
+    """Returns an authorized HTTP object w/ a connection owned by the calling thread."""
+    # NOTE: imported here since httplib2 is only needed once requests are made
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+
+    if not hasattr(_thread_local, "http"):
+        _thread_local.http = httplib2.Http()
+    return AuthorizedHttp(credentials, http=_thread_local.http)
+
+
+def _get_credentials(request: Any) -> Any:
+    """Returns the request's credentials, or None if it isn't an authorized
+    googleapiclient request."""
+    return getattr(getattr(request, "http", None), "credentials", None)
+
+
+def _execute(request: Any) -> Any:
+    credentials = _get_credentials(request)
+    if credentials is None:
+        return request.execute()
+    return request.execute(http=_get_thread_http(credentials))
+
+
+def _download_media(request: Any, file: BinaryIO) -> None:
+    # NOTE: imported here since googleapiclient.http is only needed for downloads
+    from googleapiclient.http import MediaIoBaseDownload
+
+    credentials = _get_credentials(request)
+    if credentials is not None:
+        request.http = _get_thread_http(credentials)
+    downloader = MediaIoBaseDownload(file, request)
+    done = False
+    while done is False:
+        status, done = downloader.next_chunk()
+        logger.info(f"Remote file download: {int(status.progress() * 100)}%.")
+
+
+async def run_in_google_worker(
+    func: Callable[..., Any], *args, **kwargs
+) -> Any:
+    """Awaits the result of `func(*args, **kwargs)` run on a Google worker thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _GOOGLE_WORKERS, functools.partial(func, *args, **kwargs)
+    )
+
+
+async def execute_request(
+    request: Any,
+    deadline_seconds: Optional[float] = DEFAULT_DEADLINE_SECONDS,
+) -> Any:
+    """Awaits the response of the request, retrying retryable errors (see
+    is_retryable_error) w/ backoff.
+
+    Raises:
+        TimeoutError: If no attempt succeeded w/in `deadline_seconds` (None for no
+            deadline).
+        HttpError: If an attempt failed w/ a non-retryable error.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = (
+        None if deadline_seconds is None else loop.time() + deadline_seconds
+    )
+    n_failed_attempts = 0
+    while True:
+        remaining = None if deadline is None else deadline - loop.time()
+        try:
+            # NOTE: a timed-out attempt's thread isn't interrupted, but its response
+            # (or error) is discarded
+            return await asyncio.wait_for(
+                run_in_google_worker(_execute, request), timeout=remaining
+            )
+        except Exception as e:
+            # NOTE: wait_for's TimeoutError is only distinguishable from a request's
+            # own (e.g. socket) timeout by the deadline having passed
+            if deadline is not None and loop.time() >= deadline:
+                raise TimeoutError(
+                    f"Google API request exceeded its {deadline_seconds}s "
+                    "deadline"
+                ) from e
+            if not is_retryable_error(e):
+                raise
+            n_failed_attempts += 1
+            backoff = get_backoff_seconds(n_failed_attempts)
+            if deadline is not None and loop.time() + backoff >= deadline:
+                raise
+            logger.warning(
+                f"Google API request attempt {n_failed_attempts} failed ({e}); "
+                f"retrying in {backoff:.1f}s"
+            )
+            await asyncio.sleep(backoff)
+
+
+async def download_media(request: Any, file: BinaryIO) -> None:
+    """Awaits the download of the (media) request's content into the file, chunk by
+    chunk on a single Google worker thread (& thus over that thread's connection).
+    """
+    await run_in_google_worker(_download_media, request, file)
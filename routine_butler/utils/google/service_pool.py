@@ -0,0 +1,64 @@
+"""A pool of Google API service objects (e.g. drive v3 & sheets v4) that builds each
+one once per credentials generation (i.e. until the credentials are refreshed or
+replaced), rather than on every request.
+
+Usage:
+    service = await credentials_manager.service_pool.get_service("drive", "v3")
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from routine_butler.utils.google.g_suite_credentials_manager import (
+        G_Suite_Credentials_Manager,
+    )
+
+
+class GoogleServicePool:
+    """Builds & caches Google API service objects for a credentials manager.
+
+    Counts builds & the rebuilds avoided by handing out an already-built service.
+    """
+
+    def __init__(self, credentials_manager: "G_Suite_Credentials_Manager"):
+        self.credentials_manager = credentials_manager
+        self.n_builds = 0
+        self.n_rebuilds_avoided = 0
+        self._services: Dict[Tuple[str, str], Any] = {}
+        self._credentials_generation: Optional[int] = None
+
+    async def get_service(self, api_name: str, api_version: str) -> Any:
+        """Returns the service object for the API, (re)building it if the credentials
+        have changed since it was built."""
+        credentials = await self.credentials_manager.get_credentials()
+        generation = self.credentials_manager.credentials_generation
+        if generation != self._credentials_generation:
+            self._services.clear()
+            self._credentials_generation = generation
+
+        key = (api_name, api_version)
+        service = self._services.get(key)
+        if service is not None:
+            self.n_rebuilds_avoided += 1
+            return service
+
+        # NOTE: imported here since googleapiclient.discovery is slow to import
+        from googleapiclient.discovery import build
+
+        # NOTE: static_discovery uses the discovery docs bundled w/ googleapiclient
+        # rather than fetching them
+        service = build(
+            api_name,
+            api_version,
+            credentials=credentials,
+            static_discovery=True,
+        )
+        self._services[key] = service
+        self.n_builds += 1
+        logger.info(
+            f"Built Google '{api_name} {api_version}' service (builds: "
+            f"{self.n_builds}, rebuilds avoided: {self.n_rebuilds_avoided})"
+        )
+        return service
@@ -1,29 +1,28 @@
 import asyncio
 import functools
-import importlib
-import os
 import subprocess
 import traceback
-from typing import TYPE_CHECKING, Dict, Protocol, Type
+from typing import TYPE_CHECKING, Protocol
 
 from loguru import logger
+from nicegui import globals as nicegui_globals
 from nicegui import ui
 from pydantic import BaseModel
 
+from routine_butler.alarm_scheduler import alarm_scheduler
 from routine_butler.globals import (
     CLR_CODES,
     DB_BACKUP_FOLDER_NAME,
     DB_PATH,
-    N_SECONDS_BW_RING_CHECKS,
     PAGES_WITH_ACTION_PATH_USER_MUST_FOLLOW,
-    PLUGINS_DIR_PATH,
-    PLUGINS_IMPORT_STR,
     STORAGE_BUCKET,
     PagePath,
     PlaybackRate,
 )
 
 if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
     from routine_butler.state import State
 
 
@@ -55,24 +54,6 @@ def snake_to_upper_camel_case(snake_case_str: str) -> str:
     return snake_case_str.title().replace("_", "")
 
 
-def dynamically_get_plugins_from_directory() -> Dict[str, Type[Plugin]]:
-    """
-    Dynamically loads all plugin from the plugins directory.
-
-    Returns:
-        A dictionary mapping plugin names to their corresponding plugins.
-    """
-    plugins = {}
-    for file_name in os.listdir(PLUGINS_DIR_PATH):
-        if not file_name.startswith("_") and file_name.endswith(".py"):
-            module_name = file_name[:-3]
-            import_str = PLUGINS_IMPORT_STR.format(module=module_name)
-            module = importlib.import_module(import_str)
-            class_name = snake_to_upper_camel_case(module_name)
-            plugins[class_name] = getattr(module, class_name)
-    return plugins
-
-
 def redirect_to_page(
     page_path: PagePath, n_seconds_before_redirect: float = 0.1
 ) -> None:
@@ -85,11 +66,20 @@ def redirect_to_page(
     ui.timer(n_seconds_before_redirect, _redirect_to_page, once=True)
 
 
-def redirect_to_ring_page_if_next_alarms_time_reached(state: "State") -> None:
-    """Redirects to the ring page if the time of the next alarm has been reached."""
-    if state.next_alarm is not None and state.next_alarm.should_ring():
-        logger.info(f"⏰ Alarm time reached: {state.next_alarm}")
-        redirect_to_page(PagePath.RING)
+def redirect_client_to_ring_page_when_alarm_rings() -> None:
+    """Subscribes the current page's client to the alarm scheduler so that it is
+    redirected to the ring page when an alarm rings (while it is connected)."""
+    client = nicegui_globals.get_client()
+
+    def redirect_to_ring_page(*_):
+        logger.info(f"Redirecting to page: {PagePath.RING}")
+        client.open(PagePath.RING)
+
+    # NOTE: connect handlers run upon every (re)connection of the client's websocket
+    client.on_connect(lambda: alarm_scheduler.subscribe(redirect_to_ring_page))
+    client.on_disconnect(
+        lambda: alarm_scheduler.unsubscribe(redirect_to_ring_page)
+    )
 
 
 MATHJAX_SCRIPTS = """
@@ -124,11 +114,8 @@ def initialize_page(page: PagePath, state: "State") -> None:
         state.build_header(hide_navigation_buttons=True)
     else:
         state.build_header()
-        # Monitor for the arrival of the time of the next alarm
-        ui.timer(
-            N_SECONDS_BW_RING_CHECKS,
-            lambda: redirect_to_ring_page_if_next_alarms_time_reached(state),
-        )
+        # Be redirected upon the arrival of the time of the next alarm
+        redirect_client_to_ring_page_when_alarm_rings()
 
 
 class PendingYoutubeVideo(BaseModel):
@@ -168,12 +155,17 @@ def close_keyboard():
         pass
 
 
-async def perform_db_backup() -> bool:
+async def perform_db_backup(engine: "Engine") -> bool:
     """Uploads a copy of the DB to the cloud storage bucket."""
+    from routine_butler.models.base import run_in_db_worker
+    from routine_butler.models.engine import checkpoint_wal
+
     logger.info("Attempting DB backup...")
     ui.notify("Backing up database...")
     await asyncio.sleep(0.5)  # Give time for notification to appear
     try:
+        # So that the DB file has all committed transactions
+        await run_in_db_worker(checkpoint_wal, engine)
         await STORAGE_BUCKET.upload(
             local_path=DB_PATH,
             remote_dir_path=f"{DB_BACKUP_FOLDER_NAME}/",
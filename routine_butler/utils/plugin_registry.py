@@ -0,0 +1,151 @@
+"""A lazily-importing registry of the app's plugins.
+
+Rather than importing every plugin module (& w/ them heavy dependencies like selenium,
+googleapiclient, speech_recognition, or the box's GPIO hardware) on startup, the
+registry is read from a generated manifest of each plugin's module & config JSON
+schema, and a plugin's module is only imported the first time the plugin is looked up
+(e.g. when a program using it is estimated or administered).
+
+The manifest is (re)generated--importing every plugin once--whenever it is missing or
+older than the source files of the plugins directory. Plugins that failed to import
+when it was generated are recorded in it (& logged whenever it is read) rather than
+retried on every startup, since they'd fail again until their source changes.
+
+Usage:
+    plugins = load_plugin_registry()
+    plugin_names = list(plugins)  # no imports
+    plugin = plugins["YoutubeVideo"](**plugin_dict)  # imports youtube_video.py
+"""
+
+import importlib
+import json
+import os
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional, Type
+
+from loguru import logger
+
+from routine_butler.globals import (
+    PLUGIN_MANIFEST_PATH,
+    PLUGINS_DIR_PATH,
+    PLUGINS_IMPORT_STR,
+)
+from routine_butler.utils.misc import Plugin, snake_to_upper_camel_case
+
+
+class PluginManifestEntry(NamedTuple):
+    module: str  # The import string of the plugin's module
+    config_schema: dict  # The JSON schema of the plugin's (pydantic) config
+
+
+class PluginRegistry(Mapping[str, Type[Plugin]]):
+    """Mapping of plugin names to plugin types that imports each plugin's module on
+    its first lookup."""
+
+    def __init__(self, manifest: Dict[str, PluginManifestEntry]):
+        self.manifest = manifest
+        self._plugins: Dict[str, Type[Plugin]] = {}
+
+    def __getitem__(self, name: str) -> Type[Plugin]:
+        plugin = self._plugins.get(name)
+        if plugin is None:
+            module = importlib.import_module(self.manifest[name].module)
+            plugin = self._plugins[name] = getattr(module, name)
+            logger.debug(f"Imported plugin '{name}' on first use")
+        return plugin
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.manifest)
+
+    def __len__(self) -> int:
+        return len(self.manifest)
+
+    @property
+    def n_imported(self) -> int:
+        return len(self._plugins)
+
+    def get_config_schema(self, name: str) -> dict:
+        """Returns the plugin's config JSON schema (w/o importing the plugin)."""
+        return self.manifest[name].config_schema
+
+
+def get_plugins_source_mtime() -> float:
+    """Returns the latest modification time of the plugins directory's source files."""
+    mtimes = [os.path.getmtime(PLUGINS_DIR_PATH)]
+    for dir_path, _, file_names in os.walk(PLUGINS_DIR_PATH):
+        for file_name in file_names:
+            if file_name.endswith(".py"):
+                mtimes.append(
+                    os.path.getmtime(os.path.join(dir_path, file_name))
+                )
+    return max(mtimes)
+
+
+def generate_plugin_manifest(
+    path: str = PLUGIN_MANIFEST_PATH,
+) -> Dict[str, PluginManifestEntry]:
+    """Imports every plugin in the plugins directory & writes (& returns) the manifest
+    of their modules & config schemas. Plugins that fail to import are logged & left
+    out."""
+    manifest: Dict[str, PluginManifestEntry] = {}
+    failed_plugin_names: List[str] = []
+    for file_name in sorted(os.listdir(PLUGINS_DIR_PATH)):
+        if file_name.startswith("_") or not file_name.endswith(".py"):
+            continue
+        import_str = PLUGINS_IMPORT_STR.format(module=file_name[:-3])
+        name = snake_to_upper_camel_case(file_name[:-3])
+        try:
+            plugin = getattr(importlib.import_module(import_str), name)
+        except Exception:
+            logger.exception(f"Failed to import plugin '{name}'")
+            failed_plugin_names.append(name)
+            continue
+        manifest[name] = PluginManifestEntry(
+            import_str, plugin.model_json_schema()
+        )
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "source_mtime": get_plugins_source_mtime(),
+                "failed_plugin_names": failed_plugin_names,
+                "plugins": {n: e._asdict() for n, e in manifest.items()},
+            },
+            f,
+            indent=2,
+        )
+    logger.info(f"Generated plugin manifest w/ {len(manifest)} plugins")
+    return manifest
+
+
+def read_plugin_manifest(
+    path: str = PLUGIN_MANIFEST_PATH,
+) -> Optional[Dict[str, PluginManifestEntry]]:
+    """Reads the manifest, returning None if it is missing or stale."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        manifest_json = json.load(f)
+    failed_plugin_names = manifest_json.get("failed_plugin_names")
+    if (
+        # i.e. written in a format that predates the failed plugins' names
+        failed_plugin_names is None
+        or manifest_json["source_mtime"] < get_plugins_source_mtime()
+    ):
+        return None
+    if failed_plugin_names:
+        logger.warning(
+            f"Plugins that failed to import (& will be retried once their source "
+            f"changes): {failed_plugin_names}"
+        )
+    return {
+        name: PluginManifestEntry(**entry)
+        for name, entry in manifest_json["plugins"].items()
+    }
+
+
+def load_plugin_registry(path: str = PLUGIN_MANIFEST_PATH) -> PluginRegistry:
+    """Loads the registry from the manifest, (re)generating the manifest first if it
+    is missing or stale."""
+    manifest = read_plugin_manifest(path)
+    if manifest is None:
+        manifest = generate_plugin_manifest(path)
+    return PluginRegistry(manifest)
@@ -0,0 +1,128 @@
+"""A startup profiler (see run.py's --profile-startup) that records how long each module
+takes to import (w/ "self" & "cumulative" microseconds, as in `python -X importtime`)
+and the time from process start to the first page being served to a client.
+
+Usage:
+    startup_profiler.install()  # before importing the app
+    from routine_butler.main import main
+    ...
+    startup_profiler.record_first_page()  # e.g. in an app.on_connect handler
+"""
+
+import builtins
+import importlib.util
+import sys
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from loguru import logger
+
+N_SLOWEST_IMPORTS_TO_LOG = 25
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # How nested the import was (0 for those imported by the app itself)
+
+
+class StartupProfiler:
+    """Times first-time imports by wrapping builtins.__import__ while installed."""
+
+    def __init__(self):
+        self.start_time: Optional[float] = None
+        self.import_timings: List[ImportTiming] = []
+        self.seconds_to_first_page: Optional[float] = None
+        self._original_import: Optional[Callable] = None
+        self._children_us_stack: List[int] = []
+
+    @property
+    def is_installed(self) -> bool:
+        return self._original_import is not None
+
+    def install(self) -> None:
+        self.start_time = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self) -> None:
+        if self.is_installed:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(
+        self, name, globals=None, locals=None, fromlist=(), level=0
+    ):
+        if level > 0:  # i.e. a relative import
+            package = (globals or {}).get("__package__") or ""
+            name_to_time = importlib.util.resolve_name(
+                "." * level + name, package
+            )
+        else:
+            name_to_time = name
+        module = sys.modules.get(name_to_time)
+        if module is not None:
+            # i.e. `from <imported package> import <submodule(s) not yet imported>`
+            not_yet_imported = [
+                item
+                for item in fromlist or ()
+                if item != "*" and not hasattr(module, item)
+            ]
+            if not not_yet_imported:  # i.e. not a first-time import
+                return self._original_import(
+                    name, globals, locals, fromlist, level
+                )
+            name_to_time += f".{not_yet_imported[0]}"
+
+        self._children_us_stack.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return self._original_import(
+                name, globals, locals, fromlist, level
+            )
+        finally:
+            cumulative_us = (time.perf_counter_ns() - start) // 1000
+            children_us = self._children_us_stack.pop()
+            depth = len(self._children_us_stack)
+            if self._children_us_stack:
+                self._children_us_stack[-1] += cumulative_us
+            self.import_timings.append(
+                ImportTiming(
+                    name_to_time,
+                    cumulative_us - children_us,
+                    cumulative_us,
+                    depth,
+                )
+            )
+
+    def record_first_page(self) -> None:
+        """Records the time to the first page (only once) & logs the profile."""
+        if self.seconds_to_first_page is not None or self.start_time is None:
+            return
+        self.seconds_to_first_page = time.perf_counter() - self.start_time
+        self.uninstall()
+        self.log_report()
+
+    def log_report(self) -> None:
+        total_import_us = sum(
+            t.cumulative_us for t in self.import_timings if t.depth == 0
+        )
+        lines = [
+            f"Startup profile: {len(self.import_timings)} modules imported in "
+            f"{total_import_us / 1e6:.2f}s, time to first page: "
+            f"{self.seconds_to_first_page or float('nan'):.2f}s",
+            f"{'self [us]':>10} | {'cumulative':>10} | module",
+        ]
+        slowest = sorted(
+            self.import_timings, key=lambda t: t.cumulative_us, reverse=True
+        )
+        for timing in slowest[:N_SLOWEST_IMPORTS_TO_LOG]:
+            lines.append(
+                f"{timing.self_us:>10} | {timing.cumulative_us:>10} | "
+                f"{'  ' * timing.depth}{timing.module}"
+            )
+        logger.info("\n".join(lines))
+
+
+startup_profiler = StartupProfiler()
@@ -31,12 +31,11 @@ def configure_programs():
         p_conf.save_button.on("click", _update_program_select_options)
         p_conf.save_button.on("click", program_configurer_frame.clear)
 
-    def hdl_delete_program(program_title: Program):
+    async def hdl_delete_program(program_title: Program):
         idx = state.program_titles.index(program_title)
         program = state.programs[idx]
-        program.delete_self_from_db(state.engine)  # remove from db
-        # FIXME: state attrs should not be modified directly
-        state._programs.pop(idx)  # remove from state
+        await program.adelete(state.engine)  # remove from db (& repository)
+        state.update_programs()
         _update_program_select_options()
 
     initialize_page(page=PagePath.SET_PROGRAMS, state=state)
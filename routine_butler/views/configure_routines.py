@@ -4,6 +4,7 @@ from routine_butler.components import micro
 from routine_butler.components.routine_configurer import RoutineConfigurer
 from routine_butler.globals import PagePath
 from routine_butler.models import Routine
+from routine_butler.models.base import db_unit_of_work
 from routine_butler.state import state
 from routine_butler.utils.misc import initialize_page
 
@@ -12,8 +13,9 @@ from routine_butler.utils.misc import initialize_page
 def configure_routines():
     def hdl_add_routine():
         new_routine = Routine()
-        new_routine.add_self_to_db(state.engine)
-        state.user.add_routine(state.engine, new_routine)
+        with db_unit_of_work(state.engine):
+            new_routine.add_self_to_db(state.engine)
+            state.user.add_routine(state.engine, new_routine)
         with routines_frame:
             RoutineConfigurer(
                 routine=new_routine,
@@ -29,7 +31,7 @@ def configure_routines():
     with content.classes("w-4/5 gap-y-4"):
         routines_frame = ui.column().classes("w-full")
         with routines_frame.classes("justify-center items-center gap-y-4"):
-            for routine in state.user.get_routines(state.engine):
+            for routine in state.repository.get_routines(state.engine):
                 RoutineConfigurer(
                     routine=routine, parent_element=routines_frame
                 )
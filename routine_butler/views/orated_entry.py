@@ -11,10 +11,9 @@ from functools import partial
 from multiprocessing import Manager, Queue
 from typing import List
 
-import pyaudio
-
 # from vosk import KaldiRecognizer, Model
-import speech_recognition as sr
+# NOTE: pyaudio & speech_recognition are imported in the (subprocess) functions that
+# use them so that importing this view doesn't pay for them
 from nicegui import run, ui
 
 from routine_butler.components import micro
@@ -41,7 +40,6 @@ from routine_butler.utils.punctuate import apply_punctuation_rules
 INPUT_DEVICE_NAME_PATTERN = re.compile(r"(?i)(\S*usb\S*|\S*webcam\S*)")
 CHANNELS = 1
 RECORDING_CYCLE_SECONDS = 7
-AUDIO_FORMAT = pyaudio.paInt16
 FRAMES_PER_BUFFER = 3200
 CHANNELS = 1
 SAMPLE_RATE = 48000
@@ -51,6 +49,8 @@ MIN_CHARS_PER_CYCLE = 6
 
 @log_errors
 def record(lock, signals: Signals, recorded: Queue, **kwargs):
+    import speech_recognition as sr
+
     def should_record() -> bool:
         return (
             not signals["asr_is_paused"]
@@ -69,6 +69,8 @@ def record(lock, signals: Signals, recorded: Queue, **kwargs):
     transcribe_thread.start()
     punctuate_thread.start()
 
+    # import pyaudio
+
     # p = pyaudio.PyAudio()
     # device_idx = None
     # info = p.get_host_api_info_by_index(0)
@@ -92,7 +94,7 @@ def record(lock, signals: Signals, recorded: Queue, **kwargs):
     #     device_idx = 0
 
     # stream = p.open(
-    #     format=AUDIO_FORMAT,
+    #     format=pyaudio.paInt16,
     #     channels=CHANNELS,
     #     rate=SAMPLE_RATE,
     #     input=True,
@@ -130,6 +132,8 @@ def transcribe(
     transcribed_diary: List[str],
     **_,
 ):
+    import speech_recognition as sr
+
     def should_transcribe():
         return not signals["asr_is_paused"]
 
@@ -1,7 +1,7 @@
 import argparse
 from typing import Protocol
 
-from routine_butler.main import main
+from routine_butler.utils.startup_profiler import startup_profiler
 
 
 class RunArgs(Protocol):
@@ -11,6 +11,7 @@ class RunArgs(Protocol):
     fullscreen: bool
     open_browser: bool
     reload: bool
+    profile_startup: bool
 
 
 CLI_DESCRIPTION = "CLI for running RoutineButler"
@@ -40,6 +41,10 @@ ARGS = [
         "arg": "--reload",
         "help": "Reloads the app on file changes (useful for development)",
     },
+    {
+        "arg": "--profile-startup",
+        "help": "Logs module import timings & the time to first page on startup",
+    },
 ]
 
 
@@ -49,6 +54,11 @@ if __name__ in {"__main__", "__mp_main__"}:
         parser.add_argument(arg["arg"], action="store_true", help=arg["help"])
     args: RunArgs = parser.parse_args()
 
+    if args.profile_startup:
+        startup_profiler.install()
+    # NOTE: imported after the profiler is installed so that its imports are timed
+    from routine_butler.main import main
+
     main(
         testing=args.testing,
         single_user=args.single_user,
@@ -56,4 +66,5 @@ if __name__ in {"__main__", "__mp_main__"}:
         fullscreen=args.fullscreen,
         open_browser=args.open_browser,
         reload=args.reload,
+        profile_startup=args.profile_startup,
     )
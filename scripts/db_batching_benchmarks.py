@@ -0,0 +1,94 @@
+"""Ad-hoc script to compare the cost of persisting ProgramRuns one commit per row (via
+BaseDBPydanticModel.add_self_to_db, etc.) against one commit per batch (via
+BaseDBPydanticModel.add_many, etc.).
+
+NOTE: Uses an on-disk SQLite file (not :memory:) so that per-commit fsyncs are paid."""
+
+import datetime
+import os
+import time
+from typing import Callable, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine.base import Engine
+
+from routine_butler.models import ProgramRun
+from routine_butler.models.base import SQLAlchemyBase
+
+BENCHMARK_DB_FPATH = "db_batching_benchmark.sqlite"
+N_ROWS_TO_BENCHMARK = [1_000, 10_000]
+
+
+def make_program_runs(n_rows: int) -> List[ProgramRun]:
+    now = datetime.datetime.now()
+    return [
+        ProgramRun(
+            program_title=f"Program {i}",
+            plugin_type="YoutubeVideo",
+            plugin_dict={"mode": "series", "path_or_id": "series-600"},
+            routine_title="Morning",
+            start_time=now,
+            end_time=now,
+            run_data={"video_id": "QWlCcfSqfKY", "reported_success": True},
+            user_uid=1,
+        )
+        for i in range(n_rows)
+    ]
+
+
+def time_it(func: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def benchmark(engine: Engine, n_rows: int) -> None:
+    runs = make_program_runs(n_rows)
+
+    def add_per_row():
+        for run in runs:
+            run.add_self_to_db(engine)
+
+    def update_per_row():
+        for run in runs:
+            run.update_self_in_db(engine)
+
+    def delete_per_row():
+        for run in runs:
+            run.delete_self_from_db(engine)
+
+    per_row_seconds = {
+        "add": time_it(add_per_row),
+        "update": time_it(update_per_row),
+        "delete": time_it(delete_per_row),
+    }
+    batched_seconds = {
+        "add": time_it(lambda: ProgramRun.add_many(engine, runs)),
+        "update": time_it(lambda: ProgramRun.update_many(engine, runs)),
+        "delete": time_it(lambda: ProgramRun.delete_many(engine, runs)),
+    }
+
+    print(f"\n{n_rows:,} rows:")
+    for operation in per_row_seconds.keys():
+        per_row, batched = (
+            per_row_seconds[operation],
+            batched_seconds[operation],
+        )
+        print(
+            f" - {operation:<6} per-row: {per_row:8.3f}s "
+            f"({per_row / n_rows * 1000:.3f}ms/row) | batched: {batched:8.3f}s "
+            f"({batched / n_rows * 1000:.3f}ms/row) | {per_row / batched:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    if os.path.exists(BENCHMARK_DB_FPATH):
+        os.remove(BENCHMARK_DB_FPATH)
+    engine = create_engine(f"sqlite:///{BENCHMARK_DB_FPATH}")
+    SQLAlchemyBase.metadata.create_all(engine)
+    try:
+        for n_rows in N_ROWS_TO_BENCHMARK:
+            benchmark(engine, n_rows)
+    finally:
+        engine.dispose()
+        os.remove(BENCHMARK_DB_FPATH)
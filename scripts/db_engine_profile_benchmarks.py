@@ -0,0 +1,89 @@
+"""Ad-hoc script to compare the latency of common DB operations (a ProgramRun insert
+via ProgramRun.add_self_to_db & a User.get_routines read) under each of the
+SQLITE_ENGINE_PROFILES.
+
+NOTE: Uses a fresh on-disk SQLite file per profile (not :memory:) so that fsyncs are
+paid & so that WAL mode (which persists in the DB file) doesn't leak across profiles."""
+
+import datetime
+import os
+import statistics
+import time
+from typing import Callable, List
+
+from sqlalchemy.engine.base import Engine
+
+from routine_butler.models import ProgramRun, Routine, User
+from routine_butler.models.base import SQLAlchemyBase
+from routine_butler.models.engine import (
+    SQLITE_ENGINE_PROFILES,
+    create_sqlite_engine,
+)
+
+BENCHMARK_DB_FPATH = "db_engine_profile_benchmark.sqlite"
+N_INSERTS = 500
+N_READS = 500
+N_ROUTINES = 20
+
+
+def make_program_run(user: User) -> ProgramRun:
+    now = datetime.datetime.now()
+    return ProgramRun(
+        program_title="Program",
+        plugin_type="YoutubeVideo",
+        plugin_dict={"mode": "series", "path_or_id": "series-600"},
+        routine_title="Morning",
+        start_time=now,
+        end_time=now,
+        run_data={"video_id": "QWlCcfSqfKY", "reported_success": True},
+        user_uid=user.uid,
+    )
+
+
+def latencies_ms(func: Callable[[], None], n_calls: int) -> List[float]:
+    latencies = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(latencies: List[float]) -> str:
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    return (
+        f"median {statistics.median(latencies):7.3f}ms | "
+        f"p95 {p95:7.3f}ms | max {max(latencies):7.3f}ms"
+    )
+
+
+def benchmark(engine: Engine) -> None:
+    user = User(username="benchmark")
+    user.add_self_to_db(engine)
+    for i in range(N_ROUTINES):
+        user.add_routine(engine, Routine(title=f"Routine {i}"))
+
+    insert_latencies = latencies_ms(
+        lambda: make_program_run(user).add_self_to_db(engine), N_INSERTS
+    )
+    read_latencies = latencies_ms(lambda: user.get_routines(engine), N_READS)
+    print(f" - ProgramRun.add_self_to_db: {summarize(insert_latencies)}")
+    print(f" - User.get_routines:         {summarize(read_latencies)}")
+
+
+if __name__ == "__main__":
+    for profile_name, profile in SQLITE_ENGINE_PROFILES.items():
+        print(
+            f"\n'{profile_name}' profile ({profile.pragmas or 'no PRAGMAs'}):"
+        )
+        engine = create_sqlite_engine(
+            f"sqlite:///{BENCHMARK_DB_FPATH}", profile
+        )
+        SQLAlchemyBase.metadata.create_all(engine)
+        try:
+            benchmark(engine)
+        finally:
+            engine.dispose()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(BENCHMARK_DB_FPATH + suffix):
+                    os.remove(BENCHMARK_DB_FPATH + suffix)
@@ -0,0 +1,94 @@
+"""Ad-hoc script to compare the previous next-alarm search (a Python loop calling
+Alarm.get_next_ring_datetime--w/ its strptime--for every alarm) against the
+AlarmIndex-based User.get_next_alarm_and_routine (which builds an index per call) and
+against a lookup in an already-built AlarmIndex (as cached by State's UserRepository),
+over 10k alarms."""
+
+import datetime
+import random
+import timeit
+from typing import List, Optional, Tuple
+
+from routine_butler.models import Alarm, Routine, User
+from routine_butler.models.alarm import AlarmIndex
+
+N_ALARMS = 10_000
+N_ALARMS_PER_ROUTINE = 10
+N_REPEATS = 5  # best of n repeats is reported
+N_CALLS = 10
+
+
+def make_routines() -> List[Routine]:
+    random.seed(0)
+    routines = []
+    for i in range(N_ALARMS // N_ALARMS_PER_ROUTINE):
+        alarms = [
+            Alarm(
+                time_str=f"{random.randrange(24):02}:{random.randrange(60):02}",
+                is_enabled=random.random() < 0.9,
+            )
+            for _ in range(N_ALARMS_PER_ROUTINE)
+        ]
+        routines.append(Routine(title=f"Routine {i}", alarms=alarms))
+    return routines
+
+
+def get_next_alarm_and_routine_before(
+    routines: List[Routine],
+) -> Tuple[Optional[Alarm], Optional[Routine]]:
+    """The previous implementation of User.get_next_alarm_and_routine."""
+    now = datetime.datetime.now()
+    cur_closest_alarm = None
+    cur_closest_routine = None
+    cur_min_time_until_ring = datetime.timedelta(days=1)
+    for routine in routines:
+        for alarm in routine.alarms:
+            if not alarm.is_enabled:
+                continue
+            time_str = alarm.time_str
+            time = datetime.datetime.strptime(time_str, "%H:%M").time()
+            todays_ring_dtime = datetime.datetime.combine(
+                datetime.datetime.now().date(), time
+            )
+            if todays_ring_dtime < datetime.datetime.now():
+                todays_ring_dtime += datetime.timedelta(days=1)
+            time_until_ring = todays_ring_dtime - now
+            if time_until_ring < cur_min_time_until_ring:
+                cur_min_time_until_ring = time_until_ring
+                cur_closest_alarm = alarm
+                cur_closest_routine = routine
+    return cur_closest_alarm, cur_closest_routine
+
+
+def ms_per_call(stmt, **globals_) -> float:
+    seconds = min(
+        timeit.repeat(stmt, globals=globals_, number=N_CALLS, repeat=N_REPEATS)
+    )
+    return seconds / N_CALLS * 1000
+
+
+if __name__ == "__main__":
+    routines = make_routines()
+    user = User(username="benchmark")
+    before_ms = ms_per_call(
+        "get_next_alarm_and_routine_before(routines)",
+        get_next_alarm_and_routine_before=get_next_alarm_and_routine_before,
+        routines=routines,
+    )
+    after_ms = ms_per_call(
+        "user.get_next_alarm_and_routine(None, routines)",
+        user=user,
+        routines=routines,
+    )
+    index = AlarmIndex((a, r) for r in routines for a in r.alarms)
+    cached_ms = ms_per_call("index.get_next()", index=index)
+    print(f"Next alarm among {N_ALARMS:,} alarms (best of {N_REPEATS}):")
+    print(f" - before (loop w/ strptime):     {before_ms:8.3f}ms")
+    print(
+        f" - after (build index + bisect):  {after_ms:8.3f}ms "
+        f"({before_ms / after_ms:.1f}x)"
+    )
+    print(
+        f" - after (cached index, bisect):  {cached_ms:8.3f}ms "
+        f"({before_ms / cached_ms:.0f}x)"
+    )
@@ -0,0 +1,82 @@
+"""Ad-hoc script to compare the cold-start cost of eagerly importing every plugin module
+(as State.set_user did via dynamically_get_plugins_from_directory) against loading the
+lazy PluginRegistry from an up-to-date manifest.
+
+Each measurement runs in a fresh interpreter so that no plugin module (or dependency)
+is already imported, after routine_butler.state (which every page imports anyway) has
+been imported.
+
+NOTE: Plugin modules that fail to import on this machine (e.g. those that need the
+box's hardware) are reported & left out of the eager measurement. Since the manifest is
+then incomplete (& would be regenerated by load_plugin_registry), the lazy measurement
+times reading the manifest file (plus the staleness check) directly."""
+
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+from routine_butler.globals import PLUGINS_DIR_PATH, PLUGINS_IMPORT_STR
+from routine_butler.utils.plugin_registry import generate_plugin_manifest
+
+N_RUNS = 5
+
+TIMED_SNIPPET = """
+import time
+import routine_butler.state
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def time_in_fresh_interpreter(statement: str) -> float:
+    """Returns how long (in seconds) the statement takes in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", TIMED_SNIPPET.format(statement=statement)],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def get_importable_plugin_modules() -> List[str]:
+    modules = []
+    for file_name in sorted(os.listdir(PLUGINS_DIR_PATH)):
+        if not file_name.startswith("_") and file_name.endswith(".py"):
+            module = PLUGINS_IMPORT_STR.format(module=file_name[:-3])
+            try:
+                time_in_fresh_interpreter(f"import {module}")
+                modules.append(module)
+            except RuntimeError as e:
+                print(f" - Skipping {module} ({e})")
+    return modules
+
+
+def summarize(name: str, seconds: List[float]) -> None:
+    print(
+        f"{name}: median {statistics.median(seconds) * 1000:8.1f}ms | "
+        f"min {min(seconds) * 1000:8.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    generate_plugin_manifest()
+    modules = get_importable_plugin_modules()
+    eager_statement = "\n".join(f"import {module}" for module in modules)
+    lazy_statement = (
+        "from routine_butler.utils import plugin_registry as r\n"
+        "r.PluginRegistry(r.read_plugin_manifest() or {})"
+    )
+    summarize(
+        f"Eager import of {len(modules)} plugins",
+        [time_in_fresh_interpreter(eager_statement) for _ in range(N_RUNS)],
+    )
+    summarize(
+        "Lazy registry from manifest",
+        [time_in_fresh_interpreter(lazy_statement) for _ in range(N_RUNS)],
+    )
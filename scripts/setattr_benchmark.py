@@ -0,0 +1,70 @@
+"""Ad-hoc script to measure the attribute-set throughput of BaseDBPydanticModel
+subclasses against both a plain Pydantic model and the previous read-only-field guard
+(which inspected the caller's frame w/ sys._getframe on every assignment)."""
+
+import sys
+import timeit
+
+from pydantic import BaseModel
+
+from routine_butler.models import Program
+from routine_butler.models.base import AttemptedSetOnReadOnlyFieldError
+
+N_SETS = 200_000
+N_REPEATS = 5  # best of n repeats is reported
+
+
+class PlainProgram(BaseModel):
+    """Pydantic model w/ no read-only-field guard (the lower bound)."""
+
+    title: str = "New Program"
+
+
+class FrameInspectingProgram(Program):
+    """Program w/ the previous, sys._getframe-based, read-only-field guard."""
+
+    def __setattr__(self, name, value):
+        _READ_ONLY_FIELDS = {"uid", "created_at", "updated_at"}
+        if name in _READ_ONLY_FIELDS:
+            outer_scope_locals = sys._getframe(1).f_locals
+            if "cls" in outer_scope_locals.keys():
+                modifying_class = outer_scope_locals["cls"]
+            elif "self" in outer_scope_locals.keys():
+                modifying_class = outer_scope_locals["self"].__class__
+            else:
+                modifying_class = None
+            if modifying_class != self.__class__:
+                raise AttemptedSetOnReadOnlyFieldError(
+                    f"Cannot modify field: '{name}'"
+                )
+        BaseModel.__setattr__(self, name, value)
+
+    def _set_read_only_fields(self, **values) -> None:
+        for name, value in values.items():
+            self.__setattr__(name, value)  # guard inspects this frame's `self`
+
+
+def sets_per_second(model: BaseModel, stmt: str) -> float:
+    seconds = min(
+        timeit.repeat(
+            stmt, globals={"model": model}, number=N_SETS, repeat=N_REPEATS
+        )
+    )
+    return N_SETS / seconds
+
+
+if __name__ == "__main__":
+    models = {
+        "plain pydantic": PlainProgram(),
+        "before (sys._getframe)": FrameInspectingProgram(),
+        "after (_READ_ONLY_FIELDS)": Program(),
+    }
+    print(f"Sets per second (best of {N_REPEATS} x {N_SETS:,} sets):")
+    print("Plain field (model.title = ...):")
+    for label, model in models.items():
+        rate = sets_per_second(model, "model.title = 'Morning Stretch'")
+        print(f" - {label:<26} {rate:>12,.0f}")
+    print("Protected field, by the database methods (uid = ...):")
+    for label, model in list(models.items())[1:]:
+        rate = sets_per_second(model, "model._set_read_only_fields(uid=1)")
+        print(f" - {label:<26} {rate:>12,.0f}")
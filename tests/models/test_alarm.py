@@ -0,0 +1,113 @@
+import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from routine_butler.models.alarm import Alarm, AlarmIndex
+
+# A Wednesday
+NOW = datetime.datetime(2023, 5, 3, 9, 30, 15)
+
+
+def test_minute_of_day_refreshed_on_time_str_change():
+    alarm = Alarm(time_str="07:45")
+    assert alarm.minute_of_day == 7 * 60 + 45
+    alarm.time_str = "23:05"
+    assert alarm.minute_of_day == 23 * 60 + 5
+
+
+@pytest.mark.xfail(raises=ValidationError)
+def test_invalid_days_of_week():
+    Alarm(days_of_week=[7])
+
+
+@pytest.mark.parametrize(
+    "time_str, days_of_week, expected",
+    [
+        ("10:00", [0, 1, 2, 3, 4, 5, 6], datetime.datetime(2023, 5, 3, 10, 0)),
+        ("09:00", [0, 1, 2, 3, 4, 5, 6], datetime.datetime(2023, 5, 4, 9, 0)),
+        ("09:30", [0, 1, 2, 3, 4, 5, 6], datetime.datetime(2023, 5, 4, 9, 30)),
+        ("08:00", [5, 6], datetime.datetime(2023, 5, 6, 8, 0)),
+        (
+            "08:00",
+            [0],
+            datetime.datetime(2023, 5, 8, 8, 0),
+        ),  # wraps to next week
+        ("10:00", [2], datetime.datetime(2023, 5, 3, 10, 0)),
+        ("08:00", [], None),
+    ],
+)
+def test_get_next_ring_datetime(time_str, days_of_week, expected):
+    alarm = Alarm(time_str=time_str, days_of_week=days_of_week)
+    assert alarm.get_next_ring_datetime(NOW) == expected
+
+
+def test_get_next_ring_datetime_at_exact_minute():
+    alarm = Alarm(time_str="09:30")
+    exact_now = NOW.replace(second=0)
+    assert alarm.get_next_ring_datetime(exact_now) == exact_now
+
+
+def test_alarm_index_get_next():
+    alarms_and_items = [
+        (Alarm(time_str="09:00"), "daily, passed today"),
+        (Alarm(time_str="12:00", is_enabled=False), "disabled"),
+        (Alarm(time_str="11:00", days_of_week=[4]), "fridays"),
+        (Alarm(time_str="10:15", days_of_week=[2]), "wednesdays"),
+    ]
+    index = AlarmIndex(alarms_and_items)
+    assert len(index) == 3
+    next_ring_datetime, alarm, item = index.get_next(NOW)
+    assert item == "wednesdays" and alarm is alarms_and_items[3][0]
+    assert next_ring_datetime == datetime.datetime(2023, 5, 3, 10, 15)
+    friday_morning = datetime.datetime(2023, 5, 5, 10, 0)
+    assert index.get_next(friday_morning)[2] == "fridays"
+    thursday_morning = datetime.datetime(2023, 5, 4, 9, 30)
+    assert index.get_next(thursday_morning)[2] == "daily, passed today"
+
+
+def test_alarm_index_empty():
+    assert AlarmIndex([]).get_next(NOW) is None
+
+
+@pytest.mark.parametrize("time_str", ["7:5", "24:00", "12:60", "noon", "1200"])
+def test_invalid_time_str(time_str):
+    with pytest.raises(ValidationError):
+        Alarm(time_str=time_str)
+
+
+def test_hour_and_minute():
+    alarm = Alarm(time_str="7:05")
+    assert (alarm.hour, alarm.minute) == (7, 5)
+    assert alarm.get_todays_ring_datetime().time() == datetime.time(7, 5)
+
+
+@pytest.mark.parametrize(
+    "time_str, n_minutes, expected",
+    [
+        ("09:30", 3, True),
+        ("09:28", 3, True),
+        ("09:26", 3, False),
+        ("09:31", 3, False),  # i.e. hasn't passed yet today
+    ],
+)
+def test_has_passed_in_the_last_n_minutes(time_str, n_minutes, expected):
+    alarm = Alarm(time_str=time_str)
+    assert alarm.has_passed_in_the_last_n_minutes(n_minutes, NOW) == expected
+
+
+@pytest.mark.parametrize(
+    "days_of_week, expected", [([2], True), ([0, 1, 3, 4, 5, 6], False)]
+)
+def test_rings_only_on_its_days_of_week(days_of_week, expected):
+    alarm = Alarm(time_str="09:30", days_of_week=days_of_week)
+    assert alarm.has_passed_in_the_last_n_minutes(3, NOW) == expected
+    assert alarm.should_ring(NOW.replace(second=0)) == expected
+
+
+def test_invalid_time_str_is_never_stored():
+    alarm = Alarm(time_str="07:45")
+    with pytest.raises(ValueError):
+        alarm.time_str = "25:00"
+    assert alarm.time_str == "07:45"
+    assert alarm.model_copy(deep=True).minute_of_day == 7 * 60 + 45
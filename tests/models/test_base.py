@@ -1,9 +1,13 @@
+import asyncio
+import threading
 import time
+from dataclasses import dataclass
 
 import pytest
 from pydantic import ValidationError, constr
 from sqlalchemy import Column, String
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.orm import Session
 
 from routine_butler.models.base import (
     AttemptedSetOnReadOnlyFieldError,
@@ -12,6 +16,7 @@ from routine_butler.models.base import (
     DatabaseDeletionFailedError,
     DatabaseUpdateFailedError,
     InstanceAlreadyExistsError,
+    db_unit_of_work,
 )
 
 INTEGRATION_TEST_DB_FPATH = "test_database.db"
@@ -191,6 +196,47 @@ def test_query_many_order_by(engine: Engine):
     assert [hero.name for hero in qry_result] == sorted(names)
 
 
+# BaseDBPydanticModel.query_iter()
+
+
+def test_basic_query_iter(engine: Engine):
+    heroes = [Hero(name=name) for name in ["Superman", "Batman", "Robin"]]
+    Hero.add_many(engine, heroes)
+    same_ids_filter_exp = Hero.Config.orm_model.uid.in_(
+        [h.uid for h in heroes]
+    )
+    qry_result = Hero.query_iter(
+        engine, filter_expr=same_ids_filter_exp, chunk_size=2
+    )
+    assert list(qry_result) == heroes
+
+
+def test_query_iter_columns(engine: Engine):
+    hero = Hero(name="Hawkgirl")
+    hero.add_self_to_db(engine)
+    same_id_filter_exp = Hero.Config.orm_model.uid == hero.uid
+    qry_result = Hero.query_iter(
+        engine, filter_expr=same_id_filter_exp, columns=["uid", "name"]
+    )
+    assert [(row.uid, row.name) for row in qry_result] == [
+        (hero.uid, "Hawkgirl")
+    ]
+
+
+def test_query_iter_columns_into_dataclass(engine: Engine):
+    @dataclass
+    class HeroName:
+        name: str
+
+    hero = Hero(name="Martian Manhunter")
+    hero.add_self_to_db(engine)
+    same_id_filter_exp = Hero.Config.orm_model.uid == hero.uid
+    qry_result = Hero.query_iter(
+        engine, filter_expr=same_id_filter_exp, columns=["name"], into=HeroName
+    )
+    assert list(qry_result) == [HeroName(name="Martian Manhunter")]
+
+
 # BaseDBPydanticModel.delete_self_from_db()
 
 
@@ -211,5 +257,178 @@ def test_delete_self_non_existent(engine: Engine):
     hero.delete_self_from_db(engine)
 
 
+# BaseDBPydanticModel.add_many()
+
+
+def test_basic_add_many(engine: Engine):
+    heroes = [Hero(name=name) for name in ["Superman", "Batman", "Robin"]]
+    Hero.add_many(engine, heroes)
+    assert all(hero.uid is not None for hero in heroes)
+    assert len({hero.uid for hero in heroes}) == len(heroes)
+    assert all(hero.created_at is not None for hero in heroes)
+    same_ids_filter_exp = Hero.Config.orm_model.uid.in_(
+        [h.uid for h in heroes]
+    )
+    assert Hero.query(engine, filter_expr=same_ids_filter_exp) == heroes
+
+
+def test_add_many_duplicate_commits_nothing(engine: Engine):
+    hero = Hero()
+    hero.add_self_to_db(engine)
+    new_hero = Hero(name="Batman")
+    with pytest.raises(InstanceAlreadyExistsError):
+        Hero.add_many(engine, [new_hero, hero])
+    assert new_hero.uid is None
+    is_batman_filter_exp = Hero.Config.orm_model.name == "Batman"
+    n_batmen = len(Hero.query(engine, filter_expr=is_batman_filter_exp))
+    Hero.add_many(engine, [Hero(name="Batman")])
+    assert len(Hero.query(engine, filter_expr=is_batman_filter_exp)) == (
+        n_batmen + 1
+    )
+
+
+# BaseDBPydanticModel.update_many()
+
+
+def test_basic_update_many(engine: Engine):
+    heroes = [Hero(), Hero()]
+    Hero.add_many(engine, heroes)
+    for hero in heroes:
+        hero.name = "Wonder Woman"
+    Hero.update_many(engine, heroes)
+    for hero in heroes:
+        same_id_filter_exp = Hero.Config.orm_model.uid == hero.uid
+        assert hero.query_one(engine, filter_expr=same_id_filter_exp) == hero
+
+
+@pytest.mark.xfail(raises=DatabaseUpdateFailedError)
+def test_update_many_non_existent(engine: Engine):
+    hero = Hero()
+    hero.add_self_to_db(engine)
+    Hero.update_many(engine, [hero, Hero()])
+
+
+# BaseDBPydanticModel.delete_many()
+
+
+def test_basic_delete_many(engine: Engine):
+    heroes = [Hero(), Hero()]
+    Hero.add_many(engine, heroes)
+    uids_before_delete = [hero.uid for hero in heroes]
+    Hero.delete_many(engine, heroes)
+    same_ids_filter_exp = Hero.Config.orm_model.uid.in_(uids_before_delete)
+    assert Hero.query(engine, filter_expr=same_ids_filter_exp) == []
+    assert all(hero.uid is None for hero in heroes)
+
+
+def test_delete_many_non_existent_commits_nothing(engine: Engine):
+    hero = Hero()
+    hero.add_self_to_db(engine)
+    with pytest.raises(DatabaseDeletionFailedError):
+        Hero.delete_many(engine, [hero, Hero()])
+    same_id_filter_exp = Hero.Config.orm_model.uid == hero.uid
+    assert Hero.query_one(engine, filter_expr=same_id_filter_exp) == hero
+
+
+# db_unit_of_work()
+
+
+def test_unit_of_work_commits_once_at_end(engine: Engine):
+    with db_unit_of_work(engine):
+        hero = Hero(name="Flash")
+        hero.add_self_to_db(engine)
+        hero.name = "Reverse Flash"
+        hero.update_self_in_db(engine)
+        same_id_filter_exp = Hero.Config.orm_model.uid == hero.uid
+        assert hero.query_one(engine, filter_expr=same_id_filter_exp) == hero
+        with Session(
+            engine
+        ) as other_session:  # not yet visible outside the uow
+            assert other_session.get(HeroORM, hero.uid) is None
+    assert hero.query_one(engine, filter_expr=same_id_filter_exp) == hero
+
+
+def test_unit_of_work_rolls_back_on_error(engine: Engine):
+    with pytest.raises(RuntimeError):
+        with db_unit_of_work(engine):
+            hero = Hero(name="Aquaman")
+            hero.add_self_to_db(engine)
+            uid = hero.uid
+            raise RuntimeError
+    same_id_filter_exp = Hero.Config.orm_model.uid == uid
+    assert Hero.query_one(engine, filter_expr=same_id_filter_exp) is None
+    assert hero.uid is None and hero.created_at is None
+
+
+def test_add_can_be_retried_after_unit_of_work_rolls_back(engine: Engine):
+    hero = Hero(name="Flash")
+    with pytest.raises(RuntimeError):
+        with db_unit_of_work(engine):
+            hero.add_self_to_db(engine)
+            raise RuntimeError
+    # i.e. takes the uid that the rolled back addition was given
+    Hero(name="Zatanna").add_self_to_db(engine)
+    hero.add_self_to_db(engine)
+    same_id_filter_exp = Hero.Config.orm_model.uid == hero.uid
+    assert Hero.query_one(engine, filter_expr=same_id_filter_exp) == hero
+
+
+def test_nested_unit_of_work_joins_outer(engine: Engine):
+    with db_unit_of_work(engine) as outer_uow:
+        with db_unit_of_work(engine) as inner_uow:
+            assert inner_uow is outer_uow
+
+
+def test_add_duplicate_within_unit_of_work(engine: Engine):
+    hero = Hero()
+    hero.add_self_to_db(engine)
+    with db_unit_of_work(engine):
+        with pytest.raises(InstanceAlreadyExistsError):
+            hero.add_self_to_db(engine)
+        hero.name = "Cyborg"
+        hero.update_self_in_db(engine)
+    same_id_filter_exp = Hero.Config.orm_model.uid == hero.uid
+    assert (
+        Hero.query_one(engine, filter_expr=same_id_filter_exp).name == "Cyborg"
+    )
+
+
+# Async counterparts (aquery, aadd, etc.)
+
+
+def test_async_add_update_query_delete(engine: Engine):
+    async def roundtrip() -> None:
+        hero = Hero(name="Green Lantern")
+        await hero.aadd(engine)
+        hero.name = "Sinestro"
+        await hero.aupdate(engine)
+        same_id_filter_exp = Hero.Config.orm_model.uid == hero.uid
+        assert await Hero.aquery_one(engine, same_id_filter_exp) == hero
+        assert await Hero.aquery(engine, same_id_filter_exp) == [hero]
+        await hero.adelete(engine)
+        assert await Hero.aquery_one(engine, same_id_filter_exp) is None
+
+    asyncio.run(roundtrip())
+
+
+def test_async_methods_run_off_the_event_loop_thread(engine: Engine):
+    async def get_query_thread() -> threading.Thread:
+        query_threads = []
+        original_query = Hero.query.__func__
+
+        def recording_query(cls, *args, **kwargs):
+            query_threads.append(threading.current_thread())
+            return original_query(cls, *args, **kwargs)
+
+        Hero.query = classmethod(recording_query)
+        try:
+            await Hero.aquery(engine)
+        finally:
+            del Hero.query
+        return query_threads[0]
+
+    assert asyncio.run(get_query_thread()) is not threading.current_thread()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-rx"])
@@ -0,0 +1,28 @@
+from sqlalchemy import text
+
+from routine_butler.models.engine import (
+    SQLITE_ENGINE_PROFILES,
+    checkpoint_wal,
+    create_sqlite_engine,
+)
+
+
+def test_create_sqlite_engine_applies_pragmas(tmp_path):
+    profile = SQLITE_ENGINE_PROFILES["performance"]
+    engine = create_sqlite_engine(
+        f"sqlite:///{tmp_path / 'db.sqlite'}", profile
+    )
+    with engine.connect() as connection:
+        assert (
+            connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        )
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+        cache_size = connection.execute(text("PRAGMA cache_size")).scalar()
+        assert cache_size == profile.cache_size
+    checkpoint_wal(engine)
+    engine.dispose()
+
+
+def test_default_profile_sets_no_pragmas():
+    assert SQLITE_ENGINE_PROFILES["default"].pragmas == {}
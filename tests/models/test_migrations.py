@@ -0,0 +1,95 @@
+import datetime
+
+from sqlalchemy import create_engine, inspect, text
+
+from routine_butler.models.base import SQLAlchemyBase
+from routine_butler.models.migrations import (
+    MIGRATIONS,
+    get_schema_version,
+    run_migrations,
+)
+from routine_butler.models.program_run import ProgramRun
+
+
+def test_run_migrations_backfills_legacy_db(tmp_path):
+    legacy_engine = create_engine(f"sqlite:///{tmp_path / 'legacy.sqlite'}")
+    with legacy_engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE program_runs (uid INTEGER PRIMARY KEY, "
+                "created_at DATETIME, updated_at DATETIME, program_title VARCHAR, "
+                "plugin_type VARCHAR, plugin_dict JSON, routine_title VARCHAR, "
+                "start_time DATETIME, end_time DATETIME, run_data JSON, "
+                "user_uid INTEGER)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO program_runs VALUES (1, :time, :time, 'Test Program', "
+                "'YoutubeVideo', :plugin_dict, 'Test Routine', :time, :time, "
+                ":run_data, 1)"
+            ),
+            {
+                "time": datetime.datetime(2023, 1, 1),
+                "plugin_dict": '{"mode": "series", "path_or_id": "a-600"}',
+                "run_data": '{"video_id": "b", "reported_success": true}',
+            },
+        )
+    SQLAlchemyBase.metadata.create_all(legacy_engine)  # as initialize_db does
+    applied_migrations = run_migrations(legacy_engine)
+    assert [m.version for m in applied_migrations] == [
+        m.version for m in MIGRATIONS
+    ]
+    run = ProgramRun.latest_matching(legacy_engine, "YoutubeVideo", "a-600")
+    assert run is not None and run.run_data["video_id"] == "b"
+
+
+def test_run_migrations_applies_each_migration_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.sqlite'}")
+    SQLAlchemyBase.metadata.create_all(engine)
+    assert get_schema_version(engine) == 0
+    run_migrations(engine)
+    assert get_schema_version(engine) == max(m.version for m in MIGRATIONS)
+    assert run_migrations(engine) == []
+
+
+def test_run_migrations_creates_per_user_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'indexes.sqlite'}")
+    SQLAlchemyBase.metadata.create_all(engine)
+    with engine.begin() as connection:  # simulate a db predating the indexes
+        for index_name in (
+            "ix_routines_user_uid",
+            "ix_programs_user_uid_title",
+            "ix_program_runs_user_history",
+        ):
+            connection.execute(text(f"DROP INDEX {index_name}"))
+    run_migrations(engine)
+    inspector = inspect(engine)
+    index_names = {
+        index["name"]
+        for table_name in ("routines", "programs", "program_runs")
+        for index in inspector.get_indexes(table_name)
+    }
+    assert {
+        "ix_routines_user_uid",
+        "ix_programs_user_uid_title",
+        "ix_program_runs_user_history",
+        "ix_program_runs_latest_matching",
+    } <= index_names
+
+
+def test_each_migration_only_creates_its_own_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'frozen.sqlite'}")
+    SQLAlchemyBase.metadata.create_all(engine)
+    with engine.begin() as connection:  # simulate a db predating the indexes
+        for index_name in (
+            "ix_program_runs_latest_matching",
+            "ix_program_runs_user_history",
+        ):
+            connection.execute(text(f"DROP INDEX {index_name}"))
+        MIGRATIONS[0].apply(connection)
+    index_names = {
+        index["name"] for index in inspect(engine).get_indexes("program_runs")
+    }
+    assert "ix_program_runs_latest_matching" in index_names
+    assert "ix_program_runs_user_history" not in index_names
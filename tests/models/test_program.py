@@ -0,0 +1,45 @@
+import pytest
+
+from routine_butler.models.program import Program, plugin_cache
+from routine_butler.state import state
+
+
+class CountingPlugin:
+    """Stand-in plugin that counts its instantiations."""
+
+    n_instantiations = 0
+
+    def __init__(self, seconds: float):
+        CountingPlugin.n_instantiations += 1
+        self.seconds = seconds
+
+    def estimate_duration_in_seconds(self) -> float:
+        return self.seconds
+
+
+@pytest.fixture(autouse=True)
+def plugins(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(state, "_plugins", {"CountingPlugin": CountingPlugin})
+    plugin_cache.clear()
+    CountingPlugin.n_instantiations = 0
+
+
+def make_program(seconds: float) -> Program:
+    return Program(
+        plugin_type="CountingPlugin", plugin_dict={"seconds": seconds}
+    )
+
+
+def test_plugin_memoized_until_plugin_dict_set():
+    program = make_program(60)
+    assert program.plugin is program.plugin
+    assert program.estimate_duration_in_seconds() == 60
+    program.plugin_dict = {"seconds": 120}
+    assert program.estimate_duration_in_seconds() == 120
+    assert CountingPlugin.n_instantiations == 2
+
+
+def test_identical_programs_share_plugin():
+    assert make_program(60).plugin is make_program(60).plugin
+    assert make_program(60).plugin is not make_program(90).plugin
+    assert CountingPlugin.n_instantiations == 2
@@ -0,0 +1,74 @@
+import datetime
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from routine_butler.models.program_run import ProgramRun
+
+TEST_PLUGIN_TYPE = "YoutubeVideo"
+TEST_PATH_KEY = "test_series-600"
+
+
+def make_program_run(
+    end_time: datetime.datetime,
+    reported_success: bool = True,
+    video_id: str = "QWlCcfSqfKY",
+    path_or_id: str = TEST_PATH_KEY,
+) -> ProgramRun:
+    return ProgramRun(
+        program_title="Test Program",
+        plugin_type=TEST_PLUGIN_TYPE,
+        plugin_dict={"mode": "series", "path_or_id": path_or_id},
+        routine_title="Test Routine",
+        start_time=end_time - datetime.timedelta(minutes=10),
+        end_time=end_time,
+        run_data={"video_id": video_id, "reported_success": reported_success},
+        user_uid=1,
+    )
+
+
+@pytest.fixture(scope="module")
+def program_runs(engine: Engine) -> list[ProgramRun]:
+    base_time = datetime.datetime(2023, 1, 1)
+    runs = [
+        make_program_run(base_time, video_id="first_video"),
+        make_program_run(base_time + datetime.timedelta(days=2), False),
+        make_program_run(
+            base_time + datetime.timedelta(days=1), video_id="latest_video"
+        ),
+        make_program_run(
+            base_time + datetime.timedelta(days=3), path_or_id="other-600"
+        ),
+    ]
+    ProgramRun.add_many(engine, runs)
+    yield runs
+    ProgramRun.delete_many(engine, runs)
+
+
+def test_denormalized_lookup_fields():
+    run = make_program_run(datetime.datetime.now(), reported_success=False)
+    assert run.path_key == TEST_PATH_KEY
+    assert run.reported_success is False
+
+
+def test_latest_matching(engine: Engine, program_runs: list[ProgramRun]):
+    run = ProgramRun.latest_matching(engine, TEST_PLUGIN_TYPE, TEST_PATH_KEY)
+    assert run.run_data["video_id"] == "latest_video"
+
+
+def test_latest_matching_any_success(
+    engine: Engine, program_runs: list[ProgramRun]
+):
+    run = ProgramRun.latest_matching(
+        engine, TEST_PLUGIN_TYPE, TEST_PATH_KEY, reported_success=None
+    )
+    assert run == program_runs[1]
+
+
+def test_latest_matching_no_matches(
+    engine: Engine, program_runs: list[ProgramRun]
+):
+    assert (
+        ProgramRun.latest_matching(engine, TEST_PLUGIN_TYPE, "nonexistent")
+        is None
+    )
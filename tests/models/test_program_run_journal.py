@@ -0,0 +1,124 @@
+import datetime
+import os
+import threading
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from routine_butler.models.base import submit_to_db_worker
+from routine_butler.models.program_run import ProgramRun
+from routine_butler.models.program_run_journal import (
+    MAX_N_FLUSH_ATTEMPTS,
+    ProgramRunJournal,
+)
+
+TEST_PROGRAM_TITLE = "Journaled Program"
+
+
+def make_program_run(end_time: datetime.datetime) -> ProgramRun:
+    return ProgramRun(
+        program_title=TEST_PROGRAM_TITLE,
+        plugin_type="Flashcards",
+        plugin_dict={"path": "flashcards/test"},
+        routine_title="Test Routine",
+        start_time=end_time - datetime.timedelta(minutes=5),
+        end_time=end_time,
+        run_data={"reported_success": True},
+        user_uid=2,
+    )
+
+
+def query_journaled_runs(engine: Engine) -> list[ProgramRun]:
+    filter_expr = (
+        ProgramRun.Config.orm_model.program_title == TEST_PROGRAM_TITLE
+    )
+    return ProgramRun.query(engine, filter_expr=filter_expr)
+
+
+@pytest.fixture
+def journal(engine: Engine, tmp_path) -> ProgramRunJournal:
+    yield ProgramRunJournal(str(tmp_path / "journal.jsonl"))
+    ProgramRun.delete_many(engine, query_journaled_runs(engine))
+
+
+def test_append_defers_db_write_until_flush(
+    engine: Engine, journal: ProgramRunJournal
+):
+    base_time = datetime.datetime(2023, 6, 1)
+    for i in range(3):
+        journal.append(
+            make_program_run(base_time + datetime.timedelta(hours=i))
+        )
+    assert journal.n_pending == 3
+    assert query_journaled_runs(engine) == []
+    assert journal.flush(engine) == 3
+    assert journal.n_pending == 0
+    assert len(query_journaled_runs(engine)) == 3
+    assert journal.flush(engine) == 0
+
+
+def test_replay_after_restart(engine: Engine, journal: ProgramRunJournal):
+    base_time = datetime.datetime(2023, 7, 1)
+    journal.append(make_program_run(base_time))
+    journal.append(make_program_run(base_time + datetime.timedelta(hours=1)))
+    with open(journal.path, "a") as f:
+        f.write('{"program_title": "torn')  # e.g. power loss mid-append
+    restarted_journal = ProgramRunJournal(journal.path)
+    assert restarted_journal.replay(engine) == 2
+    assert len(query_journaled_runs(engine)) == 2
+    assert ProgramRunJournal(journal.path).replay(engine) == 0
+
+
+def test_replay_skips_runs_already_in_db(
+    engine: Engine, journal: ProgramRunJournal
+):
+    run = make_program_run(datetime.datetime(2023, 8, 1))
+    journal.append(run)
+    ProgramRun.add_many(engine, [run])  # i.e. flushed but journal not cleared
+    assert ProgramRunJournal(journal.path).replay(engine) == 0
+    assert len(query_journaled_runs(engine)) == 1
+
+
+def test_append_fsyncs_on_db_worker_thread(
+    journal: ProgramRunJournal, monkeypatch
+):
+    fsync_thread_names = []
+
+    def fsync(fd: int) -> None:
+        fsync_thread_names.append(threading.current_thread().name)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    run = make_program_run(datetime.datetime(2023, 9, 1))
+    journal.append(run)
+    submit_to_db_worker(lambda: None).result()  # i.e. wait for the fsync
+    assert journal.get_pending() == [run]
+    assert len(fsync_thread_names) == 1
+    assert fsync_thread_names[0].startswith("db_worker")
+
+
+def test_run_that_keeps_failing_to_flush_is_quarantined(
+    engine: Engine, journal: ProgramRunJournal, monkeypatch
+):
+    to_orm = ProgramRun._to_orm
+
+    def failing_to_orm(run: ProgramRun):
+        if run.program_title == "Poisoned Program":
+            raise ValueError("unserializable")
+        return to_orm(run)
+
+    monkeypatch.setattr(ProgramRun, "_to_orm", failing_to_orm)
+    base_time = datetime.datetime(2023, 10, 1)
+    poisoned_run = make_program_run(base_time)
+    poisoned_run.program_title = "Poisoned Program"
+    journal.append(poisoned_run)
+    journal.append(make_program_run(base_time + datetime.timedelta(hours=1)))
+
+    assert journal.flush(engine) == 1
+    assert journal.get_pending() == [poisoned_run]
+    for _ in range(MAX_N_FLUSH_ATTEMPTS - 1):
+        assert journal.flush(engine) == 0
+    assert journal.n_pending == 0
+    assert ProgramRunJournal(journal.path).replay(engine) == 0
+    assert len(query_journaled_runs(engine)) == 1
+    with open(journal.quarantine_path, "r") as f:
+        assert "Poisoned Program" in f.read()
@@ -5,10 +5,17 @@ from routine_butler.plugins._flashcards.calculations import (
     THRESHOLD_PROB_MIN_ASYMPTOTE,
     binomial_cdf,
     binomial_pdf,
+    draw_collections,
     find_binomial_distribution_threshold_value,
+    get_expected_n_draws,
     get_n_to_cache,
+    get_seconds_cap,
+    get_selection_probabilities,
     get_threshold_probability,
 )
+from routine_butler.plugins._flashcards.schema import (
+    FlashcardCollectionMetadata,
+)
 
 
 def test_threshold_probability_min_asymptote_at_one_million():
@@ -137,3 +144,41 @@ def test_get_n_to_cache(case: dict):
         target_seconds=case["target_seconds"],
     )
     assert calculated == case["expected_n_to_cache"]
+
+
+PLANNING_TEST_COLLECTIONS = [
+    FlashcardCollectionMetadata.from_path("flashcards/spanish-3-20"),
+    FlashcardCollectionMetadata.from_path("flashcards/physics-iii-1-60"),
+]
+
+
+def test_collection_metadata_is_parsed_from_path():
+    assert PLANNING_TEST_COLLECTIONS[1] == FlashcardCollectionMetadata(
+        "flashcards/physics-iii-1-60", "physics-iii", 1, 60
+    )
+    with pytest.raises(ValueError):
+        FlashcardCollectionMetadata.from_path("flashcards/spanish")
+
+
+def test_selection_probabilities_and_seconds_cap():
+    probs = get_selection_probabilities(PLANNING_TEST_COLLECTIONS)
+    assert probs == [0.75, 0.25]
+    seconds_cap = get_seconds_cap(PLANNING_TEST_COLLECTIONS, probs, 300)
+    assert seconds_cap == pytest.approx(300 - (0.75 * 20 + 0.25 * 60))
+
+
+def test_draws_reach_seconds_cap():
+    probs = get_selection_probabilities(PLANNING_TEST_COLLECTIONS)
+    seconds_cap = get_seconds_cap(PLANNING_TEST_COLLECTIONS, probs, 300)
+    for _ in range(100):
+        idxs = draw_collections(PLANNING_TEST_COLLECTIONS, probs, 300)
+        secs = [
+            PLANNING_TEST_COLLECTIONS[i].avg_seconds_per_card for i in idxs
+        ]
+        assert sum(secs[:-1]) < seconds_cap <= sum(secs)
+
+
+def test_expected_n_draws():
+    probs = get_selection_probabilities(PLANNING_TEST_COLLECTIONS)
+    expected = get_expected_n_draws(PLANNING_TEST_COLLECTIONS, probs, 300)
+    assert expected == pytest.approx([0.75 * 9, 0.25 * 9])
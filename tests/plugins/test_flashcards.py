@@ -0,0 +1,124 @@
+import asyncio
+import contextlib
+import time
+
+import pytest
+
+from routine_butler.plugins import flashcards
+from routine_butler.plugins._flashcards import schema
+from routine_butler.plugins.flashcards import (
+    MAX_N_CONCURRENT_COLLECTION_LOADS,
+    FlashcardsGui,
+)
+
+FAILING_COLLECTION_PATH = "flashcards/failing-1-10"
+COLLECTION_PATHS = [f"flashcards/collection_{i}-1-10" for i in range(19)] + [
+    FAILING_COLLECTION_PATH
+]
+
+
+class FakeDataframeLike:
+    """Records the peak number of concurrent get_all_data calls (across instances)."""
+
+    n_concurrent = 0
+    peak_n_concurrent = 0
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def get_all_data(self) -> list:
+        cls = FakeDataframeLike
+        cls.n_concurrent += 1
+        cls.peak_n_concurrent = max(cls.peak_n_concurrent, cls.n_concurrent)
+        try:
+            await asyncio.sleep(0.01)
+            if self.path == FAILING_COLLECTION_PATH:
+                raise ConnectionError("offline")
+            return [["front", "back"]]
+        finally:
+            cls.n_concurrent -= 1
+
+
+class FakeTimer:
+    def __init__(self):
+        self.is_active = True
+
+    def deactivate(self) -> None:
+        self.is_active = False
+
+
+def make_gui(target_minutes: int) -> FlashcardsGui:
+    """Makes a FlashcardsGui w/o building its UI."""
+    gui = FlashcardsGui.__new__(FlashcardsGui)
+    gui.target_minutes, gui.path = target_minutes, ""
+    gui.collection_paths, gui.collections, gui.flashcards_queue = [], [], []
+    gui.n_collections_loaded = gui.n_collections_failed = 0
+    gui.queue_generation_has_completed = False
+    gui.start_time = time.time()
+    gui.frame = contextlib.nullcontext()
+    gui.recurring_update_while_awaiting_queue = FakeTimer()
+    gui.n_completions = 0
+
+    def on_complete():
+        gui.n_completions += 1
+
+    gui.on_complete = on_complete
+    return gui
+
+
+def test_collections_load_concurrently_despite_a_failure(monkeypatch):
+    async def get_paths_of_collections_to_load(path: str) -> list:
+        return COLLECTION_PATHS
+
+    monkeypatch.setattr(
+        flashcards,
+        "get_paths_of_collections_to_load",
+        get_paths_of_collections_to_load,
+    )
+    monkeypatch.setattr(schema, "DATAFRAME_LIKE", FakeDataframeLike)
+    # i.e. so many draws that every collection is (all but certainly) drawn
+    gui = make_gui(target_minutes=60)
+
+    asyncio.run(gui._get_flashcards_queue())
+
+    assert 1 < FakeDataframeLike.peak_n_concurrent
+    assert (
+        FakeDataframeLike.peak_n_concurrent
+        <= MAX_N_CONCURRENT_COLLECTION_LOADS
+    )
+    assert sorted(gui.collection_paths) == sorted(COLLECTION_PATHS)
+    assert gui.n_collections_failed == 1
+    assert gui.n_collections_loaded == len(COLLECTION_PATHS) - 1
+    assert gui.queue_generation_has_completed
+    assert gui.flashcards_queue
+    assert all(
+        card.collection.name != "failing" for card in gui.flashcards_queue
+    )
+
+
+@pytest.mark.parametrize(
+    "collection_paths",
+    [["flashcards/unparseable"], [FAILING_COLLECTION_PATH]],
+)
+def test_completes_w_a_notification_when_there_are_no_cards(
+    monkeypatch, collection_paths
+):
+    async def get_paths_of_collections_to_load(path: str) -> list:
+        return collection_paths
+
+    monkeypatch.setattr(
+        flashcards,
+        "get_paths_of_collections_to_load",
+        get_paths_of_collections_to_load,
+    )
+    monkeypatch.setattr(schema, "DATAFRAME_LIKE", FakeDataframeLike)
+    notifications = []
+    monkeypatch.setattr(flashcards.ui, "notify", notifications.append)
+    gui = make_gui(target_minutes=5)
+
+    asyncio.run(gui._get_flashcards_queue())
+
+    assert gui.n_completions == 1
+    assert len(notifications) == 1
+    assert not gui.recurring_update_while_awaiting_queue.is_active
+    assert not gui.queue_generation_has_completed
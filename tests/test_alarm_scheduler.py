@@ -0,0 +1,116 @@
+import asyncio
+import datetime
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from routine_butler.alarm_scheduler import AlarmScheduler
+from routine_butler.models.alarm import Alarm
+from routine_butler.models.routine import Routine
+from routine_butler.models.user import User
+
+TEST_USER_USERNAME = "test_alarm_scheduler_user"
+
+
+@pytest.fixture(scope="module")
+def user(engine: Engine) -> User:
+    user = User(username=TEST_USER_USERNAME)
+    user.add_self_to_db(engine)
+    yield user
+    user.delete_self_from_db(engine)
+
+
+@pytest.fixture
+def scheduler(user: User) -> AlarmScheduler:
+    scheduler = AlarmScheduler()
+    scheduler.rebuild(user.uid, [])
+    return scheduler
+
+
+def make_routine(*time_strs: str, is_enabled: bool = True) -> Routine:
+    alarms = [Alarm(time_str=t, is_enabled=is_enabled) for t in time_strs]
+    return Routine(title=f"Routine w/ {time_strs}", alarms=alarms)
+
+
+def test_peek_returns_soonest_enabled_alarm(
+    engine: Engine, user: User, scheduler: AlarmScheduler
+):
+    in_2_hours = (
+        datetime.datetime.now() + datetime.timedelta(hours=2)
+    ).strftime("%H:%M")
+    in_1_hour = (
+        datetime.datetime.now() + datetime.timedelta(hours=1)
+    ).strftime("%H:%M")
+    later_routine = make_routine(in_2_hours)
+    sooner_routine = make_routine(in_1_hour)
+    user.add_routine(engine, later_routine)
+    user.add_routine(engine, sooner_routine)
+    user.add_routine(engine, make_routine("00:00", is_enabled=False))
+    alarm, routine = scheduler.peek()
+    assert routine == sooner_routine and alarm.time_str == in_1_hour
+    sooner_routine.delete_self_from_db(engine)  # rebuilds incrementally
+    assert scheduler.peek()[1] == later_routine
+    later_routine.alarms[0].is_enabled = False
+    later_routine.update_self_in_db(engine)
+    assert scheduler.peek() is None
+
+
+def test_fire_due_notifies_subscribers_and_reschedules(
+    engine: Engine, user: User, scheduler: AlarmScheduler
+):
+    routine = make_routine("07:30")
+    user.add_routine(engine, routine)
+    fire_datetime = routine.alarms[0].get_next_ring_datetime()
+    rung = []
+    unsubscribe = scheduler.subscribe(lambda a, r: rung.append((a, r)))
+
+    assert (
+        scheduler.fire_due(fire_datetime - datetime.timedelta(seconds=1)) == 0
+    )
+    assert scheduler.fire_due(fire_datetime) == 1
+    assert rung == [(routine.alarms[0], routine)]
+    seconds_until_next_fire = scheduler.seconds_until_next_fire(fire_datetime)
+    assert (
+        seconds_until_next_fire == datetime.timedelta(days=1).total_seconds()
+    )
+
+    unsubscribe()
+    scheduler.fire_due(fire_datetime + datetime.timedelta(days=1))
+    assert len(rung) == 1
+    routine.delete_self_from_db(engine)
+
+
+def test_other_users_routines_are_ignored(
+    engine: Engine, scheduler: AlarmScheduler
+):
+    other_users_routine = make_routine("08:00")
+    other_users_routine.user_uid = -1
+    other_users_routine.add_self_to_db(engine)
+    assert scheduler.peek() is None
+    other_users_routine.delete_self_from_db(engine)
+
+
+def test_reschedule_skips_rings_jumped_over_by_a_clock_change(
+    engine: Engine, user: User, scheduler: AlarmScheduler
+):
+    routine = make_routine("07:30")
+    user.add_routine(engine, routine)
+    fire_datetime = routine.alarms[0].get_next_ring_datetime()
+    after_clock_change = fire_datetime + datetime.timedelta(hours=2)
+    scheduler.reschedule(after_clock_change)
+    assert scheduler.fire_due(after_clock_change) == 0
+    assert scheduler.seconds_until_next_fire(after_clock_change) == (
+        datetime.timedelta(hours=22).total_seconds()
+    )
+    routine.delete_self_from_db(engine)
+
+
+def test_async_writes_patch_the_schedule_from_the_db_worker(
+    engine: Engine, user: User, scheduler: AlarmScheduler
+):
+    routine = make_routine("07:30")
+    routine.user_uid = user.uid
+    asyncio.run(routine.aadd(engine))
+    assert scheduler.peek()[1] == routine
+    asyncio.run(routine.adelete(engine))
+    assert scheduler.peek() is None
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from routine_butler.utils.dataframe_like import (
+    CachingDataframeLike,
+    DataframeLikeCache,
+)
+
+
+class FakeSheet:
+    """A source dataframe-like that counts downloads (i.e. get_all_data calls)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = [["front", "back"]]
+        self.version = 1
+        self.is_offline = False
+        self.n_downloads = 0
+
+    async def get_version(self) -> str:
+        if self.is_offline:
+            raise ConnectionError("offline")
+        return f"file_id:{self.version}"
+
+    async def get_all_data(self) -> list:
+        self.n_downloads += 1
+        return self.data
+
+
+@pytest.fixture
+def cache(tmp_path) -> DataframeLikeCache:
+    return DataframeLikeCache(str(tmp_path / "cache"))
+
+
+def make_df_like(cache: DataframeLikeCache, source: FakeSheet):
+    return CachingDataframeLike(source.path, lambda _: source, cache)
+
+
+def test_unchanged_data_is_served_from_the_cache(cache):
+    source = FakeSheet("flashcards/spanish-3-10")
+    assert asyncio.run(make_df_like(cache, source).get_all_data()) == [
+        ["front", "back"]
+    ]
+    # i.e. loaded again (e.g. on the next run) by a fresh dataframe-like
+    reloaded = DataframeLikeCache(cache.dir_path)
+    data = asyncio.run(make_df_like(reloaded, source).get_all_data())
+    assert data == [["front", "back"]]
+    assert source.n_downloads == 1 and reloaded.hits == 1
+
+
+def test_changed_data_is_downloaded_again(cache):
+    source = FakeSheet("flashcards/spanish-3-10")
+    df_like = make_df_like(cache, source)
+    asyncio.run(df_like.get_all_data())
+    source.data, source.version = [["new front", "new back"]], 2
+    assert asyncio.run(df_like.get_all_data()) == [["new front", "new back"]]
+    assert source.n_downloads == 2 and cache.misses == 2
+
+
+def test_stale_data_is_served_when_offline(cache):
+    source = FakeSheet("flashcards/spanish-3-10")
+    df_like = make_df_like(cache, source)
+    source.is_offline = True
+    with pytest.raises(ConnectionError):
+        asyncio.run(df_like.get_all_data())
+
+    source.is_offline = False
+    asyncio.run(df_like.get_all_data())
+    source.is_offline = True
+    assert asyncio.run(df_like.get_all_data()) == [["front", "back"]]
+    assert source.n_downloads == 1
+
+
+def test_written_cells_keep_the_cache_current(cache):
+    source = FakeSheet("flashcards/spanish-3-10")
+
+    async def batch_update_cells(cells: dict) -> None:
+        source.data = [["front", "back", "7"]]
+        source.version += 1
+
+    source.batch_update_cells = batch_update_cells
+    df_like = make_df_like(cache, source)
+    asyncio.run(df_like.get_all_data())
+    asyncio.run(df_like.batch_update_cells({(0, 2): 7}))
+    assert asyncio.run(df_like.get_all_data()) == [["front", "back", "7"]]
+    assert source.n_downloads == 1
+
+    source.version += 1  # i.e. changed elsewhere, so the cache is now stale
+    asyncio.run(df_like.batch_update_cells({(0, 2): 8}))
+    assert asyncio.run(df_like.get_all_data()) == [["front", "back", "7"]]
+    assert source.n_downloads == 2
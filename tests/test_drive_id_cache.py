@@ -0,0 +1,120 @@
+import asyncio
+import re
+
+import pytest
+
+from routine_butler.utils.google import drive_id_cache
+from routine_butler.utils.google.drive_folder_manager import DriveFolderManager
+from routine_butler.utils.google.drive_id_cache import NOT_FOUND, DriveIdCache
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+
+class FakeDriveService:
+    """Answers the folder queries of DriveFolderManager from a dict of (parent id,
+    name) to folder id, counting the list requests made."""
+
+    def __init__(self, folders: dict):
+        self.folders = folders
+        self.n_list_calls = 0
+
+    def files(self):
+        return self
+
+    def list(self, q: str, **_):
+        self.n_list_calls += 1
+        name = re.search(r"name='([^']*)'", q).group(1)
+        parent = re.search(r"'([^']*)' in parents", q)
+        key = (parent.group(1) if parent else None, name)
+        files = []
+        if key in self.folders:
+            files.append(
+                {"id": self.folders[key], "mimeType": FOLDER_MIME_TYPE}
+            )
+        return FakeRequest({"files": files})
+
+
+class FakeRequest:
+    def __init__(self, resp: dict):
+        self.resp = resp
+
+    def execute(self) -> dict:
+        return self.resp
+
+
+@pytest.fixture
+def service() -> FakeDriveService:
+    return FakeDriveService(
+        {(None, "root"): "r", ("r", "a"): "a1", ("a1", "b"): "b1"}
+    )
+
+
+def test_entries_expire_and_persist(tmp_path, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(drive_id_cache.time, "time", lambda: now)
+    cache = DriveIdCache(str(tmp_path / "cache.json"))
+    cache.set("folder", "root/a/", "a1")
+    cache.set("spreadsheet", "root/a/missing", None)
+
+    reloaded = DriveIdCache(str(tmp_path / "cache.json"))
+    assert reloaded.get("folder", "root//a") == "a1"
+    assert reloaded.get("spreadsheet", "root/a/missing") == NOT_FOUND
+    now += drive_id_cache.NEGATIVE_TTL_SECONDS + 1
+    assert reloaded.get("spreadsheet", "root/a/missing") is None
+    assert reloaded.get("folder", "root/a") == "a1"
+    assert (reloaded.hits, reloaded.misses) == (3, 1)
+
+
+def test_invalidate_drops_nested_paths_only():
+    cache = DriveIdCache()
+    cache.set("folder", "root/a", "a1")
+    cache.set("spreadsheet", "root/a/sheet", "s1")
+    cache.set("folder", "root/ab", "ab1")
+    cache.invalidate("root/a")
+    assert cache.get("folder", "root/a") is None
+    assert cache.get("spreadsheet", "root/a/sheet") is None
+    assert cache.get("folder", "root/ab") == "ab1"
+
+
+def test_repeat_resolution_makes_no_requests(service):
+    cache = DriveIdCache()
+    manager = DriveFolderManager("root", cache)
+    assert asyncio.run(manager.get_folder_id_from_path(service, "a/b")) == "b1"
+    assert service.n_list_calls == 3
+
+    # e.g. a new GoogleSheet w/ its own DriveFolderManager
+    manager = DriveFolderManager("root", cache)
+    assert asyncio.run(manager.get_folder_id_from_path(service, "a/b")) == "b1"
+    assert service.n_list_calls == 3
+
+
+def test_missing_folders_are_negatively_cached(service):
+    manager = DriveFolderManager("root", DriveIdCache())
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            asyncio.run(manager.get_folder_id_from_path(service, "a/missing"))
+    assert service.n_list_calls == 3
+
+
+def test_stale_cached_ids_are_re_resolved(service):
+    cache = DriveIdCache()
+    manager = DriveFolderManager("root", cache)
+    asyncio.run(manager.get_folder_id_from_path(service, "a/b"))
+    # i.e. folder 'a' was deleted & recreated w/ a new subfolder 'c'
+    service.folders = {
+        (None, "root"): "r",
+        ("r", "a"): "a2",
+        ("a2", "c"): "c2",
+    }
+    assert asyncio.run(manager.get_folder_id_from_path(service, "a/c")) == "c2"
+    assert cache.get("folder", "root/a") == "a2"
+    assert cache.get("folder", "root/a/b") is None
+
+
+def test_stale_cached_root_id_is_re_resolved(service):
+    cache = DriveIdCache()
+    cache.set("folder", "root", "r_deleted")
+    manager = DriveFolderManager("root", cache)
+    assert asyncio.run(manager.get_folder_id_from_path(service, "a")) == "a1"
+    assert cache.get("folder", "root") == "r"
+    assert cache.get("folder", "root/a") == "a1"
@@ -0,0 +1,96 @@
+import asyncio
+import re
+
+from routine_butler.utils.cloud_storage_bucket import GoogleDriveFolder
+from routine_butler.utils.cloud_storage_bucket import (
+    google_drive_folder as gdf,
+)
+from routine_butler.utils.google.drive_id_cache import DriveIdCache
+
+FOLDER = gdf.FOLDER_MIME_TYPE
+SHEET = "application/vnd.google-apps.spreadsheet"
+
+
+class FakeDriveService:
+    """Answers `'<id>' in parents (or ...)` queries from a list of files, w/ at most
+    page_size files per page, counting the list requests made."""
+
+    def __init__(self, files: list, page_size: int):
+        self.all_files = files
+        self.page_size = page_size
+        self.n_list_calls = 0
+
+    def files(self):
+        return self
+
+    def list(self, q: str, pageToken=None, **_):
+        self.n_list_calls += 1
+        parent_ids = set(re.findall(r"'([^']*)' in parents", q))
+        matches = [f for f in self.all_files if parent_ids & set(f["parents"])]
+        start = int(pageToken or 0)
+        end = start + self.page_size
+        resp = {"files": matches[start:end]}
+        if end < len(matches):
+            resp["nextPageToken"] = str(end)
+        return FakeRequest(resp)
+
+
+class FakeRequest:
+    def __init__(self, resp: dict):
+        self.resp = resp
+
+    def execute(self) -> dict:
+        return self.resp
+
+
+class FakeCredentialsManager:
+    def __init__(self, service: FakeDriveService):
+        self.service_pool = self
+        self.service = service
+
+    async def get_service(self, *_) -> FakeDriveService:
+        return self.service
+
+
+def file(id_: str, name: str, parent_id: str, mime_type: str = SHEET) -> dict:
+    return {
+        "id": id_,
+        "name": name,
+        "mimeType": mime_type,
+        "parents": [parent_id],
+    }
+
+
+def test_walk_lists_the_tree_w_one_paged_query_per_level():
+    service = FakeDriveService(
+        [
+            file("d1", "spanish", "root", FOLDER),
+            file("d2", "verbs", "d1", FOLDER),
+            file("d3", "empty", "root", FOLDER),
+            file("s1", "nouns-1", "d1"),
+            file("s2", "irregular-1", "d2"),
+            file("s3", "regular-1", "d2"),
+            file("s4", "misc-1", "root"),
+        ],
+        page_size=2,
+    )
+    id_cache = DriveIdCache()
+    id_cache.set("folder", "flashcards", "root")
+    bucket = GoogleDriveFolder(
+        "flashcards", FakeCredentialsManager(service), id_cache
+    )
+
+    paths = asyncio.run(bucket.walk())
+
+    assert sorted(paths) == [
+        "misc-1",
+        "spanish/nouns-1",
+        "spanish/verbs/irregular-1",
+        "spanish/verbs/regular-1",
+    ]
+    # i.e. 2 pages for the root's level & 1 for each of the 2 levels below it
+    assert service.n_list_calls == 4
+    assert sorted(asyncio.run(bucket.walk("spanish/verbs"))) == [
+        "spanish/verbs/irregular-1",
+        "spanish/verbs/regular-1",
+    ]
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import time
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from routine_butler.utils.google import request_executor
+from routine_butler.utils.google.request_executor import (
+    execute_request,
+    is_retryable_error,
+)
+
+TICK_SECONDS = 0.01
+
+
+class FakeRequest:
+    """A request whose (blocking) execute takes `seconds` & fails w/ the given HTTP
+    statuses before succeeding."""
+
+    def __init__(self, seconds: float = 0, failing_statuses: tuple = ()):
+        self.seconds = seconds
+        self.failing_statuses = list(failing_statuses)
+        self.n_attempts = 0
+
+    def execute(self) -> dict:
+        self.n_attempts += 1
+        time.sleep(self.seconds)
+        if self.failing_statuses:
+            status = self.failing_statuses.pop(0)
+            raise HttpError(httplib2.Response({"status": status}), b"")
+        return {"files": []}
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(request_executor, "BASE_BACKOFF_SECONDS", 0.01)
+
+
+async def get_max_tick_gap_while(coroutine) -> float:
+    """Awaits the coroutine while ticking every TICK_SECONDS, returning the longest
+    gap between ticks (i.e. how long the event loop was blocked, at worst)."""
+    max_gap = 0
+    task = asyncio.ensure_future(coroutine)
+    last_tick = time.perf_counter()
+    while not task.done():
+        await asyncio.sleep(TICK_SECONDS)
+        now = time.perf_counter()
+        max_gap, last_tick = max(max_gap, now - last_tick), now
+    await task
+    return max_gap
+
+
+def test_event_loop_stays_responsive_while_backend_is_slow():
+    requests = [FakeRequest(seconds=0.3, failing_statuses=(503,))] + [
+        FakeRequest(seconds=0.3) for _ in range(3)
+    ]
+
+    async def execute_all():
+        return await asyncio.gather(*(execute_request(r) for r in requests))
+
+    max_gap = asyncio.run(get_max_tick_gap_while(execute_all()))
+    assert max_gap < 0.1
+    assert requests[0].n_attempts == 2
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    request = FakeRequest(failing_statuses=(404, 503))
+    with pytest.raises(HttpError):
+        asyncio.run(execute_request(request))
+    assert request.n_attempts == 1
+
+
+def test_deadline_bounds_slow_and_retried_requests():
+    with pytest.raises(TimeoutError):
+        asyncio.run(execute_request(FakeRequest(seconds=0.5), 0.1))
+    request = FakeRequest(failing_statuses=(503,) * 100)
+    with pytest.raises((HttpError, TimeoutError)):
+        asyncio.run(execute_request(request, 0.2))
+    assert 1 < request.n_attempts < 100
+
+
+def make_403(reason: str) -> HttpError:
+    content = {"error": {"code": 403, "errors": [{"reason": reason}]}}
+    return HttpError(
+        httplib2.Response({"status": 403}), json.dumps(content).encode()
+    )
+
+
+def test_only_rate_limit_403s_are_retried():
+    assert is_retryable_error(make_403("userRateLimitExceeded"))
+    assert not is_retryable_error(make_403("insufficientPermissions"))
+    assert not is_retryable_error(
+        HttpError(httplib2.Response({"status": 403}), b"Forbidden")
+    )
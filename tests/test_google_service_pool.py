@@ -0,0 +1,33 @@
+import asyncio
+
+from google.auth.credentials import AnonymousCredentials
+
+from routine_butler.utils.google.service_pool import GoogleServicePool
+
+
+class FakeCredentialsManager:
+    def __init__(self):
+        self.credentials_generation = 0
+        self.service_pool = GoogleServicePool(self)
+
+    async def get_credentials(self) -> AnonymousCredentials:
+        return AnonymousCredentials()
+
+
+def test_services_built_once_per_credentials_generation():
+    manager = FakeCredentialsManager()
+    pool = manager.service_pool
+
+    async def get_services():
+        return [
+            await pool.get_service("drive", "v3"),
+            await pool.get_service("sheets", "v4"),
+            await pool.get_service("drive", "v3"),
+        ]
+
+    drive, _, same_drive = asyncio.run(get_services())
+    assert drive is same_drive
+    assert (pool.n_builds, pool.n_rebuilds_avoided) == (2, 1)
+    manager.credentials_generation += 1  # e.g. the credentials were refreshed
+    new_drive = asyncio.run(pool.get_service("drive", "v3"))
+    assert new_drive is not drive and pool.n_builds == 3
@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+from routine_butler.utils.plugin_registry import (
+    PluginRegistry,
+    get_plugins_source_mtime,
+    read_plugin_manifest,
+)
+
+MANIFEST_PLUGINS = {
+    "BinaryCheck": {
+        "module": "routine_butler.plugins.binary_check",
+        "config_schema": {"title": "BinaryCheck", "type": "object"},
+    }
+}
+
+
+def write_manifest(
+    path: str, source_mtime: float, failed_plugin_names: tuple = ()
+):
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "source_mtime": source_mtime,
+                "failed_plugin_names": list(failed_plugin_names),
+                "plugins": MANIFEST_PLUGINS,
+            },
+            f,
+        )
+
+
+@pytest.fixture
+def manifest_path(tmp_path) -> str:
+    return os.path.join(tmp_path, "plugin_manifest.json")
+
+
+def test_plugins_imported_on_first_lookup(manifest_path: str):
+    write_manifest(manifest_path, get_plugins_source_mtime())
+    registry = PluginRegistry(read_plugin_manifest(manifest_path))
+    assert list(registry) == ["BinaryCheck"]
+    assert registry.get_config_schema("BinaryCheck")["title"] == "BinaryCheck"
+    assert registry.n_imported == 0
+    assert registry["BinaryCheck"]().estimate_duration_in_seconds() >= 0
+    assert registry.n_imported == 1
+
+
+@pytest.mark.parametrize(
+    "source_mtime_offset, is_read", [(-1, False), (0, True)]
+)
+def test_only_stale_manifest_not_read_despite_failed_plugins(
+    manifest_path: str, source_mtime_offset: float, is_read: bool
+):
+    source_mtime = get_plugins_source_mtime() + source_mtime_offset
+    write_manifest(manifest_path, source_mtime, ("YoutubeVideo",))
+    manifest = read_plugin_manifest(manifest_path)
+    assert (manifest is not None) == is_read
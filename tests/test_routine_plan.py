@@ -0,0 +1,79 @@
+from typing import Dict
+
+import pytest
+
+from routine_butler.models.program import Program, plugin_cache
+from routine_butler.models.routine import (
+    PriorityLevel,
+    Routine,
+    RoutineElement,
+    RoutineReward,
+)
+from routine_butler.routine_plan import _ROUTINE_PLANS, get_routine_plan
+from routine_butler.state import state
+
+
+class CountingPlugin:
+    """Stand-in plugin that counts its duration estimations."""
+
+    n_estimations = 0
+
+    def __init__(self, seconds: float, idx: int):
+        self.seconds = seconds
+
+    def estimate_duration_in_seconds(self) -> float:
+        CountingPlugin.n_estimations += 1
+        return self.seconds
+
+
+def make_programs_by_title(n: int, seconds: float) -> Dict[str, Program]:
+    return {
+        f"Program {i}": Program(
+            title=f"Program {i}",
+            plugin_type="CountingPlugin",
+            plugin_dict={"seconds": seconds, "idx": i},
+        )
+        for i in range(n)
+    }
+
+
+@pytest.fixture
+def routine(monkeypatch: pytest.MonkeyPatch) -> Routine:
+    monkeypatch.setattr(state, "_plugins", {"CountingPlugin": CountingPlugin})
+    plugin_cache.clear()
+    _ROUTINE_PLANS.clear()
+    priorities = [PriorityLevel.HIGH, PriorityLevel.LOW, PriorityLevel.MEDIUM]
+    return Routine(
+        elements=[
+            RoutineElement(priority_level=priorities[i % 3], program=title)
+            for i, title in enumerate(make_programs_by_title(30, 60))
+        ],
+        rewards=[RoutineReward(program="Program 0")],
+    )
+
+
+def test_estimates_made_once_per_routine_version(routine: Routine):
+    programs_by_title = make_programs_by_title(30, 60)
+    CountingPlugin.n_estimations = 0
+    plan = get_routine_plan(routine, programs_by_title)
+    for _ in range(3):
+        get_routine_plan(routine, programs_by_title)
+        plan.prune_to_target_duration(10)
+    assert CountingPlugin.n_estimations == 30
+    routine.elements.pop()
+    assert get_routine_plan(routine, programs_by_title) is not plan
+    assert CountingPlugin.n_estimations == 30 + 29
+
+
+def test_prunes_lowest_priorities_first(routine: Routine):
+    programs_by_title = make_programs_by_title(30, 60)
+    plan = get_routine_plan(routine, programs_by_title)
+    # 30 minutes - 75s of loading - 90s of cushion leaves room for 27 programs
+    remaining, pruned_titles = plan.prune_to_target_duration(30)
+    assert len(remaining) == 27 and len(pruned_titles) == 3
+    low_titles = {
+        e.program for e in routine.elements if e.priority_level == "low"
+    }
+    assert set(pruned_titles) <= low_titles
+    assert remaining == [p for p in plan.element_programs if p in remaining]
+    assert len(plan.element_programs) == 30  # i.e. the plan isn't modified
@@ -0,0 +1,21 @@
+import builtins
+import sys
+
+from routine_butler.utils.startup_profiler import StartupProfiler
+
+
+def test_times_first_time_imports_only():
+    sys.modules.pop("tabnanny", None)
+    original_import = builtins.__import__
+    profiler = StartupProfiler()
+    profiler.install()
+    try:
+        import tabnanny  # noqa: F401
+        import tabnanny  # noqa: F401, F811
+    finally:
+        profiler.uninstall()
+    assert builtins.__import__ is original_import
+    timed_modules = [t.module for t in profiler.import_timings]
+    assert timed_modules.count("tabnanny") == 1
+    timing = profiler.import_timings[timed_modules.index("tabnanny")]
+    assert 0 <= timing.self_us <= timing.cumulative_us and timing.depth == 0
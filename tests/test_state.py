@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from routine_butler.models.alarm import Alarm
+from routine_butler.models.base import db_unit_of_work
+from routine_butler.models.program import Program
+from routine_butler.models.routine import Routine
+from routine_butler.models.user import User
+from routine_butler.state import UserRepository
+
+TEST_USER_USERNAME = "test_repository_user"
+
+
+@pytest.fixture(scope="module")
+def user(engine: Engine) -> User:
+    user = User(username=TEST_USER_USERNAME)
+    user.add_self_to_db(engine)
+    yield user
+    user.delete_self_from_db(engine)
+
+
+@pytest.fixture
+def repository(user: User) -> UserRepository:
+    repository = UserRepository(user)
+    yield repository
+    repository.close()
+
+
+def test_reads_after_first_are_hits(
+    engine: Engine, repository: UserRepository
+):
+    for _ in range(3):
+        repository.get_routines(engine)
+    assert (repository.hits, repository.misses) == (2, 1)
+
+
+def test_patched_in_place_by_writes(
+    engine: Engine, user: User, repository: UserRepository
+):
+    assert repository.get_programs(engine) == []
+    program = Program(title="Cached Program")
+    user.add_program(engine, program)
+    assert repository.get_programs_by_title(engine) == {program.title: program}
+    program.title = "Renamed Program"
+    program.update_self_in_db(engine)
+    assert list(repository.get_programs_by_title(engine)) == [program.title]
+    program.delete_self_from_db(engine)
+    assert repository.get_programs(engine) == []
+    assert repository.misses == 1
+    assert repository.get_programs(engine) == user.get_programs(engine)
+
+
+def test_ignores_other_users_children(
+    engine: Engine, repository: UserRepository
+):
+    repository.get_routines(engine)
+    other_users_routine = Routine(user_uid=-1)
+    other_users_routine.add_self_to_db(engine)
+    assert other_users_routine not in repository.get_routines(engine)
+    other_users_routine.delete_self_from_db(engine)
+
+
+def test_invalidated_by_rollback(
+    engine: Engine, user: User, repository: UserRepository
+):
+    repository.get_routines(engine)
+    with pytest.raises(RuntimeError):
+        with db_unit_of_work(engine):
+            user.add_routine(engine, Routine(title="Rolled Back"))
+            raise RuntimeError
+    routines = repository.get_routines(engine)
+    assert repository.misses == 2
+    assert "Rolled Back" not in [r.title for r in routines]
+
+
+def test_alarm_index_rebuilt_after_routine_writes(
+    engine: Engine, user: User, repository: UserRepository
+):
+    assert repository.get_alarm_index(engine).get_next() is None
+    routine = Routine(alarms=[Alarm(time_str="06:00")])
+    user.add_routine(engine, routine)
+    assert repository.get_alarm_index(engine).get_next()[2] == routine
+    routine.alarms[0].is_enabled = False
+    routine.update_self_in_db(engine)
+    assert repository.get_alarm_index(engine).get_next() is None
+    routine.delete_self_from_db(engine)
+
+
+def test_reads_and_writes_are_copies(
+    engine: Engine, user: User, repository: UserRepository
+):
+    program = Program(title="Copied Program")
+    user.add_program(engine, program)
+    program.title = "Unsaved Title"
+    cached_program = repository.get_programs(engine)[0]
+    cached_program.plugin_type = "unsaved_plugin"
+    cached_program = repository.get_programs(engine)[0]
+    assert cached_program.title == "Copied Program"
+    assert cached_program.plugin_type is None
+    program.delete_self_from_db(engine)
+
+
+def test_patched_by_async_writes(
+    engine: Engine, user: User, repository: UserRepository
+):
+    repository.get_programs(engine)
+    program = Program(title="Async Program", user_uid=user.uid)
+    asyncio.run(program.aadd(engine))
+    assert repository.get_programs(engine) == [program]
+    asyncio.run(program.adelete(engine))
+    assert repository.get_programs(engine) == []
+    assert repository.misses == 1
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from routine_butler.utils.dataframe_like import WriteBackBuffer
+from routine_butler.utils.dataframe_like.google_sheet import (
+    get_column_letters,
+    get_row_segment_ranges,
+)
+
+
+class FakeDataframeLike:
+    def __init__(self, path: str):
+        self.path = path
+        self.batches = []
+        self.should_fail = False
+
+    async def batch_update_cells(self, cells: dict) -> None:
+        if self.should_fail:
+            raise ConnectionError("offline")
+        self.batches.append(dict(cells))
+
+
+@pytest.fixture
+def journal_path(tmp_path) -> str:
+    return str(tmp_path / "write_back_journal.jsonl")
+
+
+def test_updates_are_coalesced_into_one_batch_per_dataframe_like(journal_path):
+    buffer = WriteBackBuffer(journal_path, FakeDataframeLike)
+    sheet_a, sheet_b = FakeDataframeLike("a"), FakeDataframeLike("b")
+    buffer.record(sheet_a, {(0, 2): 5, (0, 3): 1})
+    buffer.record(sheet_a, {(0, 2): 7, (4, 2): 3})
+    buffer.record(sheet_b, {(1, 4): 0})
+    assert buffer.n_pending == 4
+
+    assert asyncio.run(buffer.flush()) == 4
+    assert sheet_a.batches == [{(0, 2): 7, (0, 3): 1, (4, 2): 3}]
+    assert sheet_b.batches == [{(1, 4): 0}]
+    assert buffer.n_pending == 0
+    assert WriteBackBuffer(journal_path, FakeDataframeLike).n_pending == 0
+
+
+def test_unflushed_updates_are_replayed(journal_path):
+    crashed_buffer = WriteBackBuffer(journal_path, FakeDataframeLike)
+    crashed_buffer.record(FakeDataframeLike("a"), {(0, 2): 5})
+    crashed_buffer.record(FakeDataframeLike("a"), {(0, 2): 6})
+    with open(journal_path, "a") as f:
+        f.write('{"path": "a", "cell": [1')  # i.e. a torn final line
+
+    buffer = WriteBackBuffer(journal_path, FakeDataframeLike)
+    assert asyncio.run(buffer.replay()) == 1
+    assert buffer._dataframe_likes["a"].batches == [{(0, 2): 6}]
+
+
+def test_failed_writes_remain_pending(journal_path):
+    buffer = WriteBackBuffer(journal_path, FakeDataframeLike)
+    sheet = FakeDataframeLike("a")
+    sheet.should_fail = True
+    buffer.record(sheet, {(0, 2): 5})
+    assert asyncio.run(buffer.flush()) == 0
+    assert buffer.n_pending == 1
+
+    sheet.should_fail = False
+    assert asyncio.run(buffer.flush()) == 1
+    assert sheet.batches == [{(0, 2): 5}]
+
+
+def test_flush_is_debounced(journal_path):
+    buffer = WriteBackBuffer(journal_path, FakeDataframeLike, 0.05)
+    sheet = FakeDataframeLike("a")
+
+    async def record_in_quick_succession():
+        for value in range(3):
+            buffer.record(sheet, {(0, 2): value})
+            await asyncio.sleep(0.01)
+        assert sheet.batches == []
+        await asyncio.sleep(0.1)
+
+    asyncio.run(record_in_quick_succession())
+    assert sheet.batches == [{(0, 2): 2}]
+
+
+def test_row_segment_ranges():
+    assert [get_column_letters(i) for i in (0, 25, 26, 701)] == [
+        "A",
+        "Z",
+        "AA",
+        "ZZ",
+    ]
+    cells = {(0, 2): 5, (0, 3): 1, (0, 4): 0, (3, 2): 7, (3, 4): 1}
+    assert get_row_segment_ranges(cells) == [
+        ("C1:E1", [5, 1, 0]),
+        ("C4:C4", [7]),
+        ("E4:E4", [1]),
+    ]
+
+
+def test_journal_is_fsynced_off_of_the_recording_thread(
+    journal_path, monkeypatch
+):
+    fsyncing_threads = []
+    fsync = os.fsync
+
+    def recording_fsync(fd: int) -> None:
+        fsyncing_threads.append(threading.current_thread())
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    buffer = WriteBackBuffer(journal_path, FakeDataframeLike)
+    buffer.record(FakeDataframeLike("a"), {(0, 2): 5})
+    assert asyncio.run(buffer.flush()) == 1
+    assert fsyncing_threads
+    assert threading.current_thread() not in fsyncing_threads